@@ -2,6 +2,7 @@ import json
 
 import bm
 
+from ddtrace import config
 from ddtrace.propagation import _utils as utils
 from ddtrace.propagation import http
 
@@ -10,6 +11,8 @@ class HTTPPropagationExtract(bm.Scenario):
     headers = bm.var(type=str)
     extra_headers = bm.var(type=int)
     wsgi_style = bm.var(type=bool)
+    asgi_style = bm.var(type=bool)
+    styles = bm.var(type=str)
 
     def generate_headers(self):
         headers = json.loads(self.headers)
@@ -22,13 +25,20 @@ class HTTPPropagationExtract(bm.Scenario):
                 header = utils.get_wsgi_header(header)
             headers[header] = str(i)
 
+        if self.asgi_style:
+            return [(header.encode("latin-1"), value.encode("latin-1")) for header, value in headers.items()]
+
         return headers
 
     def run(self):
         headers = self.generate_headers()
+        styles = config._propagation_style_extract
+        config._propagation_style_extract = self.styles.split(",")
 
         def _(loops):
             for _ in range(loops):
                 http.HTTPPropagator.extract(headers)
 
         yield _
+
+        config._propagation_style_extract = styles
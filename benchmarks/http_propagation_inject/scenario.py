@@ -2,6 +2,7 @@ import json
 
 import bm
 
+from ddtrace import config
 from ddtrace.context import Context
 from ddtrace.propagation import http
 
@@ -10,6 +11,7 @@ class HTTPPropagationInject(bm.Scenario):
     sampling_priority = bm.var(type=str)
     dd_origin = bm.var(type=str)
     meta = bm.var(type=str)
+    styles = bm.var(type=str)
 
     def run(self):
         sampling_priority = None
@@ -29,9 +31,14 @@ class HTTPPropagationInject(bm.Scenario):
             meta=meta,
         )
 
+        styles = config._propagation_style_inject
+        config._propagation_style_inject = self.styles.split(",")
+
         def _(loops):
             for _ in range(loops):
                 # Just pass in a new/empty dict, we don't care about the result
                 http.HTTPPropagator.inject(ctx, {})
 
         yield _
+
+        config._propagation_style_inject = styles
@@ -0,0 +1,31 @@
+from typing import Callable
+from typing import Generator
+
+import bm
+
+from ddtrace.profiling.collector import _memalloc
+
+
+class MemallocHeap(bm.Scenario):
+    heap_sample_size = bm.var(type=int)
+    nlive = bm.var(type=int)
+    nallocs = bm.var(type=int)
+
+    def run(self):
+        # type: () -> Generator[Callable[[int], None], None, None]
+        if self.heap_sample_size:
+            _memalloc.start(64, 1000, self.heap_sample_size)
+
+        # Keep sampled allocations alive while the loop allocates and frees objects
+        live = [bytearray(64) for _ in range(self.nlive)]  # noqa: F841
+
+        def _(loops):
+            # type: (int) -> None
+            for _ in range(loops):
+                objects = [bytearray(64) for _ in range(self.nallocs)]
+                del objects
+
+        yield _
+
+        if self.heap_sample_size:
+            _memalloc.stop()
@@ -1,4 +1,3 @@
-from collections import defaultdict
 import copy
 
 import bm as bm
@@ -6,21 +5,10 @@ import bm.utils as utils
 
 from ddtrace import config as ddconfig
 from ddtrace.contrib.trace_utils import set_http_meta
+from ddtrace.settings import IntegrationConfig
 
 
-class Config(defaultdict):
-    __header_tag_name = {
-        "User-Agent": "http.user_agent",
-        "REFERER": "http.referer",
-        "Content-Type": "http.content_type",
-        "Etag": "http.etag",
-    }
-
-    def _header_tag_name(self, header_name):
-        return self.__header_tag_name.get(header_name)
-
-    def __getattr__(self, item):
-        return self[item]
+TRACED_HEADERS = ["User-Agent", "REFERER", "Content-Type", "Etag"]
 
 
 COOKIES = {"csrftoken": "cR8TVoVebF2afssCR16pQeqHcxAlA3867P6zkkUBYDL5Q92kjSGtqptAry1htdlL"}
@@ -53,16 +41,19 @@ class SetHttpMeta(bm.Scenario):
     querystring = bm.var(type=str)
     ip_header = bm.var(type=str)
     ip_enabled = bm.var_bool()
+    ip_value = bm.var(type=str)
+    traced_headers = bm.var(type=str)
 
     def run(self):
         # run scenario to also set tags on spans
+        config = IntegrationConfig(ddconfig, "set_http_meta")
         if self.allenabled:
-            config = Config(lambda: True)
-        else:
-            config = Config(lambda: False)
+            config.http.trace_headers(TRACED_HEADERS)
+        if self.traced_headers:
+            config.http.trace_headers(self.traced_headers.split(","))
 
         # querystring obfuscation config
-        config["trace_query_string"] = self.send_querystring_enabled
+        config.http.trace_query_string = self.send_querystring_enabled
         if self.obfuscation_disabled:
             ddconfig._obfuscation_query_string_pattern = None
 
@@ -77,19 +68,19 @@ class SetHttpMeta(bm.Scenario):
             )
 
         if self.ip_header:
-            data["request_headers"][self.ip_header] = "8.8.8.8"
+            data["request_headers"][self.ip_header] = self.ip_value
 
         span = utils.gen_span(str("test"))
         span._local_root = utils.gen_span(str("root"))
 
+        retrieve_client_ip, client_ip_header = ddconfig.retrieve_client_ip, ddconfig.client_ip_header
+        ddconfig.retrieve_client_ip = self.ip_enabled
+        ddconfig.client_ip_header = None
+
         def bm(loops):
-            with utils.override_env(
-                dict(
-                    DD_TRACE_CLIENT_IP_ENABLED=str(self.ip_enabled),
-                    DD_TRACE_CLIENT_IP_HEADER=self.ip_header,
-                )
-            ):
-                for _ in range(loops):
-                    set_http_meta(span, config, **data)
+            for _ in range(loops):
+                set_http_meta(span, config, peer_ip="10.0.0.1", **data)
 
         yield bm
+
+        ddconfig.retrieve_client_ip, ddconfig.client_ip_header = retrieve_client_ip, client_ip_header
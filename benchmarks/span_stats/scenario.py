@@ -0,0 +1,49 @@
+import concurrent.futures
+from typing import Callable
+from typing import Generator
+
+import bm
+
+from ddtrace.constants import SPAN_MEASURED_KEY
+from ddtrace.internal.processor.stats import SpanStatsProcessorV06
+from ddtrace.span import Span
+
+
+class SpanStats(bm.Scenario):
+    nthreads = bm.var(type=int)
+    nspans = bm.var(type=int)
+    nresources = bm.var(type=int)
+    flush = bm.var_bool()
+
+    def run(self):
+        # type: () -> Generator[Callable[[int], None], None, None]
+        processor = SpanStatsProcessorV06("http://localhost:8126")
+        # Stop the periodic flush, the buckets are serialized in the loop instead
+        processor.stop()
+        processor.join()
+
+        spans = []
+        for i in range(self.nspans):
+            span = Span("web.request", service="web", resource="GET /%d" % (i % self.nresources))
+            span.set_tag_str("http.status_code", "200")
+            span.set_metric(SPAN_MEASURED_KEY, 1)
+            span.finish()
+            spans.append(span)
+
+        def finish_spans():
+            # type: () -> None
+            for span in spans:
+                processor.on_span_finish(span)
+
+        def _(loops):
+            # type: (int) -> None
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.nthreads) as executor:
+                for _ in range(loops):
+                    tasks = [executor.submit(finish_spans) for _ in range(self.nthreads)]
+                    for task in concurrent.futures.as_completed(tasks):
+                        task.result()
+                    if self.flush:
+                        with processor._lock:
+                            processor._serialize_buckets()
+
+        yield _
@@ -34,6 +34,7 @@ class Threading(bm.Scenario):
     nthreads = bm.var(type=int)
     ntraces = bm.var(type=int)
     nspans = bm.var(type=int)
+    nshards = bm.var(type=int)
 
     def create_trace(self, tracer):
         # type: (Tracer) -> None
@@ -45,8 +46,11 @@ class Threading(bm.Scenario):
 
     def run(self):
         # type: () -> Generator[Callable[[int], None], None, None]
+        from ddtrace import config
         from ddtrace import tracer
 
+        # the span aggregator is recreated with the configured number of shards
+        config._span_aggregator_shards = self.nshards
         # configure global tracer to drop traces rather
         tracer.configure(writer=NoopWriter())
 
@@ -47,7 +47,7 @@ def pytest_configure(config):
         """,
     )
 
-    if os.getenv("CI")  = "true":
+    if os.getenv("CI") != "true":
         return
 
     # Write JUnit xml results to a file that contains this process' PID
@@ -18,6 +18,7 @@ from .internal.utils.http import w3c_get_dd_list_member as _w3c_get_dd_list_memb
 
 
 if TYPE_CHECKING:  # pragma: no cover
+    from typing import Dict
     from typing import Tuple
 
     from .span import Span
@@ -48,6 +49,7 @@ class Context(object):
         "_lock",
         "_meta",
         "_metrics",
+        "_propagation_headers",
     ]
 
     def __init__(
@@ -65,6 +67,8 @@ class Context(object):
 
         self.trace_id = trace_id  # type: Optional[int]
         self.span_id = span_id  # type: Optional[int]
+        # The state the last injected propagation headers were built from, and these headers
+        self._propagation_headers = None  # type: Optional[Tuple[Tuple[Any, ...], Dict[str, str]]]
 
         if dd_origin is not None and _DD_ORIGIN_INVALID_CHARS_REGEX.search(dd_origin) is None:
             self._meta[ORIGIN_KEY] = dd_origin
@@ -92,6 +96,7 @@ class Context(object):
     def __setstate__(self, state):
         # type: (_ContextState) -> None
         self.trace_id, self.span_id, self._meta, self._metrics = state
+        self._propagation_headers = None
         # We cannot serialize and lock, so we must recreate it unless we already have one
         self._lock = threading.RLock()
 
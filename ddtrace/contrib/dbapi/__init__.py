@@ -126,9 +126,15 @@ class TracedCursor(wrapt.ObjectProxy):
 
             if dbm_propagator:
                 args, kwargs = dbm_propagator.inject(s, args, kwargs)
+                dbm_propagator.inject_session(s, self.__wrapped__)
 
             try:
                 return method(*args, **kwargs)
+            except Exception:
+                if dbm_propagator:
+                    # The failed query can abort the transaction the traceparent was set in
+                    dbm_propagator.reset_session(getattr(self.__wrapped__, "connection", None))
+                raise
             finally:
                 # Try to fetch custom properties that were passed by the specific Database implementation
                 self._set_post_execute_tags(s)
@@ -331,6 +337,9 @@ class TracedConnection(wrapt.ObjectProxy):
 
     def rollback(self, *args, **kwargs):
         span_name = "{}.{}".format(self._self_datadog_name, "rollback")
+        dbm_propagator = getattr(self._self_config, "_dbm_propagator", None)
+        if dbm_propagator:
+            dbm_propagator.reset_session(self.__wrapped__)
         return self._trace_method(self.__wrapped__.rollback, span_name, {}, *args, **kwargs)
 
 
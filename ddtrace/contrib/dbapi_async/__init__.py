@@ -87,13 +87,34 @@ class TracedAsyncCursor(TracedCursor):
 
             if dbm_propagator:
                 args, kwargs = dbm_propagator.inject(s, args, kwargs)
+                await self._inject_session(dbm_propagator, s)
 
             try:
                 return await method(*args, **kwargs)
+            except Exception:
+                if dbm_propagator:
+                    # The failed query can abort the transaction the traceparent was set in
+                    dbm_propagator.reset_session(getattr(self.__wrapped__, "connection", None))
+                raise
             finally:
                 # Try to fetch custom properties that were passed by the specific Database implementation
                 self._set_post_execute_tags(s)
 
+    async def _inject_session(self, dbm_propagator, span):
+        """Set the traceparent in the database session of the cursor connection"""
+        calls = dbm_propagator._session_calls(span, self.__wrapped__)
+        try:
+            call = next(calls)
+            while True:
+                try:
+                    await call
+                except Exception as e:
+                    call = calls.throw(e)
+                else:
+                    call = next(calls)
+        except StopIteration:
+            pass
+
     async def executemany(self, query, *args, **kwargs):
         """Wraps the cursor.executemany method"""
         self._self_last_execute_operation = query
@@ -252,4 +273,7 @@ class TracedAsyncConnection(TracedConnection):
 
     async def rollback(self, *args, **kwargs):
         span_name = "{}.{}".format(self._self_datadog_name, "rollback")
+        dbm_propagator = getattr(self._self_config, "_dbm_propagator", None)
+        if dbm_propagator:
+            dbm_propagator.reset_session(self.__wrapped__)
         return await self._trace_method(self.__wrapped__.rollback, span_name, {}, *args, **kwargs)
@@ -80,6 +80,7 @@ def patch():
 
     trace_utils.wrap(TracedProducer, "produce", traced_produce)
     trace_utils.wrap(TracedConsumer, "poll", traced_poll)
+    trace_utils.wrap(TracedConsumer, "consume", traced_consume)
     trace_utils.wrap(TracedConsumer, "commit", traced_commit)
     Pin().onto(confluent_kafka.Producer)
     Pin().onto(confluent_kafka.Consumer)
@@ -93,6 +94,8 @@ def unpatch():
         trace_utils.unwrap(TracedProducer, "produce")
     if trace_utils.iswrapped(TracedConsumer.poll):
         trace_utils.unwrap(TracedConsumer, "poll")
+    if trace_utils.iswrapped(TracedConsumer.consume):
+        trace_utils.unwrap(TracedConsumer, "consume")
     if trace_utils.iswrapped(TracedConsumer.commit):
         trace_utils.unwrap(TracedConsumer, "commit")
 
@@ -174,6 +177,17 @@ def traced_poll(func, instance, args, kwargs):
         return message
 
 
+def traced_consume(func, instance, args, kwargs):
+    pin = Pin.get_from(instance)
+    if not pin or not pin.enabled():
+        return func(*args, **kwargs)
+
+    messages = func(*args, **kwargs)
+    if messages:
+        core.dispatch("kafka.consume_batch.start", [instance, messages])
+    return messages
+
+
 def traced_commit(func, instance, args, kwargs):
     pin = Pin.get_from(instance)
     if not pin or not pin.enabled():
@@ -70,7 +70,9 @@ config._add(
             os.getenv("DD_PSYCOPG_TRACE_CONNECT", default=False)
             or os.getenv("DD_PSYCOPG2_TRACE_CONNECT", default=False)
         ),
-        _dbm_propagator=_DBM_Propagator(0, "query", _psycopg_sql_injector),
+        _dbm_propagator=_DBM_Propagator(
+            0, "query", _psycopg_sql_injector, "SELECT set_config('datadog.traceparent', %s, false)"
+        ),
         dbms_name="postgresql",
     ),
 )
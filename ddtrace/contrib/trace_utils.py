@@ -134,7 +134,7 @@ def _store_headers(headers, span, integration_config, request_or_response):
     :param integration_config: An integration specific config object.
     :type integration_config: ddtrace.settings.IntegrationConfig
     """
-    if not isinstance(headers, dict):
+    if not hasattr(headers, "items"):
         try:
             headers = dict(headers)
         except Exception:
@@ -144,14 +144,21 @@ def _store_headers(headers, span, integration_config, request_or_response):
         log.debug("Skipping headers tracing as no integration config was provided")
         return
 
+    # The header plan of the integration remembers the tag of each header name seen so far
+    tag_names = integration_config._header_tag_names(request_or_response)
     for header_name, header_value in headers.items():
-        """config._header_tag_name gets an element of the dictionary in config.http._header_tags
-        which gets the value from DD_TRACE_HEADER_TAGS environment variable."""
-        tag_name = integration_config._header_tag_name(header_name)
-        if tag_name is None:
-            continue
-        # An empty tag defaults to a http.<request or response>.headers.<header name> tag
-        span.set_tag_str(tag_name or _normalize_tag_name(request_or_response, header_name), header_value)
+        try:
+            tag_name = tag_names[header_name]
+        except KeyError:
+            # config._header_tag_name gets an element of the dictionary in config.http._header_tags
+            # which gets the value from DD_TRACE_HEADER_TAGS environment variable.
+            tag_name = integration_config._header_tag_name(header_name)
+            # An empty tag defaults to a http.<request or response>.headers.<header name> tag
+            if tag_name == "":
+                tag_name = _normalize_tag_name(request_or_response, header_name)
+            tag_names[header_name] = tag_name
+        if tag_name is not None:
+            span.set_tag_str(tag_name, header_value)
 
 
 def _get_request_header_user_agent(headers, headers_are_case_sensitive=False):
@@ -171,6 +178,14 @@ def _get_request_header_user_agent(headers, headers_are_case_sensitive=False):
     return ""
 
 
+@cached()
+def _ip_is_global(ip):
+    # type: (str) -> bool
+    """Memoized ``ip_is_global``: the same client and proxy IPs are seen over and over.
+    Invalid IPs raise a ValueError and are not cached."""
+    return ip_is_global(ip)
+
+
 # Used to cache the last header used for the cache. From the same server/framework
 # usually the same header will be used on further requests, so we use this to check
 # only it.
@@ -235,7 +250,7 @@ def _get_request_header_client_ip(headers, peer_ip=None, headers_are_case_sensit
                 continue
 
             try:
-                if ip_is_global(ip):
+                if _ip_is_global(ip):
                     return ip
                 elif not private_ip_from_headers:
                     # IP is private, store it just in case we don't find a public one later
@@ -247,7 +262,7 @@ def _get_request_header_client_ip(headers, peer_ip=None, headers_are_case_sensit
     # case it's public and, if not, return either the private_ip from the headers (if we have one)
     # or the peer private ip
     try:
-        if ip_is_global(peer_ip) or not private_ip_from_headers:
+        if _ip_is_global(peer_ip) or not private_ip_from_headers:
             return peer_ip
     except ValueError:
         pass
@@ -507,10 +522,10 @@ def set_http_meta(
             """We should store both http.<request_or_response>.headers.<header_name> and
             http.<key>. The last one
             is the DD standardized tag for user-agent"""
-            _store_request_headers(dict(request_headers), span, integration_config)
+            _store_request_headers(request_headers, span, integration_config)
 
     if response_headers is not None and integration_config.is_header_tracing_configured:
-        _store_response_headers(dict(response_headers), span, integration_config)
+        _store_response_headers(response_headers, span, integration_config)
 
     if retries_remain is not None:
         span.set_tag_str(http.RETRIES_REMAIN, str(retries_remain))
@@ -533,25 +548,21 @@ def set_http_meta(
 
             status_code = str(status_code) if status_code is not None else None
 
-            addresses = {
-                k: v
-                for k, v in [
-                    (SPAN_DATA_NAMES.REQUEST_URI_RAW, raw_uri),
-                    (SPAN_DATA_NAMES.REQUEST_METHOD, method),
-                    (SPAN_DATA_NAMES.REQUEST_COOKIES, request_cookies),
-                    (SPAN_DATA_NAMES.REQUEST_QUERY, parsed_query),
-                    (SPAN_DATA_NAMES.REQUEST_HEADERS_NO_COOKIES, request_headers),
-                    (SPAN_DATA_NAMES.RESPONSE_HEADERS_NO_COOKIES, response_headers),
-                    (SPAN_DATA_NAMES.RESPONSE_STATUS, status_code),
-                    (SPAN_DATA_NAMES.REQUEST_PATH_PARAMS, request_path_params),
-                    (SPAN_DATA_NAMES.REQUEST_BODY, request_body),
-                    (SPAN_DATA_NAMES.REQUEST_HTTP_IP, request_ip),
-                    (SPAN_DATA_NAMES.REQUEST_ROUTE, route),
-                ]
-                if v is not None
-            }
-            for k, v in addresses.items():
-                set_waf_address(k, v, span)
+            for k, v in (
+                (SPAN_DATA_NAMES.REQUEST_URI_RAW, raw_uri),
+                (SPAN_DATA_NAMES.REQUEST_METHOD, method),
+                (SPAN_DATA_NAMES.REQUEST_COOKIES, request_cookies),
+                (SPAN_DATA_NAMES.REQUEST_QUERY, parsed_query),
+                (SPAN_DATA_NAMES.REQUEST_HEADERS_NO_COOKIES, request_headers),
+                (SPAN_DATA_NAMES.RESPONSE_HEADERS_NO_COOKIES, response_headers),
+                (SPAN_DATA_NAMES.RESPONSE_STATUS, status_code),
+                (SPAN_DATA_NAMES.REQUEST_PATH_PARAMS, request_path_params),
+                (SPAN_DATA_NAMES.REQUEST_BODY, request_body),
+                (SPAN_DATA_NAMES.REQUEST_HTTP_IP, request_ip),
+                (SPAN_DATA_NAMES.REQUEST_ROUTE, route),
+            ):
+                if v is not None:
+                    set_waf_address(k, v, span)
 
     if route is not None:
         span.set_tag_str(http.ROUTE, route)
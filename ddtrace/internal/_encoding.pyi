@@ -19,13 +19,16 @@ class BufferItemTooLarge(Exception):
 class EncodingValidationError(Exception):
     pass
 
+class BufferedPayload(object):
+    def __len__(self) -> int: ...
+
 class BufferedEncoder(object):
     max_size: int
     max_item_size: int
     def __init__(self, max_size: int, max_item_size: int) -> None: ...
     def __len__(self) -> int: ...
     def put(self, item: Any) -> None: ...
-    def encode(self) -> Optional[bytes]: ...
+    def encode(self) -> Optional[Union[bytes, BufferedPayload]]: ...
     @property
     def size(self) -> int: ...
 
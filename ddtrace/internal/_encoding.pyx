@@ -1,6 +1,8 @@
 from cpython cimport *
 from cpython.bytearray cimport PyByteArray_CheckExact
 from libc cimport stdint
+from libc.string cimport memcpy
+from libc.string cimport memset
 from libc.string cimport strlen
 
 import threading
@@ -22,6 +24,8 @@ from ..constants import ORIGIN_KEY
 
 DEF MSGPACK_ARRAY_LENGTH_PREFIX_SIZE = 5
 DEF MSGPACK_STRING_TABLE_LENGTH_PREFIX_SIZE = 6
+DEF MSGPACK_STRING_TABLE_MAX_HOT_STRINGS = 512
+DEF MSGPACK_STRING_TABLE_MAX_HOT_SIZE = 1 << 16
 
 
 cdef extern from "Python.h":
@@ -221,7 +225,63 @@ cdef class ListStringTable(StringTable):
         return iter(self._list)
 
 
+cdef class BufferedPayload(object):
+    """Encoded payload owning the buffer it was encoded into.
+
+    The content of the payload is exposed through the buffer protocol, so that
+    it can be compressed or sent without being copied into a bytes object. The
+    buffer is freed once the payload and all the views on it are released.
+    """
+
+    cdef char *_buf
+    cdef Py_ssize_t _offset
+    cdef Py_ssize_t _length
+
+    def __dealloc__(self):
+        PyMem_Free(self._buf)
+        self._buf = NULL
+
+    def __len__(self):
+        return self._length
+
+    def __getbuffer__(self, Py_buffer *buffer, int flags):
+        PyBuffer_FillInfo(buffer, self, self._buf + self._offset, self._length, 1, flags)
+
+    def __releasebuffer__(self, Py_buffer *buffer):
+        pass
+
+
+cdef BufferedPayload take_buffer(msgpack_packer *pk, Py_ssize_t offset, size_t keep):
+    """Hand the buffer of the packer over to a new payload.
+
+    The packer gets a fresh buffer of the same size, into which the first
+    ``keep`` bytes of the old buffer are copied.
+    """
+    cdef BufferedPayload payload
+    cdef char *buf = <char*> PyMem_Malloc(pk.buf_size)
+    if buf == NULL:
+        raise MemoryError("Unable to allocate internal buffer.")
+    if keep:
+        memcpy(buf, pk.buf, keep)
+
+    payload = BufferedPayload.__new__(BufferedPayload)
+    payload._buf = pk.buf
+    payload._offset = offset
+    payload._length = pk.length - offset
+    pk.buf = buf
+    return payload
+
+
 cdef class MsgpackStringTable(StringTable):
+    """String table of the v0.5 encoding.
+
+    The strings used by two consecutive payloads become hot strings, which are
+    kept at the beginning of the table when it is flushed so that the following
+    payloads do not have to index and encode them again. A hot string is dropped
+    from the table as soon as a payload does not use it. The number and the
+    total size of the hot strings are bounded.
+    """
+
     cdef msgpack_packer pk
     cdef int max_size
     cdef int _max_string_length
@@ -229,6 +289,13 @@ cdef class MsgpackStringTable(StringTable):
     cdef stdint.uint32_t _sp_id
     cdef object _lock
     cdef size_t _reset_size
+    cdef size_t _max_hot_size
+    cdef list _hot
+    cdef dict _hot_table
+    cdef size_t _hot_reset_size
+    cdef stdint.uint32_t _hot_end
+    cdef stdint.uint8_t _hot_used[MSGPACK_STRING_TABLE_MAX_HOT_STRINGS + 2]
+    cdef set _last_strings
 
     def __init__(self, max_size):
         self.pk.buf_size = min(max_size, 1 << 20)
@@ -237,18 +304,27 @@ cdef class MsgpackStringTable(StringTable):
             raise MemoryError("Unable to allocate internal buffer.")
         self.max_size = max_size
         self._max_string_length = int(0.1*max_size)
+        self._max_hot_size = min(max_size >> 4, MSGPACK_STRING_TABLE_MAX_HOT_SIZE)
         self.pk.length = MSGPACK_STRING_TABLE_LENGTH_PREFIX_SIZE
         self._sp_len = 0
         self._lock = threading.RLock()
+        self._last_strings = set()
         super(MsgpackStringTable, self).__init__()
 
         self.index(ORIGIN_KEY)
         self._reset_size = self.pk.length
+        self._set_hot_strings([])
 
     def __dealloc__(self):
         PyMem_Free(self.pk.buf)
         self.pk.buf = NULL
 
+    cdef stdint.uint32_t _index(self, object string) except? -1:
+        cdef stdint.uint32_t _id = StringTable._index(self, string)
+        if _id < self._hot_end:
+            self._hot_used[_id] = 1
+        return _id
+
     cdef insert(self, object string):
         cdef int ret
 
@@ -283,7 +359,8 @@ cdef class MsgpackStringTable(StringTable):
             self.pk.length = self._sp_len
             self._next_id = self._sp_id
 
-    cdef get_bytes(self):
+    cdef int _update_prefixes(self):
+        """Update the size prefixes and return the offset of the table in the buffer."""
         cdef int ret
         cdef stdint.uint32_t table_size = self._next_id
         cdef int offset = MSGPACK_STRING_TABLE_LENGTH_PREFIX_SIZE - array_prefix_size(table_size)
@@ -294,14 +371,21 @@ cdef class MsgpackStringTable(StringTable):
             self.pk.length = offset
             ret = msgpack_pack_array(&self.pk, table_size)
             if ret:
-                return None
+                return -1
             # Add root array size prefix
             self.pk.length = offset = offset - 1
             ret = msgpack_pack_array(&self.pk, 2)
             if ret:
-                return None
+                return -1
             self.pk.length = old_pos
 
+        return offset
+
+    cdef get_bytes(self):
+        cdef int offset = self._update_prefixes()
+        if offset < 0:
+            return None
+
         return PyBytes_FromStringAndSize(self.pk.buf + offset, self.pk.length - offset)
 
     @property
@@ -322,14 +406,79 @@ cdef class MsgpackStringTable(StringTable):
             if res != 0:
                 raise RuntimeError("Failed to append raw bytes to msgpack string table")
 
-    cdef reset(self):
-        StringTable.reset(self)
-        assert self._next_id == 1
+    cdef _set_hot_strings(self, list hot):
+        """Rebuild the beginning of the table with the given hot strings."""
+        cdef size_t length
 
-        PyDict_SetItem(self._table, ORIGIN_KEY, 1)
+        self._table = {"": 0, ORIGIN_KEY: 1}
         self._next_id = 2
         self.pk.length = self._reset_size
+
+        for i, string in enumerate(hot):
+            length = self.pk.length
+            PyDict_SetItem(self._table, string, PyLong_FromLong(self._next_id))
+            self.insert(string)
+            if self.pk.length - self._reset_size > self._max_hot_size:
+                PyDict_DelItem(self._table, string)
+                self.pk.length = length
+                hot = hot[:i]
+                break
+            self._next_id += 1
+
+        self._hot = hot
+        self._hot_table = PyDict_Copy(self._table)
+        self._hot_end = self._next_id
+        self._hot_reset_size = self.pk.length
+
+    cdef list _promoted_strings(self, Py_ssize_t room):
+        """Return the strings of the current payload that the previous payload used too."""
+        cdef list promoted = []
+        cdef set current = set()
+        cdef stdint.uint32_t _id
+
+        for string, id_ in self._table.items():
+            _id = id_
+            # Skip the hot strings and the strings rolled back
+            if _id < self._hot_end or _id >= self._next_id:
+                continue
+            # The strings shared by most spans are found at the beginning of
+            # the table. Looking further would only cost time on payloads with
+            # many unique strings.
+            if len(current) >= MSGPACK_STRING_TABLE_MAX_HOT_STRINGS:
+                break
+            current.add(string)
+            if string in self._last_strings and len(promoted) < room:
+                promoted.append(string)
+
+        self._last_strings = current
+        return promoted
+
+    cdef _update_hot_strings(self):
+        cdef list hot = self._hot
+        cdef list promoted
+        cdef Py_ssize_t i, used = 0
+
+        for i in range(len(hot)):
+            used += self._hot_used[i + 2]
+        if used < len(hot):
+            hot = [string for i, string in enumerate(hot) if self._hot_used[i + 2]]
+
+        if len(hot) < MSGPACK_STRING_TABLE_MAX_HOT_STRINGS:
+            promoted = self._promoted_strings(MSGPACK_STRING_TABLE_MAX_HOT_STRINGS - len(hot))
+            if promoted:
+                hot = hot + promoted
+
+        if hot is not self._hot:
+            self._set_hot_strings(hot)
+
+    cdef reset(self):
+        self._update_hot_strings()
+
+        self._table = PyDict_Copy(self._hot_table)
+        self._next_id = self._hot_end
+        self.pk.length = self._hot_reset_size
         self._sp_len = 0
+        memset(self._hot_used, 0, self._hot_end)
 
     cpdef flush(self):
         with self._lock:
@@ -338,6 +487,18 @@ cdef class MsgpackStringTable(StringTable):
             finally:
                 self.reset()
 
+    cdef flush_payload(self):
+        cdef int offset
+        with self._lock:
+            try:
+                offset = self._update_prefixes()
+                if offset < 0:
+                    return None
+                # Keep the string table prefix and the hot strings in the new buffer
+                return take_buffer(&self.pk, offset, self._hot_reset_size)
+            finally:
+                self.reset()
+
 
 cdef class BufferedEncoder(object):
     content_type: str = None
@@ -469,6 +630,12 @@ cdef class MsgpackEncoderBase(BufferedEncoder):
         """Return internal buffer."""
         return self.pk.buf + self._update_array_len()
 
+    cdef get_payload(self):
+        """Return internal buffer contents as a payload, leaving a fresh buffer in its place"""
+        cdef int offset = self._update_array_len()
+        with self._lock:
+            return take_buffer(&self.pk, offset, 0)
+
     cdef void * get_dd_origin_ref(self, str dd_origin):
         raise NotImplementedError()
 
@@ -548,7 +715,7 @@ cdef class MsgpackEncoderV03(MsgpackEncoderBase):
     cpdef flush(self):
         with self._lock:
             try:
-                return self.get_bytes()
+                return self.get_payload()
             finally:
                 self._reset_buffer()
 
@@ -734,9 +901,9 @@ cdef class MsgpackEncoderV05(MsgpackEncoderBase):
                     PyLong_FromLong(<long> self.get_buffer()),
                     <Py_ssize_t> super(MsgpackEncoderV05, self).size,
                 )
-                v05bytes = self._st.flush()
-                self._verify_encoding(v05bytes)
-                return v05bytes
+                payload = self._st.flush_payload()
+                self._verify_encoding(payload)
+                return payload
             finally:
                 self._reset_buffer()
                 self._encoded_spans = {}
@@ -6,6 +6,7 @@ from ddtrace import config
 
 from .. import agent
 from .. import service
+from ..compression import get_compressor
 from ..runtime import get_runtime_id
 from ..writer import HTTPWriter
 from ..writer import WriterClientBase
@@ -108,6 +109,8 @@ class CIVisibilityWriter(HTTPWriter):
         clients = (
             [CIVisibilityProxiedEventClient()] if use_evp else [CIVisibilityAgentlessEventClient()]
         )  # type: List[WriterClientBase]
+        # Only the test events are compressed, the coverage payloads are multipart forms.
+        clients[0].compressor = get_compressor(config._trace_writer_compression, config._trace_writer_compression_level)
         if coverage_enabled:
             if not intake_cov_url:
                 intake_cov_url = "%s.%s" % (AGENTLESS_COVERAGE_BASE_URL, os.getenv("DD_SITE", AGENTLESS_DEFAULT_SITE))
@@ -142,7 +145,7 @@ class CIVisibilityWriter(HTTPWriter):
         # type: () -> HTTPWriter
         return self.__class__(
             intake_url=self.intake_url,
-            processing_interval=self._interval,
+            processing_interval=self._processing_interval,
             timeout=self._timeout,
             dogstatsd=self.dogstatsd,
             sync_mode=self._sync_mode,
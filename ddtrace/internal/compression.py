@@ -0,0 +1,127 @@
+import abc
+import time
+from typing import Iterator
+from typing import Optional
+import zlib
+
+import six
+
+from . import compat
+from .logger import get_logger
+
+
+log = get_logger(__name__)
+
+# Size of the chunks of the payload fed to the compressor. This avoids
+# copying the whole payload when slicing it.
+CHUNK_SIZE = 1 << 16
+
+
+class PayloadCompressor(six.with_metaclass(abc.ABCMeta)):
+    """Streaming compressor for encoded payloads, like traces or profiles.
+
+    When no level is given, the compression level is picked from the CPU
+    headroom of the process since the previous payload was compressed: the
+    busier the process, the lower the level.
+    """
+
+    CONTENT_ENCODING = ""
+    MIN_LEVEL = 1
+    MAX_LEVEL = 1
+
+    def __init__(self, level=None):
+        # type: (Optional[int]) -> None
+        self.level = level
+        self._last_wall_time = compat.monotonic()
+        self._last_cpu_time = time.process_time()
+
+    def _cpu_headroom(self):
+        # type: () -> float
+        """Return the fraction of the wall time the process did not spend on CPU
+        since the last call."""
+        wall_time = compat.monotonic()
+        cpu_time = time.process_time()
+        wall_delta = wall_time - self._last_wall_time
+        cpu_delta = cpu_time - self._last_cpu_time
+        self._last_wall_time, self._last_cpu_time = wall_time, cpu_time
+        if wall_delta <= 0:
+            return 0.0
+        # Because of the GIL a Python process uses at most one CPU, so there is
+        # no need to account for the number of CPUs available.
+        return 1.0 - min(1.0, max(0.0, cpu_delta / wall_delta))
+
+    def next_level(self):
+        # type: () -> int
+        if self.level is not None:
+            return self.level
+        return self.MIN_LEVEL + int(round(self._cpu_headroom() * (self.MAX_LEVEL - self.MIN_LEVEL)))
+
+    def compress(self, payload):
+        # type: (bytes) -> bytes
+        return b"".join(self.compress_chunks(payload))
+
+    def compress_chunks(self, payload):
+        # type: (bytes) -> Iterator[bytes]
+        """Compress the payload chunk by chunk, yielding the compressed data as it is produced."""
+        compressor = self._compressobj(self.next_level())
+        view = memoryview(payload)
+        for i in range(0, len(view), CHUNK_SIZE):
+            yield compressor.compress(view[i : i + CHUNK_SIZE])
+        yield compressor.flush()
+
+    @abc.abstractmethod
+    def _compressobj(self, level):
+        pass
+
+
+class GzipCompressor(PayloadCompressor):
+    CONTENT_ENCODING = "gzip"
+    MIN_LEVEL = 1
+    MAX_LEVEL = 6
+
+    def _compressobj(self, level):
+        # Add 16 to the window size for zlib to write a gzip header and trailer
+        return zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+
+class ZstdCompressor(PayloadCompressor):
+    CONTENT_ENCODING = "zstd"
+    MIN_LEVEL = 1
+    MAX_LEVEL = 9
+
+    def __init__(self, level=None):
+        # type: (Optional[int]) -> None
+        import zstandard
+
+        self._zstd = zstandard
+        super(ZstdCompressor, self).__init__(level)
+
+    def _compressobj(self, level):
+        return self._zstd.ZstdCompressor(level=level).compressobj()
+
+
+COMPRESSORS = {
+    "gzip": GzipCompressor,
+    "zstd": ZstdCompressor,
+}
+
+
+def get_compressor(compression, level=None):
+    # type: (Optional[str], Optional[int]) -> Optional[PayloadCompressor]
+    """Return a compressor for the given compression method, if any."""
+    if not compression:
+        return None
+
+    try:
+        compressor_class = COMPRESSORS[compression.lower()]
+    except KeyError:
+        raise ValueError(
+            "Unsupported compression: '%s'. The supported compressions are: %s"
+            % (compression, ", ".join(sorted(COMPRESSORS.keys())))
+        )
+
+    try:
+        return compressor_class(level)
+    except ImportError:
+        log.warning("%s compression requires the zstandard package, falling back to gzip compression", compression)
+        return GzipCompressor(level if level is None else min(level, zlib.Z_BEST_COMPRESSION))
@@ -35,6 +35,7 @@ DEFAULT_BUFFER_SIZE = 20 << 20  # 20 MB
 DEFAULT_MAX_PAYLOAD_SIZE = 20 << 20  # 20 MB
 DEFAULT_PROCESSING_INTERVAL = 1.0
 DEFAULT_REUSE_CONNECTIONS = False
+DEFAULT_UPLOAD_QUEUE_SIZE = 2 * DEFAULT_BUFFER_SIZE  # 40 MB
 BLOCKED_RESPONSE_HTML = """
 <!DOCTYPE html><html lang="en"><head> <meta charset="UTF-8"> <meta name="viewport"
 content="width=device-width,initial-scale=1"> <title>You've been blocked</title>
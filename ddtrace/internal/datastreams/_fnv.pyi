@@ -0,0 +1 @@
+def fnv1_64(data: bytes) -> int: ...
@@ -0,0 +1,25 @@
+"""
+Native implementation of the 64 bit Fowler/Noll/Vo FNV-1 hash algorithm.
+See http://isthe.com/chongo/tech/comp/fnv/
+"""
+from libc.stdint cimport uint64_t
+
+
+cdef uint64_t FNV_64_PRIME = 0x100000001B3
+cdef uint64_t FNV1_64_INIT = 0xCBF29CE484222325
+
+
+cpdef uint64_t fnv1_64(bytes data):
+    """
+    Returns the 64 bit FNV-1 hash value for the given data.
+    """
+    cdef const unsigned char *buf = <const unsigned char *> data
+    cdef Py_ssize_t size = len(data)
+    cdef Py_ssize_t i
+    cdef uint64_t hval = FNV1_64_INIT
+
+    # The multiplication wraps around, which is the modulo 2**64 of the algorithm
+    for i in range(size):
+        hval *= FNV_64_PRIME
+        hval ^= buf[i]
+    return hval
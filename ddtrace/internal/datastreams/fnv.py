@@ -1,9 +1,14 @@
 """
 Implementation of Fowler/Noll/Vo hash algorithm in pure Python.
 See http://isthe.com/chongo/tech/comp/fnv/
+
+The 64 bit FNV-1 hash used by data streams is implemented natively in
+:mod:`ddtrace.internal.datastreams._fnv`.
 """
 import sys
 
+from ._fnv import fnv1_64  # noqa: F401
+
 
 FNV_64_PRIME = 0x100000001B3
 FNV1_64_INIT = 0xCBF29CE484222325
@@ -29,11 +34,3 @@ def fnv(data, hval_init, fnv_prime, fnv_size):
         hval = (hval * fnv_prime) % fnv_size
         hval = hval ^ _get_byte(byte)
     return hval
-
-
-def fnv1_64(data):
-    # type: (bytes) -> int
-    """
-    Returns the 64 bit FNV-1 hash value for the given data.
-    """
-    return fnv(data, FNV1_64_INIT, FNV_64_PRIME, 2 ** 64)
@@ -66,6 +66,38 @@ def dsm_kafka_message_consume(instance, message):
         )
 
 
+def dsm_kafka_messages_consume(instance, messages):
+    from . import data_streams_processor as processor
+
+    group = instance._group_id
+    now_sec = time.time()
+
+    # The checkpoints of the messages of a topic share the same edge tags, so
+    # they are set in a single batch.
+    pathways_by_topic = {}
+    for message in messages:
+        headers = {header[0]: header[1] for header in (message.headers() or [])}
+        pathways_by_topic.setdefault(message.topic(), []).append(headers.get(PROPAGATION_KEY, None))
+
+    for topic, encoded_pathways in pathways_by_topic.items():
+        processor().set_checkpoints(
+            encoded_pathways, ["direction:in", "group:" + group, "topic:" + topic, "type:kafka"], now_sec
+        )
+
+    if instance._auto_commit:
+        # it's not exactly true, but if auto commit is enabled, we consider that a message is acknowledged
+        # when it's read.
+        offsets = [
+            (
+                message.topic(),
+                message.partition(),
+                message.offset() if isinstance(message.offset(), INT_TYPES) else -1,
+            )
+            for message in messages
+        ]
+        processor().track_kafka_commits(group, offsets, now_sec)
+
+
 def dsm_kafka_message_commit(instance, args, kwargs):
     from . import data_streams_processor as processor
 
@@ -92,4 +124,5 @@ def dsm_kafka_message_commit(instance, args, kwargs):
 if config._data_streams_enabled:
     core.on("kafka.produce.start", dsm_kafka_message_produce)
     core.on("kafka.consume.start", dsm_kafka_message_consume)
+    core.on("kafka.consume_batch.start", dsm_kafka_messages_consume)
     core.on("kafka.commit.start", dsm_kafka_message_commit)
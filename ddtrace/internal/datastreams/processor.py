@@ -13,6 +13,7 @@ from typing import Dict
 from typing import List
 from typing import NamedTuple
 from typing import Optional
+from typing import Tuple
 from typing import Union
 
 from ddsketch import LogCollapsingLowestDenseDDSketch
@@ -22,6 +23,7 @@ import six
 import ddtrace
 from ddtrace import config
 from ddtrace.internal.atexit import register_on_exit_signal
+from ddtrace.internal.utils.cache import cached
 from ddtrace.internal.utils.retry import fibonacci_backoff_with_jitter
 
 from .._encoding import packb
@@ -82,6 +84,17 @@ PathwayAggrKey = typing.Tuple[
 ]
 
 
+"""
+Checkpoint identifies a checkpoint on a pathway and holds its latencies.
+"""
+Checkpoint = typing.Tuple[
+    int,  # hash_value
+    int,  # parent hash
+    float,  # edge latency in seconds
+    float,  # full pathway latency in seconds
+]
+
+
 class PathwayStats(object):
     """Aggregated pathway statistics."""
 
@@ -160,19 +173,27 @@ class DataStreamsProcessor(PeriodicService):
         :param full_pathway_latency_sec: latency from the very start of the pathway.
         :return: Nothing
         """
+        self._on_checkpoints_creation(
+            edge_tags, now_sec, [(hash_value, parent_hash, edge_latency_sec, full_pathway_latency_sec)]
+        )
+
+    def _on_checkpoints_creation(self, edge_tags, now_sec, checkpoints):
+        # type: (List[str], float, List[Checkpoint]) -> None
+        """Record checkpoints created at the same time on edges with the same tags."""
         if not self._enabled:
             return
 
         now_ns = int(now_sec * 1e9)
+        edge_tags_key = ",".join(edge_tags)
 
         with self._lock:
             # Align the span into the corresponding stats bucket
             bucket_time_ns = now_ns - (now_ns % self._bucket_size_ns)
-            aggr_key = (",".join(edge_tags), hash_value, parent_hash)
-            stats = self._buckets[bucket_time_ns].pathway_stats[aggr_key]
-            stats.full_pathway_latency.add(full_pathway_latency_sec)
-            stats.edge_latency.add(edge_latency_sec)
-            self._buckets[bucket_time_ns].pathway_stats[aggr_key] = stats
+            pathway_stats = self._buckets[bucket_time_ns].pathway_stats
+            for hash_value, parent_hash, edge_latency_sec, full_pathway_latency_sec in checkpoints:
+                stats = pathway_stats[(edge_tags_key, hash_value, parent_hash)]
+                stats.full_pathway_latency.add(full_pathway_latency_sec)
+                stats.edge_latency.add(edge_latency_sec)
 
     def track_kafka_produce(self, topic, partition, offset, now_sec):
         now_ns = int(now_sec * 1e9)
@@ -192,6 +213,18 @@ class DataStreamsProcessor(PeriodicService):
                 offset, self._buckets[bucket_time_ns].latest_commit_offsets[key]
             )
 
+    def track_kafka_commits(self, group, offsets, now_sec):
+        # type: (str, List[Tuple[str, int, int]], float) -> None
+        """Track the commit of the given ``(topic, partition, offset)`` tuples
+        for a consumer group under a single acquisition of the lock."""
+        now_ns = int(now_sec * 1e9)
+        with self._lock:
+            bucket_time_ns = now_ns - (now_ns % self._bucket_size_ns)
+            latest_commit_offsets = self._buckets[bucket_time_ns].latest_commit_offsets
+            for topic, partition, offset in offsets:
+                key = ConsumerPartitionKey(group, topic, partition)
+                latest_commit_offsets[key] = max(offset, latest_commit_offsets[key])
+
     def _serialize_buckets(self):
         # type: () -> List[Dict]
         """Serialize and update the buckets."""
@@ -309,17 +342,52 @@ class DataStreamsProcessor(PeriodicService):
 
     def decode_pathway(self, data):
         # type: (bytes) -> DataStreamsCtx
+        ctx = self._decode_pathway(data)
+        if ctx is None:
+            return self.new_pathway()
+        # reset context of current thread every time we decode
+        self._current_context.value = ctx
+        return ctx
+
+    def _decode_pathway(self, data):
+        # type: (Optional[bytes]) -> Optional[DataStreamsCtx]
         try:
-            hash_value = struct.unpack("<Q", data[:8])[0]
-            data = data[8:]
+            hash_value = struct.unpack("<Q", data[:8])[0]  # type: ignore[index]
+            data = data[8:]  # type: ignore[index]
             pathway_start_ms, data = decode_var_int_64(data)
             current_edge_start_ms, data = decode_var_int_64(data)
-            ctx = DataStreamsCtx(self, hash_value, float(pathway_start_ms) / 1e3, float(current_edge_start_ms) / 1e3)
-            # reset context of current thread every time we decode
-            self._current_context.value = ctx
-            return ctx
+            return DataStreamsCtx(self, hash_value, float(pathway_start_ms) / 1e3, float(current_edge_start_ms) / 1e3)
         except (EOFError, TypeError):
-            return self.new_pathway()
+            return None
+
+    def set_checkpoints(self, encoded_pathways, tags, now_sec=None):
+        # type: (List[Optional[bytes]], List[str], Optional[float]) -> Optional[DataStreamsCtx]
+        """Decode the pathways of a batch of messages and set a checkpoint on each of them.
+
+        This is equivalent to calling ``decode_pathway(data).set_checkpoint(tags)`` for each encoded pathway, but
+        the tags are sorted once, the hash of the checkpoint is computed once per distinct parent pathway, and the
+        stats are recorded under a single acquisition of the lock.
+
+        :param encoded_pathways: the encoded pathways of the messages, or ``None`` for messages without one
+        :param tags: a list of tags identifying the edge of the checkpoints, the same for all the messages
+        :param now_sec: The time in seconds to count as "now" when computing latencies
+        :return: the context of the last message, which becomes the current context, if any
+        """
+        if not now_sec:
+            now_sec = time.time()
+        tags = sorted(tags)
+        hashes = {}  # type: Dict[int, int]
+        checkpoints = []  # type: List[Checkpoint]
+        ctx = None
+        for data in encoded_pathways:
+            ctx = self._decode_pathway(data) or DataStreamsCtx(self, 0, now_sec, now_sec)
+            checkpoints.append(ctx._set_checkpoint(tags, now_sec, hashes=hashes))
+
+        if ctx is None:
+            return None
+        self._current_context.value = ctx
+        self._on_checkpoints_creation(tags, now_sec, checkpoints)
+        return ctx
 
     def decode_pathway_b64(self, data):
         # type: (Optional[str]) -> DataStreamsCtx
@@ -354,6 +422,20 @@ class DataStreamsProcessor(PeriodicService):
         return ctx
 
 
+@cached(maxsize=1024)
+def _compute_pathway_hash(key):
+    # type: (Tuple[str, str, Tuple[str, ...], int]) -> int
+    """Return the hash of a pathway given the service, env and sorted edge tags
+    of its last checkpoint, and the hash of its parent pathway.
+
+    The checkpoints of a deployment are a small fixed set, so the hashes are
+    memoized.
+    """
+    service, env, tags, parent_hash = key
+    node_hash = fnv1_64("".join((service, env) + tags).encode("utf-8"))
+    return fnv1_64(struct.pack("<QQ", node_hash, parent_hash))
+
+
 class DataStreamsCtx:
     def __init__(self, processor, hash_value, pathway_start_sec, current_edge_start_sec):
         # type: (DataStreamsProcessor, int, float, float) -> None
@@ -384,21 +466,8 @@ class DataStreamsCtx:
         return data_streams_context
 
     def _compute_hash(self, tags, parent_hash):
-        if six.PY3:
-
-            def get_bytes(s):
-                return bytes(s, encoding="utf-8")
-
-        else:
-
-            def get_bytes(s):
-                return bytes(s)
-
-        b = get_bytes(self.service) + get_bytes(self.env)
-        for t in tags:
-            b += get_bytes(t)
-        node_hash = fnv1_64(b)
-        return fnv1_64(struct.pack("<Q", node_hash) + struct.pack("<Q", parent_hash))
+        # type: (List[str], int) -> int
+        return _compute_pathway_hash((self.service, self.env, tuple(tags), parent_hash))
 
     def set_checkpoint(self, tags, now_sec=None, edge_start_sec_override=None, pathway_start_sec_override=None):
         """
@@ -412,6 +481,22 @@ class DataStreamsCtx:
         if not now_sec:
             now_sec = time.time()
         tags = sorted(tags)
+        hash_value, parent_hash, edge_latency_sec, pathway_latency_sec = self._set_checkpoint(
+            tags, now_sec, edge_start_sec_override, pathway_start_sec_override
+        )
+        self.processor.on_checkpoint_creation(
+            hash_value, parent_hash, tags, now_sec, edge_latency_sec, pathway_latency_sec
+        )
+
+    def _set_checkpoint(
+        self, tags, now_sec, edge_start_sec_override=None, pathway_start_sec_override=None, hashes=None
+    ):
+        # type: (List[str], float, Optional[float], Optional[float], Optional[Dict[int, int]]) -> Checkpoint
+        """Move the pathway to a new checkpoint and return the checkpoint.
+
+        :param tags: the sorted tags of the checkpoint
+        :param hashes: hashes of the checkpoints with the same tags, by parent hash
+        """
         direction = ""
         for t in tags:
             if t.startswith("direction:"):
@@ -438,14 +523,17 @@ class DataStreamsCtx:
             self.pathway_start_sec = pathway_start_sec_override
 
         parent_hash = self.hash
-        hash_value = self._compute_hash(tags, parent_hash)
+        if hashes is None:
+            hash_value = self._compute_hash(tags, parent_hash)
+        else:
+            hash_value = hashes.get(parent_hash)
+            if hash_value is None:
+                hash_value = hashes[parent_hash] = self._compute_hash(tags, parent_hash)
         edge_latency_sec = now_sec - self.current_edge_start_sec
         pathway_latency_sec = now_sec - self.pathway_start_sec
         self.hash = hash_value
         self.current_edge_start_sec = now_sec
-        self.processor.on_checkpoint_creation(
-            hash_value, parent_hash, tags, now_sec, edge_latency_sec, pathway_latency_sec
-        )
+        return hash_value, parent_hash, edge_latency_sec, pathway_latency_sec
 
 
 def _atexit(obj=None):
@@ -1,16 +1,37 @@
+import re
+
 from .utils.cache import cachedmethod
 
 
+def glob_to_regex(pattern):
+    # type: (str) -> str
+    """Translate a glob pattern into an equivalent regular expression.
+
+    The returned expression matches the whole subject, including subjects
+    spanning several lines.
+    """
+    return "(?s:%s)\\Z" % "".join(".*" if char == "*" else "." if char == "?" else re.escape(char) for char in pattern)
+
+
 class GlobMatcher(object):
     """This is a backtracking implementation of the glob matching algorithm.
     The glob pattern language supports `*` as a multiple character wildcard which includes matches on `""`
     and `?` as a single character wildcard, but no escape sequences.
-    The match method will be cached for quicker matching and is in a class to keep it from being global.
+    Patterns with at most one `*` are compiled to a regular expression, whose matching cost is linear. Other
+    patterns use the backtracking algorithm, which only ever backtracks to the last `*`, and whose result is
+    cached for quicker matching. The matcher is in a class to keep it from being global.
     """
 
     def __init__(self, pattern):
         # type: (str) -> None
         self.pattern = pattern
+        if pattern.count("*") <= 1:
+            self._regex = re.compile(glob_to_regex(pattern))
+            self.match = self._regex_match  # type: ignore[assignment]
+
+    def _regex_match(self, subject):
+        # type: (str) -> bool
+        return self._regex.match(subject) is not None
 
     @cachedmethod()
     def match(self, subject):
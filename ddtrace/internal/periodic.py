@@ -99,6 +99,50 @@ class AwakeablePeriodicThread(PeriodicThread):
             self._on_shutdown()
 
 
+class NotifiablePeriodicThread(PeriodicThread):
+    """Periodic thread that can be notified to run ahead of schedule.
+
+    Unlike :class:`AwakeablePeriodicThread`, notifying the thread does not
+    wait for the target function to be executed, so it is safe to do it from
+    latency-sensitive threads.
+    """
+
+    def __init__(
+        self,
+        interval,  # type: float
+        target,  # type: typing.Callable[[], typing.Any]
+        name=None,  # type: typing.Optional[str]
+        on_shutdown=None,  # type: typing.Optional[typing.Callable[[], typing.Any]]
+    ):
+        # type: (...) -> None
+        """Create a periodic thread that can be notified to run ahead of schedule."""
+        super(NotifiablePeriodicThread, self).__init__(interval, target, name, on_shutdown)
+        self.notified = forksafe.Event()
+
+    def notify(self):
+        # type: () -> None
+        """Request the target function to be executed as soon as possible."""
+        self.notified.set()
+
+    def stop(self):
+        """Stop the thread."""
+        if self.is_alive():
+            self.quit.set()
+            self.notified.set()
+
+    def run(self):
+        """Run the target function periodically or when notified."""
+        while True:
+            self.notified.wait(self.interval)
+            self.notified.clear()
+            if self.quit.is_set():
+                break
+            self._target()
+
+        if self._on_shutdown is not None:
+            self._on_shutdown()
+
+
 @attr.s(eq=False)
 class PeriodicService(service.Service):
     """A service that runs periodically."""
@@ -164,3 +208,14 @@ class AwakeablePeriodicService(PeriodicService):
     def awake(self):
         # type: (...) -> None
         self._worker.awake()
+
+
+class NotifiablePeriodicService(PeriodicService):
+    """A service that runs periodically but that can also be notified to run ahead of schedule."""
+
+    __thread_class__ = NotifiablePeriodicThread
+
+    def notify(self):
+        # type: (...) -> None
+        if self._worker is not None:
+            self._worker.notify()
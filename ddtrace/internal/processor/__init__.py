@@ -56,6 +56,26 @@ class SpanProcessor(six.with_metaclass(abc.ABCMeta)):
         """
         pass
 
+    def on_spans_start(self, spans):
+        # type: (List[Span]) -> None
+        """Called when a batch of spans is started in one go.
+
+        The default implementation calls :meth:`on_span_start` for each span.
+        Processors that acquire a lock or do some other fixed amount of work
+        for each span can override it to pay that cost once per batch.
+        """
+        for span in spans:
+            self.on_span_start(span)
+
+    def on_spans_finish(self, spans):
+        # type: (List[Span]) -> None
+        """Called when a batch of spans is finished in one go.
+
+        The default implementation calls :meth:`on_span_finish` for each span.
+        """
+        for span in spans:
+            self.on_span_finish(span)
+
     def shutdown(self, timeout):
         # type: (Optional[float]) -> None
         """Called when the processor is done being used.
@@ -1,6 +1,7 @@
 # coding: utf-8
 from collections import defaultdict
 import os
+import threading
 import typing
 
 from ddsketch import LogCollapsingLowestDenseDDSketch
@@ -60,6 +61,13 @@ SpanAggrKey = typing.Tuple[
 ]
 
 
+def _new_distribution():
+    # type: () -> LogCollapsingLowestDenseDDSketch
+    # Match the relative accuracy of the sketch implementation used in the backend
+    # which is 0.775%.
+    return LogCollapsingLowestDenseDDSketch(0.00775, bin_limit=2048)
+
+
 class SpanAggrStats(object):
     """Aggregated span statistics."""
 
@@ -70,10 +78,8 @@ class SpanAggrStats(object):
         self.top_level_hits = 0
         self.errors = 0
         self.duration = 0
-        # Match the relative accuracy of the sketch implementation used in the backend
-        # which is 0.775%.
-        self.ok_distribution = LogCollapsingLowestDenseDDSketch(0.00775, bin_limit=2048)
-        self.err_distribution = LogCollapsingLowestDenseDDSketch(0.00775, bin_limit=2048)
+        self.ok_distribution = _new_distribution()
+        self.err_distribution = _new_distribution()
 
 
 def _span_aggr_key(span):
@@ -82,11 +88,82 @@ def _span_aggr_key(span):
     service = span.service or ""
     resource = span.resource or ""
     _type = span.span_type or ""
-    status_code = span.get_tag("http.status_code") or 0
+    status_code = span._meta.get("http.status_code") or 0
     synthetics = span.context.dd_origin == "synthetics"
     return span.name, service, resource, _type, int(status_code), synthetics
 
 
+class SpanAggrPoint(SpanAggrStats):
+    """Span statistics pre-aggregated by a single thread.
+
+    The durations are added to the distributions of the point as the spans
+    finish, so the memory used by a point does not grow with the number of
+    spans. The distributions are merged into those of the aggregated
+    statistics at flush time.
+    """
+
+    __slots__ = ()
+
+
+class SpanStatsBuffer(object):
+    """Pre-aggregation buffer of the span statistics computed by a thread.
+
+    Only the owning thread adds points to the buffer, so its lock is only
+    contended while the buffer is drained by the flushing thread. A buffer
+    found empty when drained is closed, so that the buffers of the threads
+    that are gone, or idle, are not kept around.
+    """
+
+    __slots__ = ("lock", "points", "closed")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.points = {}  # type: Dict[int, Dict[SpanAggrKey, SpanAggrPoint]]
+        self.closed = False
+
+    def add(self, span, is_top_level, bucket_size_ns):
+        # type: (Span, bool, int) -> bool
+        """Add the span to the buffer, unless the buffer is closed.
+
+        Return whether the span was added.
+        """
+        # Align the span into the corresponding stats bucket
+        assert span.duration_ns is not None
+        span_end_ns = span.start_ns + span.duration_ns
+        bucket_time_ns = span_end_ns - (span_end_ns % bucket_size_ns)
+        aggr_key = _span_aggr_key(span)
+
+        with self.lock:
+            if self.closed:
+                return False
+            bucket = self.points.get(bucket_time_ns)
+            if bucket is None:
+                bucket = self.points[bucket_time_ns] = {}
+            point = bucket.get(aggr_key)
+            if point is None:
+                point = bucket[aggr_key] = SpanAggrPoint()
+            point.hits += 1
+            point.duration += span.duration_ns
+            if is_top_level:
+                point.top_level_hits += 1
+            if span.error:
+                point.errors += 1
+                point.err_distribution.add(span.duration_ns)
+            else:
+                point.ok_distribution.add(span.duration_ns)
+            return True
+
+    def drain(self):
+        # type: () -> Dict[int, Dict[SpanAggrKey, SpanAggrPoint]]
+        """Return the pre-aggregated points and empty the buffer, or close it
+        if it is already empty."""
+        with self.lock:
+            points, self.points = self.points, {}
+            if not points:
+                self.closed = True
+        return points
+
+
 class SpanStatsProcessorV06(PeriodicService, SpanProcessor):
     """SpanProcessor for computing, collecting and submitting span metrics to the Datadog Agent."""
 
@@ -110,7 +187,10 @@ class SpanStatsProcessorV06(PeriodicService, SpanProcessor):
             "Content-Type": "application/msgpack",
         }  # type: Dict[str, str]
         self._hostname = six.ensure_text(get_hostname())
+        # Guards the buckets and the list of per-thread buffers
         self._lock = Lock()
+        self._local = threading.local()
+        self._stats_buffers = []  # type: List[SpanStatsBuffer]
         self._enabled = True
 
         self._flush_stats_with_backoff = fibonacci_backoff_with_jitter(
@@ -133,23 +213,55 @@ class SpanStatsProcessorV06(PeriodicService, SpanProcessor):
         if not is_top_level and not _is_measured(span):
             return
 
+        self._add_span(span, is_top_level)
+
+    def on_spans_finish(self, spans):
+        # type: (List[Span]) -> None
+        if not self._enabled:
+            return
+
+        for span in spans:
+            is_top_level = _is_top_level(span)
+            if is_top_level or _is_measured(span):
+                self._add_span(span, is_top_level)
+
+    def _add_span(self, span, is_top_level):
+        # type: (Span, bool) -> None
+        """Add the span to the pre-aggregation buffer of the current thread."""
+        stats_buffer = getattr(self._local, "stats_buffer", None)
+        if stats_buffer is not None and stats_buffer.add(span, is_top_level, self._bucket_size_ns):
+            return
+
+        # The thread has no buffer yet, or its buffer was closed at the last
+        # flush. The span is added before the buffer is registered, so that it
+        # cannot be found empty and closed in between.
+        stats_buffer = self._local.stats_buffer = SpanStatsBuffer()
+        stats_buffer.add(span, is_top_level, self._bucket_size_ns)
         with self._lock:
-            # Align the span into the corresponding stats bucket
-            assert span.duration_ns is not None
-            span_end_ns = span.start_ns + span.duration_ns
-            bucket_time_ns = span_end_ns - (span_end_ns % self._bucket_size_ns)
-            aggr_key = _span_aggr_key(span)
-            stats = self._buckets[bucket_time_ns][aggr_key]
-
-            stats.hits += 1
-            stats.duration += span.duration_ns
-            if is_top_level:
-                stats.top_level_hits += 1
-            if span.error:
-                stats.errors += 1
-                stats.err_distribution.add(span.duration_ns)
-            else:
-                stats.ok_distribution.add(span.duration_ns)
+            self._stats_buffers.append(stats_buffer)
+
+    def _merge_stats_buffers(self):
+        # type: () -> None
+        """Merge the points pre-aggregated by each thread into the buckets.
+
+        Must be called with the lock held.
+        """
+        for stats_buffer in list(self._stats_buffers):
+            points = stats_buffer.drain()
+            if stats_buffer.closed:
+                self._stats_buffers.remove(stats_buffer)
+                continue
+
+            for bucket_time_ns, bucket_points in points.items():
+                bucket = self._buckets[bucket_time_ns]
+                for aggr_key, point in bucket_points.items():
+                    stats = bucket[aggr_key]
+                    stats.hits += point.hits
+                    stats.top_level_hits += point.top_level_hits
+                    stats.duration += point.duration
+                    stats.errors += point.errors
+                    stats.ok_distribution.merge(point.ok_distribution)
+                    stats.err_distribution.merge(point.err_distribution)
 
     def _serialize_buckets(self):
         # type: () -> List[Dict]
@@ -157,6 +269,8 @@ class SpanStatsProcessorV06(PeriodicService, SpanProcessor):
 
         The current bucket is left in case any other spans are added.
         """
+        self._merge_stats_buffers()
+
         serialized_buckets = []
         serialized_bucket_keys = []
         for bucket_time_ns, bucket in self._buckets.items():
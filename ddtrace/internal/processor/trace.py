@@ -1,11 +1,14 @@
 import abc
 from collections import defaultdict
+from collections import deque
 from threading import Lock
 from threading import RLock
+from typing import Deque
 from typing import Dict
 from typing import Iterable
 from typing import List
 from typing import Optional
+from typing import Sequence
 from typing import Union
 
 import attr
@@ -167,6 +170,14 @@ class SpanAggregator(SpanProcessor):
           the trace_id have finished; or
         - A minimum threshold of spans (``partial_flush_min_spans``) have been
           finished in the collection and ``partial_flush_enabled`` is True.
+
+    Traces are distributed across ``num_shards`` shards by trace_id, each
+    with its own lock, so that spans of different traces can be started and
+    finished concurrently. The trace processors and the writer are called
+    outside of the shard lock. The spans flushed from a shard are queued in
+    the order in which they were removed from their traces and handed to the
+    processors and the writer by one thread at a time, so that the partial
+    flushes of a trace reach the writer in order.
     """
 
     @attr.s
@@ -174,85 +185,168 @@ class SpanAggregator(SpanProcessor):
         spans = attr.ib(default=attr.Factory(list))  # type: List[Span]
         num_finished = attr.ib(type=int, default=0)  # type: int
 
+    @attr.s
+    class _Shard(object):
+        traces = attr.ib(
+            factory=lambda: defaultdict(lambda: SpanAggregator._Trace()),
+            type=DefaultDict[int, "SpanAggregator._Trace"],
+            repr=False,
+        )
+        if config._span_aggregator_rlock:
+            lock = attr.ib(factory=RLock, repr=False, type=Union[RLock, Lock])
+        else:
+            lock = attr.ib(factory=Lock, repr=False, type=Union[RLock, Lock])
+        # Finished spans waiting to be processed and written, in flush order
+        flushed = attr.ib(factory=deque, repr=False, type=Deque[List[Span]])
+        # Held by the thread processing and writing the flushed spans
+        flush_lock = attr.ib(factory=Lock, repr=False, type=Lock)
+        # Tracks the number of spans created and finished in the shard and tags each count
+        # with the api that was used, ex: otel api, opentracing api, datadog api
+        span_metrics = attr.ib(
+            factory=lambda: {
+                "spans_created": defaultdict(int),
+                "spans_finished": defaultdict(int),
+            },
+            repr=False,
+            type=Dict[str, DefaultDict[str, int]],
+        )
+        # Total of each of the span metrics, which can be read without the lock
+        span_metrics_totals = attr.ib(
+            factory=lambda: {"spans_created": 0, "spans_finished": 0}, repr=False, type=Dict[str, int]
+        )
+
+        def count_spans(self, metric_name, spans):
+            # type: (str, Iterable[Span]) -> None
+            """Count spans in the span metrics. Must be called with the lock held."""
+            counts = self.span_metrics[metric_name]
+            num_spans = 0
+            for span in spans:
+                counts[span._span_api] += 1
+                num_spans += 1
+            self.span_metrics_totals[metric_name] += num_spans
+
     _partial_flush_enabled = attr.ib(type=bool)
     _partial_flush_min_spans = attr.ib(type=int)
     _trace_processors = attr.ib(type=Iterable[TraceProcessor])
     _writer = attr.ib(type=TraceWriter)
-    _traces = attr.ib(
-        factory=lambda: defaultdict(lambda: SpanAggregator._Trace()),
-        init=False,
-        type=DefaultDict[int, "_Trace"],
-        repr=False,
-    )
-    if config._span_aggregator_rlock:
-        _lock = attr.ib(init=False, factory=RLock, repr=False, type=Union[RLock, Lock])
-    else:
-        _lock = attr.ib(init=False, factory=Lock, repr=False, type=Union[RLock, Lock])
-    # Tracks the number of spans created and tags each count with the api that was used
-    # ex: otel api, opentracing api, datadog api
-    _span_metrics = attr.ib(
-        init=False,
-        factory=lambda: {
-            "spans_created": defaultdict(int),
-            "spans_finished": defaultdict(int),
-        },
-        type=Dict[str, DefaultDict],
-    )
+    _num_shards = attr.ib(type=int, factory=lambda: config._span_aggregator_shards)
+    _shards = attr.ib(init=False, type=List["SpanAggregator._Shard"], repr=False)
+
+    @_shards.default
+    def _default_shards(self):
+        # type: () -> List[SpanAggregator._Shard]
+        return [self._Shard() for _ in range(max(1, self._num_shards))]
+
+    def _shard(self, trace_id):
+        # type: (int) -> SpanAggregator._Shard
+        return self._shards[trace_id % len(self._shards)]
+
+    @staticmethod
+    def _group_by_trace(spans):
+        # type: (List[Span]) -> Dict[int, List[Span]]
+        traces = defaultdict(list)  # type: DefaultDict[int, List[Span]]
+        for span in spans:
+            traces[span.trace_id].append(span)
+        return traces
 
     def on_span_start(self, span):
         # type: (Span) -> None
-        with self._lock:
-            trace = self._traces[span.trace_id]
+        shard = self._shard(span.trace_id)
+        with shard.lock:
+            trace = shard.traces[span.trace_id]
             trace.spans.append(span)
-            self._span_metrics["spans_created"][span._span_api] += 1
-            self._queue_span_count_metrics("spans_created", "integration_name")
+            shard.span_metrics["spans_created"][span._span_api] += 1
+            shard.span_metrics_totals["spans_created"] += 1
+
+    def on_spans_start(self, spans):
+        # type: (List[Span]) -> None
+        for trace_id, trace_spans in self._group_by_trace(spans).items():
+            shard = self._shard(trace_id)
+            with shard.lock:
+                shard.traces[trace_id].spans.extend(trace_spans)
+                shard.count_spans("spans_created", trace_spans)
 
     def on_span_finish(self, span):
         # type: (Span) -> None
-        with self._lock:
-            self._span_metrics["spans_finished"][span._span_api] += 1
-            trace = self._traces[span.trace_id]
-            trace.num_finished += 1
+        self._on_trace_spans_finish(span.trace_id, (span,))
+
+    def on_spans_finish(self, spans):
+        # type: (List[Span]) -> None
+        for trace_id, trace_spans in self._group_by_trace(spans).items():
+            self._on_trace_spans_finish(trace_id, trace_spans)
+
+    def _on_trace_spans_finish(self, trace_id, spans):
+        # type: (int, Sequence[Span]) -> None
+        """Account for the newly finished spans of a trace and flush the
+        finished spans of the trace if it is complete, or if it can be
+        partially flushed."""
+        shard = self._shard(trace_id)
+        with shard.lock:
+            shard.count_spans("spans_finished", spans)
+            trace = shard.traces[trace_id]
+            trace.num_finished += len(spans)
             should_partial_flush = self._partial_flush_enabled and trace.num_finished >= self._partial_flush_min_spans
-            if trace.num_finished == len(trace.spans) or should_partial_flush:
-                trace_spans = trace.spans
-                trace.spans = []
-                if trace.num_finished < len(trace_spans):
-                    finished = []
-                    for s in trace_spans:
-                        if s.finished:
-                            finished.append(s)
-                        else:
-                            trace.spans.append(s)
-                else:
-                    finished = trace_spans
-
-                num_finished = len(finished)
-
-                if should_partial_flush:
-                    log.debug("Partially flushing %d spans for trace %d", num_finished, span.trace_id)
-                    finished[0].set_metric("_dd.py.partial_flush", num_finished)
-
-                trace.num_finished -= num_finished
-
-                if len(trace.spans) == 0:
-                    del self._traces[span.trace_id]
-
-                spans = finished  # type: Optional[List[Span]]
-                for tp in self._trace_processors:
-                    try:
-                        if spans is None:
-                            return
-                        spans = tp.process_trace(spans)
-                    except Exception:
-                        log.error("error applying processor %r", tp, exc_info=True)
-
-                self._queue_span_count_metrics("spans_finished", "integration_name")
-                self._writer.write(spans)
-                return
-
-            log.debug("trace %d has %d spans, %d finished", span.trace_id, len(trace.spans), trace.num_finished)
-            return None
+            if trace.num_finished != len(trace.spans) and not should_partial_flush:
+                log.debug("trace %d has %d spans, %d finished", trace_id, len(trace.spans), trace.num_finished)
+                return None
+
+            trace_spans = trace.spans
+            trace.spans = []
+            if trace.num_finished < len(trace_spans):
+                finished = []
+                for s in trace_spans:
+                    if s.finished:
+                        finished.append(s)
+                    else:
+                        trace.spans.append(s)
+            else:
+                finished = trace_spans
+
+            num_finished = len(finished)
+
+            if should_partial_flush:
+                log.debug("Partially flushing %d spans for trace %d", num_finished, trace_id)
+                finished[0].set_metric("_dd.py.partial_flush", num_finished)
+
+            trace.num_finished -= num_finished
+
+            if len(trace.spans) == 0:
+                del shard.traces[trace_id]
+
+            shard.flushed.append(finished)
+
+        self._drain_flushed(shard)
+
+    def _drain_flushed(self, shard):
+        # type: (SpanAggregator._Shard) -> None
+        """Process and write the spans flushed from the shard.
+
+        The finished spans are no longer reachable from the shard traces, so
+        they are processed without holding the shard lock. Threads that find
+        another thread draining the queue leave their spans to it rather than
+        waiting. The queue is checked again after the flush lock is released
+        so that spans queued in the meantime are not left behind.
+        """
+        while shard.flushed and shard.flush_lock.acquire(False):
+            try:
+                while shard.flushed:
+                    self._write_trace(shard.flushed.popleft())
+            finally:
+                shard.flush_lock.release()
+
+    def _write_trace(self, spans):
+        # type: (Optional[List[Span]]) -> None
+        for tp in self._trace_processors:
+            try:
+                if spans is None:
+                    return
+                spans = tp.process_trace(spans)
+            except Exception:
+                log.error("error applying processor %r", tp, exc_info=True)
+
+        self._queue_span_count_metrics("spans_created", "integration_name")
+        self._queue_span_count_metrics("spans_finished", "integration_name")
+        self._writer.write(spans)
 
     def shutdown(self, timeout):
         # type: (Optional[float]) -> None
@@ -264,17 +358,20 @@ class SpanAggregator(SpanProcessor):
             before exiting or :obj:`None` to block until flushing has successfully completed (default: :obj:`None`)
         :type timeout: :obj:`int` | :obj:`float` | :obj:`None`
         """
-        if self._span_metrics["spans_created"] or self._span_metrics["spans_finished"]:
+        if any(
+            shard.span_metrics_totals["spans_created"] or shard.span_metrics_totals["spans_finished"]
+            for shard in self._shards
+        ):
             if config._telemetry_enabled:
                 # Telemetry writer is disabled when a process shutsdown. This is to support py3.12.
                 # Here we submit the remanining span creation metrics without restarting the periodic thread.
                 # Note - Due to how atexit hooks are registered the telemetry writer is shutdown before the tracer.
                 telemetry_writer._is_periodic = False
                 telemetry_writer._enabled = True
-                # on_span_start queue span created counts in batches of 100. This ensures all remaining counts are sent
-                # before the tracer is shutdown.
+                # Span created counts are queued in batches of 100. This ensures all remaining counts
+                # are sent before the tracer is shutdown.
                 self._queue_span_count_metrics("spans_created", "integration_name", None)
-                # on_span_finish(...) queues span finish metrics in batches of 100.
+                # Span finished counts are queued in batches of 100.
                 # This ensures all remaining counts are sent before the tracer is shutdown.
                 self._queue_span_count_metrics("spans_finished", "integration_name", None)
                 telemetry_writer.periodic(True)
@@ -292,12 +389,25 @@ class SpanAggregator(SpanProcessor):
         """Queues a telemetry count metric for span created and span finished"""
         # perf: telemetry_metrics_writer.add_count_metric(...) is an expensive operation.
         # We should avoid calling this method on every invocation of span finish and span start.
-        if min_count is None or sum(self._span_metrics[metric_name].values()) >= min_count:
-            for tag_value, count in self._span_metrics[metric_name].items():
-                telemetry_writer.add_count_metric(
-                    TELEMETRY_NAMESPACE_TAG_TRACER, metric_name, count, tags=((tag_name, tag_value),)
-                )
-            self._span_metrics[metric_name] = defaultdict(int)
+        # The shard totals are read without the shard locks, as they only decide whether to queue.
+        if min_count is not None and sum(shard.span_metrics_totals[metric_name] for shard in self._shards) < min_count:
+            return
+
+        counts = defaultdict(int)  # type: DefaultDict[str, int]
+        for shard in self._shards:
+            with shard.lock:
+                shard_counts = shard.span_metrics[metric_name]
+                if not shard_counts:
+                    continue
+                shard.span_metrics[metric_name] = defaultdict(int)
+                shard.span_metrics_totals[metric_name] = 0
+            for tag_value, count in shard_counts.items():
+                counts[tag_value] += count
+
+        for tag_value, count in counts.items():
+            telemetry_writer.add_count_metric(
+                TELEMETRY_NAMESPACE_TAG_TRACER, metric_name, count, tags=((tag_name, tag_value),)
+            )
 
 
 @attr.s
@@ -1,3 +1,4 @@
+from collections import defaultdict
 import json
 import re
 from typing import Optional
@@ -18,12 +19,14 @@ from ddtrace.constants import _SINGLE_SPAN_SAMPLING_MAX_PER_SEC
 from ddtrace.constants import _SINGLE_SPAN_SAMPLING_MAX_PER_SEC_NO_LIMIT
 from ddtrace.constants import _SINGLE_SPAN_SAMPLING_MECHANISM
 from ddtrace.constants import _SINGLE_SPAN_SAMPLING_RATE
+from ddtrace.internal.compat import pattern_type
 from ddtrace.internal.constants import SAMPLING_DECISION_TRACE_TAG_KEY
 from ddtrace.internal.constants import _CATEGORY_TO_PRIORITIES
 from ddtrace.internal.constants import _KEEP_PRIORITY_INDEX
 from ddtrace.internal.constants import _REJECT_PRIORITY_INDEX
 from ddtrace.internal.glob_matching import GlobMatcher
 from ddtrace.internal.logger import get_logger
+from ddtrace.internal.utils.cache import cachedmethod
 from ddtrace.sampling_rule import SamplingRule
 from ddtrace.settings import _config as config
 
@@ -40,9 +43,12 @@ except ImportError:
 
 if TYPE_CHECKING:  # pragma: no cover
     from typing import Any
+    from typing import Callable
     from typing import Dict
+    from typing import Iterable
     from typing import List
     from typing import Text
+    from typing import Tuple
 
     from ddtrace.context import Context
     from ddtrace.span import Span
@@ -308,12 +314,110 @@ def _set_priority(span, priority):
     span.sampled = priority > 0  # Positive priorities mean it was kept
 
 
-def _get_highest_precedence_rule_matching(span, rules):
-    # type: (Span, List[SamplingRule]) -> Optional[SamplingRule]
-    if not rules:
-        return None
+def _reindexing(method):
+    # type: (Callable[..., Any]) -> Callable[..., Any]
+    def wrapper(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        self._index._reindex()
+        return result
+
+    return wrapper
+
+
+class SamplingRuleList(list):
+    """List of the rules of a :class:`SamplingRuleIndex` that reindexes the
+    rules whenever it is changed in place."""
+
+    def __init__(self, index, rules):
+        # type: (SamplingRuleIndex, Iterable[SamplingRule]) -> None
+        super(SamplingRuleList, self).__init__(rules)
+        self._index = index
+
+    append = _reindexing(list.append)
+    extend = _reindexing(list.extend)
+    insert = _reindexing(list.insert)
+    remove = _reindexing(list.remove)
+    pop = _reindexing(list.pop)
+    sort = _reindexing(list.sort)
+    reverse = _reindexing(list.reverse)
+    __setitem__ = _reindexing(list.__setitem__)
+    __delitem__ = _reindexing(list.__delitem__)
+    __iadd__ = _reindexing(list.__iadd__)
+    __imul__ = _reindexing(list.__imul__)
+    if hasattr(list, "clear"):
+        clear = _reindexing(list.clear)
+    if hasattr(list, "__setslice__"):
+        __setslice__ = _reindexing(list.__setslice__)
+        __delslice__ = _reindexing(list.__delslice__)
+
+
+class SamplingRuleIndex(object):
+    """Index of trace sampling rules for first-match lookups.
+
+    Rules are bucketed by their exact service and name values. Rules that
+    match any service or name, or that match them with a regular expression
+    or a function, are bucketed under a wildcard instead. The rules that can
+    match a span are therefore found in at most four buckets, which are merged
+    in rule order once per service and name pair. Only these candidates are
+    then evaluated, in order, against the span.
+
+    The rules are copied into a :class:`SamplingRuleList`, so they are
+    reindexed when the ``rules`` list is changed in place.
+    """
+
+    WILDCARD = object()
+
+    def __init__(self, rules):
+        # type: (Iterable[SamplingRule]) -> None
+        self.rules = SamplingRuleList(self, rules)
+        self._reindex()
+
+    def _reindex(self):
+        # type: () -> None
+        buckets = defaultdict(list)  # type: Dict[Tuple[Any, Any], List[Tuple[int, SamplingRule]]]
+        for position, rule in enumerate(self.rules):
+            buckets[self._rule_key(rule)].append((position, rule))
+        self._buckets = dict(buckets)
+        # Drop the candidates memoized for the previous rules
+        self.__dict__.pop("_candidates", None)
+
+    @classmethod
+    def _pattern_key(cls, pattern):
+        # type: (Any) -> Any
+        if pattern is SamplingRule.NO_RULE or callable(pattern) or isinstance(pattern, pattern_type):
+            return cls.WILDCARD
+        try:
+            hash(pattern)
+        except TypeError:
+            return cls.WILDCARD
+        return pattern
+
+    @classmethod
+    def _rule_key(cls, rule):
+        # type: (SamplingRule) -> Tuple[Any, Any]
+        if type(rule).matches is not SamplingRule.matches:
+            # The rule implements its own matching logic, so it has to be
+            # evaluated for every span.
+            return cls.WILDCARD, cls.WILDCARD
+        return cls._pattern_key(rule.service), cls._pattern_key(rule.name)
+
+    @cachedmethod()
+    def _candidates(self, key):
+        # type: (Tuple[Optional[str], Optional[str]]) -> Tuple[SamplingRule, ...]
+        service, name = key
+        wildcard = self.WILDCARD
+        candidates = []  # type: List[Tuple[int, SamplingRule]]
+        for bucket_key in ((service, name), (service, wildcard), (wildcard, name), (wildcard, wildcard)):
+            candidates.extend(self._buckets.get(bucket_key, ()))
+        return tuple(rule for _, rule in sorted(candidates, key=lambda candidate: candidate[0]))
 
-    for rule in rules:
-        if rule.matches(span):
-            return rule
-    return None
+    def match(self, span):
+        # type: (Span) -> Optional[SamplingRule]
+        """Return the first rule that matches the span, if any."""
+        if not self._buckets:
+            return None
+
+        for rule in self._candidates((span.service, span.name)):
+            if rule.matches(span):
+                return rule
+        return None
@@ -1,6 +1,11 @@
+from collections import OrderedDict
+from collections import deque
+from collections import namedtuple
 from threading import RLock
 from typing import Any
 from typing import Callable
+from typing import Deque
+from typing import Dict
 from typing import Optional
 from typing import Type
 from typing import TypeVar
@@ -16,19 +21,85 @@ F = Callable[[T], Any]
 M = Callable[[Any, T], Any]
 
 
+CacheStats = namedtuple("CacheStats", ["hits", "misses", "evictions"])
+
+
 class LFUCache(dict):
     """Simple LFU cache implementation.
 
     This cache is designed for memoizing functions with a single hashable
-    argument. The eviction policy is LFU, i.e. the least frequently used values
-    are evicted when the cache is full. The amortized cost of shrinking the
-    cache when it grows beyond the requested size is O(log(size)).
+    argument. The eviction policy is LFU, i.e. the least frequently used value
+    is evicted when the cache is full, the least recently used one among those
+    with the same frequency. Keys are kept in buckets of equal frequency so
+    that both the frequency updates and the evictions are O(1).
+
+    Cache hits do not take the lock: the key is recorded in a read buffer
+    whose frequency updates are applied the next time the lock is held, i.e.
+    on a miss or when the buffer is full.
     """
 
+    READ_BUFFER_SIZE = 64
+
     def __init__(self, maxsize=256):
         # type: (int) -> None
         self.maxsize = maxsize
         self.lock = RLock()
+        self._freqs = {}  # type: Dict[Any, int]
+        self._buckets = {}  # type: Dict[int, OrderedDict]
+        self._min_freq = 0
+        self._reads = deque()  # type: Deque[Any]
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def stats(self):
+        # type: () -> CacheStats
+        """Return the number of hits, misses and evictions of the cache."""
+        return CacheStats(self._hits + len(self._reads), self._misses, self._evictions)
+
+    def clear(self):
+        # type: () -> None
+        with self.lock:
+            super(LFUCache, self).clear()
+            self._freqs.clear()
+            self._buckets.clear()
+            self._reads.clear()
+            self._min_freq = 0
+
+    def _touch(self, key):
+        # type: (Any) -> None
+        freq = self._freqs.get(key)
+        if freq is None:
+            # The key was evicted after it was read
+            return
+
+        bucket = self._buckets[freq]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[freq]
+            if self._min_freq == freq:
+                self._min_freq = freq + 1
+
+        self._freqs[key] = freq + 1
+        self._buckets.setdefault(freq + 1, OrderedDict())[key] = None
+
+    def _drain_reads(self):
+        # type: () -> None
+        reads = self._reads
+        while reads:
+            self._touch(reads.popleft())
+            self._hits += 1
+
+    def _evict(self):
+        # type: () -> None
+        bucket = self._buckets[self._min_freq]
+        key, _ = bucket.popitem(last=False)
+        if not bucket:
+            del self._buckets[self._min_freq]
+        del self._freqs[key]
+        del self[key]
+        self._evictions += 1
 
     def get(self, key, f):  # type: ignore[override]
         # type: (T, F) -> Any
@@ -38,26 +109,35 @@ class LFUCache(dict):
         function ``f`` is called on the key to generate it. The return value is
         then stored in the cache and returned to the caller.
         """
-        if len(self) >= self.maxsize:
-            for _, h in zip(range(self.maxsize >> 1), sorted(self, key=lambda h: self[h][1])):
-                del self[h]
-
-        _ = super(LFUCache, self).get(key, miss)
-        if _ is not miss:
-            value, count = _
-            self[key] = (value, count + 1)
+        value = super(LFUCache, self).get(key, miss)
+        if value is not miss:
+            self._reads.append(key)
+            if len(self._reads) >= self.READ_BUFFER_SIZE and self.lock.acquire(False):
+                try:
+                    self._drain_reads()
+                finally:
+                    self.lock.release()
             return value
 
         with self.lock:
-            _ = super(LFUCache, self).get(key, miss)
-            if _ is not miss:
-                value, count = _
-                self[key] = (value, count + 1)
+            self._drain_reads()
+
+            value = super(LFUCache, self).get(key, miss)
+            if value is not miss:
+                self._touch(key)
+                self._hits += 1
                 return value
 
+            self._misses += 1
             value = f(key)
 
-            self[key] = (value, 1)
+            if key not in self._freqs:
+                if len(self._freqs) >= self.maxsize:
+                    self._evict()
+                self._freqs[key] = 1
+                self._buckets.setdefault(1, OrderedDict())[key] = None
+                self._min_freq = 1
+            self[key] = value
 
             return value
 
@@ -75,6 +155,7 @@ def cached(maxsize=256):
             return cache.get(key, f)
 
         cached_f.invalidate = cache.clear  # type: ignore[attr-defined]
+        cached_f.cache = cache  # type: ignore[attr-defined]
 
         return cached_f
 
@@ -0,0 +1,170 @@
+from collections import deque
+import threading
+from typing import TYPE_CHECKING
+
+from .. import compat
+from ..logger import get_logger
+
+
+if TYPE_CHECKING:  # pragma: no cover
+    from typing import Deque
+    from typing import List
+    from typing import Optional
+    from typing import Tuple
+
+    from ..agent import ConnectionType
+    from .writer import HTTPWriter
+    from .writer_client import WriterClientBase
+
+    Upload = Tuple[bytes, int, WriterClientBase]
+
+
+log = get_logger(__name__)
+
+
+class UploadThread(threading.Thread):
+    """Thread sending encoded payloads on behalf of a writer.
+
+    Each thread owns its own connection to the intake so that payloads can be
+    sent concurrently.
+    """
+
+    _ddtrace_profiling_ignore = True
+
+    def __init__(
+        self,
+        uploader,  # type: PayloadUploader
+        name,  # type: str
+    ):
+        # type: (...) -> None
+        super(UploadThread, self).__init__(name=name)
+        self.daemon = True
+        self.uploader = uploader
+        self._conn = None  # type: Optional[ConnectionType]
+        self._conn_lck = threading.RLock()  # type: threading.RLock
+        # Metrics of the payloads sent by the thread, merged by the writer
+        # thread when it flushes.
+        self.metrics = deque()  # type: Deque[Tuple[str, int, Tuple]]
+
+    def run(self):
+        # type: () -> None
+        self.uploader._run()
+
+
+class PayloadUploader(object):
+    """Bounded queue of encoded payloads drained by a pool of upload threads.
+
+    The queue is bounded by the total size in bytes of the payloads it holds.
+    When a new payload does not fit, the oldest payloads are evicted to make
+    room for it.
+    """
+
+    def __init__(
+        self,
+        writer,  # type: HTTPWriter
+        workers,  # type: int
+        max_size,  # type: int
+    ):
+        # type: (...) -> None
+        self.writer = writer
+        self.workers = workers
+        self.max_size = max_size
+        self._queue = deque()  # type: Deque[Upload]
+        self._size = 0
+        self._inflight = 0
+        self._stopping = False
+        self._cond = threading.Condition(threading.Lock())
+        self._threads = []  # type: List[UploadThread]
+
+    def __len__(self):
+        # type: () -> int
+        return len(self._queue)
+
+    @property
+    def size(self):
+        # type: () -> int
+        """Return the size in bytes of the payloads waiting to be sent."""
+        with self._cond:
+            return self._size
+
+    def start(self):
+        # type: () -> None
+        name = "%s:%s" % (self.writer.__class__.__module__, self.writer.__class__.__name__)
+        with self._cond:
+            self._stopping = False
+            self._threads = [UploadThread(self, "%s:upload-%d" % (name, i)) for i in range(self.workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout=None):
+        # type: (Optional[float]) -> None
+        """Stop the upload threads once all the queued payloads have been sent.
+
+        The payloads that are still queued when the timeout expires are dropped.
+        """
+        deadline = None if timeout is None else compat.monotonic() + timeout
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        for thread in self._threads:
+            if thread.is_alive():
+                thread.join(None if deadline is None else max(0.0, deadline - compat.monotonic()))
+
+        with self._cond:
+            dropped = list(self._queue)
+            self._queue.clear()
+            self._size = 0
+            self._cond.notify_all()
+        for payload, count, _ in dropped:
+            self.writer._record_dropped_upload(payload, count, "shutdown")
+
+    def put(self, payload, count, client):
+        # type: (bytes, int, WriterClientBase) -> None
+        """Queue a payload to be sent, evicting the oldest payloads if needed."""
+        payload_size = len(payload)
+        if payload_size > self.max_size:
+            self.writer._record_dropped_upload(payload, count, "too_big")
+            return
+
+        evicted = []  # type: List[Upload]
+        with self._cond:
+            while self._queue and self._size + payload_size > self.max_size:
+                upload = self._queue.popleft()
+                self._size -= len(upload[0])
+                evicted.append(upload)
+            self._queue.append((payload, count, client))
+            self._size += payload_size
+            self._cond.notify_all()
+
+        for evicted_payload, evicted_count, _ in evicted:
+            self.writer._record_dropped_upload(evicted_payload, evicted_count, "evicted")
+
+    def wait(self, timeout=None):
+        # type: (Optional[float]) -> bool
+        """Wait until all the queued payloads have been sent."""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._queue and not self._inflight, timeout)
+
+    def _run(self):
+        # type: () -> None
+        while True:
+            with self._cond:
+                while not self._queue and not self._stopping:
+                    self._cond.wait()
+                if not self._queue:
+                    # Stopping and nothing left to send
+                    break
+                payload, count, client = self._queue.popleft()
+                self._size -= len(payload)
+                self._inflight += 1
+
+            try:
+                self.writer._upload_payload(payload, count, client)
+            except Exception:
+                log.error("failed to upload trace payload", exc_info=True)
+            finally:
+                with self._cond:
+                    self._inflight -= 1
+                    self._cond.notify_all()
+
+        self.writer._reset_connection(threading.current_thread())
@@ -1,6 +1,7 @@
 import abc
 import binascii
 from collections import defaultdict
+from collections import deque
 import logging
 import os
 import sys
@@ -30,13 +31,18 @@ from ...internal.utils.http import Response
 from ...internal.utils.time import StopWatch
 from .._encoding import BufferFull
 from .._encoding import BufferItemTooLarge
+from .._encoding import BufferedPayload
 from .._encoding import EncodingValidationError
+from .._encoding import MsgpackEncoderBase
 from ..agent import get_connection
+from ..compression import get_compressor
 from ..constants import _HTTPLIB_NO_TRACE_REQUEST
 from ..encoding import JSONEncoderV2
 from ..logger import get_logger
 from ..runtime import container
 from ..sma import SimpleMovingAverage
+from .uploader import PayloadUploader
+from .uploader import UploadThread
 from .writer_client import AgentWriterClientV3
 from .writer_client import AgentWriterClientV4
 from .writer_client import WRITER_CLIENTS
@@ -44,6 +50,7 @@ from .writer_client import WriterClientBase
 
 
 if TYPE_CHECKING:  # pragma: no cover
+    from typing import Deque
     from typing import Tuple
 
     from ddtrace import Span
@@ -137,20 +144,30 @@ class LogWriter(TraceWriter):
         pass
 
 
-class HTTPWriter(periodic.PeriodicService, TraceWriter):
+class HTTPWriter(periodic.NotifiablePeriodicService, TraceWriter):
     """Writer to an arbitrary HTTP intake endpoint."""
 
     RETRY_ATTEMPTS = 3
     HTTP_METHOD = "PUT"
     STATSD_NAMESPACE = "tracer"
+    # Maximum number of finished traces that can wait to be encoded by the
+    # writer thread when deferred encoding is enabled.
+    MAX_PENDING_TRACES = 10000
+    # Fraction of the buffer that needs to be filled for a flush to be
+    # triggered ahead of the processing interval.
+    EARLY_FLUSH_THRESHOLD = 0.5
+    # Bounds of the adaptive processing interval, relative to the configured
+    # processing interval, and the buffer fill ratios that shorten or lengthen it.
+    MIN_INTERVAL_FACTOR = 0.1
+    MAX_INTERVAL_FACTOR = 5.0
+    HIGH_FILL_RATIO = 0.5
+    LOW_FILL_RATIO = 0.05
 
     def __init__(
         self,
         intake_url,  # type: str
         clients,  # type: List[WriterClientBase]
         processing_interval=None,  # type: Optional[float]
-        # Match the payload size since there is no functionality
-        # to flush dynamically.
         buffer_size=None,  # type: Optional[int]
         max_payload_size=None,  # type: Optional[int]
         timeout=None,  # type: Optional[float]
@@ -158,6 +175,11 @@ class HTTPWriter(periodic.PeriodicService, TraceWriter):
         sync_mode=False,  # type: bool
         reuse_connections=None,  # type: Optional[bool]
         headers=None,  # type: Optional[Dict[str, str]]
+        deferred_encoding=None,  # type: Optional[bool]
+        early_flush=None,  # type: Optional[bool]
+        adaptive_interval=None,  # type: Optional[bool]
+        upload_workers=None,  # type: Optional[int]
+        upload_queue_size=None,  # type: Optional[int]
     ):
         # type: (...) -> None
 
@@ -166,6 +188,7 @@ class HTTPWriter(periodic.PeriodicService, TraceWriter):
         if timeout is None:
             timeout = config._agent_timeout_seconds
         super(HTTPWriter, self).__init__(interval=processing_interval)
+        self._processing_interval = processing_interval
         self.intake_url = intake_url
         self._buffer_size = buffer_size
         self._max_payload_size = max_payload_size
@@ -173,6 +196,9 @@ class HTTPWriter(periodic.PeriodicService, TraceWriter):
         self._timeout = timeout
 
         self._clients = clients
+        # Clients set by the upload threads, which the writer thread switches
+        # to before flushing.
+        self._pending_clients = None  # type: Optional[List[WriterClientBase]]
         self.dogstatsd = dogstatsd
         self._metrics_reset()
         self._drop_sma = SimpleMovingAverage(DEFAULT_SMA_WINDOW)
@@ -193,6 +219,35 @@ class HTTPWriter(periodic.PeriodicService, TraceWriter):
             config._trace_writer_connection_reuse if reuse_connections is None else reuse_connections
         )
 
+        # When deferred encoding is enabled, application threads only append
+        # finished traces to this queue and the writer thread encodes them
+        # right before flushing. deque.append and deque.popleft are atomic,
+        # so callers of write() never contend with a flush on the encoder
+        # lock.
+        self._deferred_encoding = (
+            config._trace_writer_deferred_encoding if deferred_encoding is None else deferred_encoding
+        )
+        self._pending_traces = deque()  # type: Deque[List[Span]]
+
+        # Set when the buffers are filling up so that the writer thread is
+        # notified only once per flush.
+        self._flush_requested = False
+        self._early_flush = config._trace_writer_early_flush if early_flush is None else early_flush
+        self._adaptive_interval = (
+            config._trace_writer_adaptive_interval if adaptive_interval is None else adaptive_interval
+        )
+
+        # When upload workers are configured, encoded payloads are queued and
+        # sent by a pool of threads so that encoding and network I/O overlap.
+        if upload_workers is None:
+            upload_workers = config._trace_writer_upload_workers
+        if upload_queue_size is None:
+            upload_queue_size = config._trace_writer_upload_queue_size
+        self._uploader = (
+            PayloadUploader(self, upload_workers, upload_queue_size) if upload_workers > 0 and not sync_mode else None
+        )  # type: Optional[PayloadUploader]
+        self._shutdown_deadline = None  # type: Optional[float]
+
     def _intake_endpoint(self, client=None):
         return "{}/{}".format(self._intake_url(client), client.ENDPOINT if client else self._endpoint)
 
@@ -216,17 +271,66 @@ class HTTPWriter(periodic.PeriodicService, TraceWriter):
         else:
             self._metrics[name][tags] = count
 
+    def _upload_metrics_dist(self, name, count=1, tags=tuple()):
+        # type: (str, int, Tuple) -> None
+        """Update a metric of the payloads sent to the intake.
+
+        The upload threads hand their metrics back to the writer thread,
+        which merges them before reporting them.
+        """
+        owner = self._connection_owner()
+        if owner is self:
+            self._metrics_dist(name, count, tags)
+        else:
+            owner.metrics.append((name, count, tags))
+
+    def _merge_upload_metrics(self):
+        # type: () -> None
+        if self._uploader is None:
+            return
+        for thread in self._uploader._threads:
+            while thread.metrics:
+                self._metrics_dist(*thread.metrics.popleft())
+
+    def _replace_clients(self, clients):
+        # type: (List[WriterClientBase]) -> None
+        """Replace the clients used to encode and send the traces.
+
+        The writer thread iterates over the clients while flushing, so the
+        upload threads leave the replacement to the writer thread.
+        """
+        if self._connection_owner() is self:
+            self._clients = clients
+        else:
+            self._pending_clients = clients
+
+    def _apply_pending_clients(self):
+        # type: () -> None
+        clients = self._pending_clients
+        if clients is not None:
+            self._pending_clients = None
+            self._clients = clients
+
     def _metrics_reset(self):
         # type: () -> None
         self._metrics = defaultdict(dict)  # type: Dict[str, Dict[Tuple[str,...], int]]
+        self._write_max_time_us = 0
+
+    def _metrics_items(self):
+        # type: () -> List[Tuple[str, List[Tuple[Tuple[str,...], int]]]]
+        """Return a snapshot of the metrics that is safe to iterate over."""
+        items = [(name, list(metric_tags.items())) for name, metric_tags in list(self._metrics.items())]
+        if self._write_max_time_us:
+            items.append(("writer.write.max_time_us", [((), self._write_max_time_us)]))
+        return items
 
     def _set_drop_rate(self):
         dropped = sum(
             counts
             for metric in ("encoder.dropped.traces", "buffer.dropped.traces", "http.dropped.traces")
-            for _tags, counts in self._metrics[metric].items()
+            for counts in self._metrics[metric].values()
         )
-        accepted = sum(counts for _tags, counts in self._metrics["writer.accepted.traces"].items())
+        accepted = sum(self._metrics["writer.accepted.traces"].values())
 
         if dropped > accepted:
             # Sanity check, we cannot drop more traces than we accepted.
@@ -244,31 +348,46 @@ class HTTPWriter(periodic.PeriodicService, TraceWriter):
         if trace:
             trace[0].set_metric(KEEP_SPANS_RATE_KEY, 1.0 - self._drop_sma.get())
 
-    def _reset_connection(self):
-        # type: () -> None
-        with self._conn_lck:
-            if self._conn:
-                self._conn.close()
-                self._conn = None
+    def _connection_owner(self):
+        # type: () -> Any
+        """Return the object holding the connection to use in the current thread.
+
+        Upload threads own their connection so that payloads can be sent
+        concurrently. All the other threads share the connection of the writer.
+        """
+        thread = threading.current_thread()
+        if isinstance(thread, UploadThread) and thread.uploader is self._uploader:
+            return thread
+        return self
+
+    def _reset_connection(self, owner=None):
+        # type: (Optional[Any]) -> None
+        if owner is None:
+            owner = self
+        with owner._conn_lck:
+            if owner._conn:
+                owner._conn.close()
+                owner._conn = None
 
     def _put(self, data, headers, client, no_trace):
         # type: (bytes, Dict[str, str], WriterClientBase, bool) -> Response
         sw = StopWatch()
         sw.start()
-        with self._conn_lck:
-            if self._conn is None:
+        owner = self._connection_owner()
+        with owner._conn_lck:
+            if owner._conn is None:
                 log.debug("creating new intake connection to %s with timeout %d", self.intake_url, self._timeout)
-                self._conn = get_connection(self._intake_url(client), self._timeout)
-                setattr(self._conn, _HTTPLIB_NO_TRACE_REQUEST, no_trace)
+                owner._conn = get_connection(self._intake_url(client), self._timeout)
+                setattr(owner._conn, _HTTPLIB_NO_TRACE_REQUEST, no_trace)
             try:
                 log.debug("Sending request: %s %s %s", self.HTTP_METHOD, client.ENDPOINT, headers)
-                self._conn.request(
+                owner._conn.request(
                     self.HTTP_METHOD,
                     client.ENDPOINT,
                     data,
                     headers,
                 )
-                resp = compat.get_connection_response(self._conn)
+                resp = compat.get_connection_response(owner._conn)
                 log.debug("Got response: %s %s", resp.status, resp.reason)
                 t = sw.elapsed()
                 if t >= self.interval:
@@ -278,19 +397,21 @@ class HTTPWriter(periodic.PeriodicService, TraceWriter):
                 log.log(log_level, "sent %s in %.5fs to %s", _human_size(len(data)), t, self._intake_endpoint(client))
             except Exception:
                 # Always reset the connection when an exception occurs
-                self._reset_connection()
+                self._reset_connection(owner)
                 raise
             else:
                 return Response.from_http_response(resp)
             finally:
                 # Reset the connection if reusing connections is disabled.
                 if not self._reuse_connections:
-                    self._reset_connection()
+                    self._reset_connection(owner)
 
     def _get_finalized_headers(self, count, client):
         # type: (int, WriterClientBase) -> dict
         headers = self._headers.copy()
         headers.update({"Content-Type": client.encoder.content_type})  # type: ignore[attr-defined]
+        if client.compressor is not None:
+            headers["Content-Encoding"] = client.compressor.CONTENT_ENCODING
         if hasattr(client, "_headers"):
             headers.update(client._headers)
         return headers
@@ -299,14 +420,14 @@ class HTTPWriter(periodic.PeriodicService, TraceWriter):
         # type: (...) -> Response
         headers = self._get_finalized_headers(count, client)
 
-        self._metrics_dist("http.requests")
+        self._upload_metrics_dist("http.requests")
 
         response = self._put(payload, headers, client, no_trace=True)
 
         if response.status >= 400:
-            self._metrics_dist("http.errors", tags=("type:%s" % response.status,))
+            self._upload_metrics_dist("http.errors", tags=("type:%s" % response.status,))
         else:
-            self._metrics_dist("http.sent.bytes", len(payload))
+            self._upload_metrics_dist("http.sent.bytes", len(payload))
 
         if response.status not in (404, 415) and response.status >= 400:
             msg = "failed to send traces to intake at %s: HTTP error status %s, reason %s"
@@ -319,27 +440,44 @@ class HTTPWriter(periodic.PeriodicService, TraceWriter):
             if config._trace_writer_log_err_payload:
                 msg += ", payload %s"
                 # If the payload is bytes then hex encode the value before logging
-                if isinstance(payload, six.binary_type):
+                if isinstance(payload, (six.binary_type, BufferedPayload)):
                     log_args += (binascii.hexlify(payload).decode(),)  # type: ignore
                 else:
                     log_args += (payload,)  # type: ignore
 
             log.error(msg, *log_args)
-            self._metrics_dist("http.dropped.bytes", len(payload))
-            self._metrics_dist("http.dropped.traces", count)
+            self._upload_metrics_dist("http.dropped.bytes", len(payload))
+            self._upload_metrics_dist("http.dropped.traces", count)
         return response
 
     def write(self, spans=None):
-        for client in self._clients:
-            self._write_with_client(client, spans=spans)
-        if self._sync_mode:
-            self.flush_queue()
-
-    def _write_with_client(self, client, spans=None):
-        # type: (WriterClientBase, Optional[List[Span]]) -> None
-        if spans is None:
-            return
+        start_ns = compat.monotonic_ns()
+        try:
+            if self._deferred_encoding and not self._sync_mode:
+                self._write_deferred(spans)
+                return
 
+            for client in self._clients:
+                self._write_with_client(client, spans=spans)
+            if self._sync_mode:
+                self.flush_queue()
+        finally:
+            self._record_write_time(compat.monotonic_ns() - start_ns)
+
+    def _record_write_time(self, elapsed_ns):
+        # type: (int) -> None
+        # Track how long callers are blocked in write() so that contention
+        # with the flushing thread can be observed from the health metrics.
+        elapsed_us = elapsed_ns // 1000
+        self._metrics_dist("writer.write.time_us", elapsed_us)
+        # The maximum is kept apart from the metrics so that it is updated
+        # without a lock. Concurrent writes can lose an update, which only
+        # makes the reported maximum a lower bound.
+        if elapsed_us > self._write_max_time_us:
+            self._write_max_time_us = elapsed_us
+
+    def _start_on_write(self):
+        # type: () -> None
         if self._sync_mode is False:
             # Start the HTTPWriter on first write.
             try:
@@ -349,11 +487,90 @@ class HTTPWriter(periodic.PeriodicService, TraceWriter):
             except service.ServiceStatusError:
                 pass
 
+    def _write_deferred(self, spans=None):
+        # type: (Optional[List[Span]]) -> None
+        if spans is None:
+            return
+
+        self._start_on_write()
+
+        if len(self._pending_traces) >= self.MAX_PENDING_TRACES:
+            log.warning(
+                "pending trace queue (%d traces) is full, dropping trace (writer status: %s)",
+                len(self._pending_traces),
+                self.status.value,
+            )
+            n_clients = len(self._clients)
+            self._metrics_dist("writer.accepted.traces", n_clients)
+            self._metrics_dist("buffer.dropped.traces", n_clients, tags=("reason:full",))
+            return
+
+        self._pending_traces.append(spans)
+
+        if self._early_flush and len(self._pending_traces) >= self.MAX_PENDING_TRACES * self.EARLY_FLUSH_THRESHOLD:
+            self._request_flush()
+
+    def _encode_pending_traces(self):
+        # type: () -> None
+        pending = self._pending_traces
+        while pending:
+            try:
+                spans = pending.popleft()
+            except IndexError:
+                # Another thread drained the queue concurrently
+                break
+            for client in self._clients:
+                self._put_with_client(client, spans, flush_when_full=True)
+
+    def _write_with_client(self, client, spans=None):
+        # type: (WriterClientBase, Optional[List[Span]]) -> None
+        if spans is None:
+            return
+
+        self._start_on_write()
+        self._put_with_client(client, spans)
+
+        if (
+            self._early_flush
+            and not self._sync_mode
+            and not self._flush_requested
+            and self._buffer_fill_ratio(client) >= self.EARLY_FLUSH_THRESHOLD
+        ):
+            # Flush before the buffer is full to avoid dropping traces
+            self._request_flush()
+
+    def _buffer_fill_ratio(self, client):
+        # type: (WriterClientBase) -> float
+        encoder = client.encoder
+        if not isinstance(encoder, MsgpackEncoderBase) or not encoder.max_size:
+            # Only the msgpack encoders have a bounded buffer
+            return 0.0
+        return encoder.size / float(encoder.max_size)
+
+    def _request_flush(self):
+        # type: () -> None
+        if self._flush_requested:
+            return
+        self._flush_requested = True
+        self._metrics_dist("writer.early_flush.requests")
+        self.notify()
+
+    def _put_with_client(self, client, spans, flush_when_full=False):
+        # type: (WriterClientBase, List[Span], bool) -> None
         self._metrics_dist("writer.accepted.traces")
         self._set_keep_rate(spans)
 
         try:
-            client.encoder.put(spans)
+            try:
+                client.encoder.put(spans)
+            except BufferFull:
+                if not flush_when_full:
+                    raise
+                # The writer thread encodes the pending traces right before
+                # flushing, so it can send the full buffer and make room for
+                # the trace instead of dropping it.
+                self._flush_queue_with_client(client)
+                client.encoder.put(spans)
         except BufferItemTooLarge as e:
             payload_size = e.args[0]
             log.warning(
@@ -383,6 +600,9 @@ class HTTPWriter(periodic.PeriodicService, TraceWriter):
 
     def flush_queue(self, raise_exc=False):
         try:
+            self._apply_pending_clients()
+            self._merge_upload_metrics()
+            self._encode_pending_traces()
             for client in self._clients:
                 self._flush_queue_with_client(client, raise_exc=raise_exc)
         finally:
@@ -406,21 +626,24 @@ class HTTPWriter(periodic.PeriodicService, TraceWriter):
             self._metrics_dist("encoder.dropped.traces", n_traces)
             return
 
+        encoded_size = len(encoded)
+        if client.compressor is not None:
+            try:
+                encoded = client.compressor.compress(encoded)
+            except Exception:
+                log.error("failed to compress payload with compressor %r", client.compressor, exc_info=True)
+                self._metrics_dist("encoder.dropped.traces", n_traces)
+                return
+
         try:
-            self._send_payload_with_backoff(encoded, n_traces, client)
+            if self._uploader is not None and not raise_exc:
+                self._uploader.put(encoded, n_traces, client)
+            else:
+                self._send_payload_with_backoff(encoded, n_traces, client)
         except Exception:
-            self._metrics_dist("http.errors", tags=("type:err",))
-            self._metrics_dist("http.dropped.bytes", len(encoded))
-            self._metrics_dist("http.dropped.traces", n_traces)
+            self._record_send_error(encoded, n_traces, client)
             if raise_exc:
                 six.reraise(*sys.exc_info())
-            else:
-                log.error(
-                    "failed to send, dropping %d traces to intake at %s after %d retries",
-                    n_traces,
-                    self._intake_endpoint(client),
-                    self.RETRY_ATTEMPTS,
-                )
         finally:
             if config.health_metrics_enabled and self.dogstatsd:
                 namespace = self.STATSD_NAMESPACE
@@ -429,19 +652,86 @@ class HTTPWriter(periodic.PeriodicService, TraceWriter):
                 # https://github.com/DataDog/datadogpy/issues/439
                 # This really isn't ideal as now we're going to do a ton of socket calls.
                 self.dogstatsd.distribution("datadog.%s.http.sent.bytes" % namespace, len(encoded))
+                if client.compressor is not None:
+                    self.dogstatsd.distribution(
+                        "datadog.%s.http.sent.uncompressed.bytes" % namespace,
+                        encoded_size,
+                        tags=["encoding:%s" % client.compressor.CONTENT_ENCODING],
+                    )
                 self.dogstatsd.distribution("datadog.%s.http.sent.traces" % namespace, n_traces)
-                for name, metric_tags in self._metrics.items():
-                    for tags, count in metric_tags.items():
+                for name, metric_tags in self._metrics_items():
+                    for tags, count in metric_tags:
                         self.dogstatsd.distribution("datadog.%s.%s" % (namespace, name), count, tags=list(tags))
 
+    def _record_send_error(self, payload, count, client):
+        # type: (bytes, int, WriterClientBase) -> None
+        self._upload_metrics_dist("http.errors", tags=("type:err",))
+        self._upload_metrics_dist("http.dropped.bytes", len(payload))
+        self._upload_metrics_dist("http.dropped.traces", count)
+        log.error(
+            "failed to send, dropping %d traces to intake at %s after %d retries",
+            count,
+            self._intake_endpoint(client),
+            self.RETRY_ATTEMPTS,
+        )
+
+    def _record_dropped_upload(self, payload, count, reason):
+        # type: (bytes, int, str) -> None
+        log.warning(
+            "dropping payload of %d traces (%s) from the upload queue (reason: %s)",
+            count,
+            _human_size(len(payload)),
+            reason,
+        )
+        self._upload_metrics_dist("http.dropped.bytes", len(payload), tags=("reason:%s" % reason,))
+        self._upload_metrics_dist("http.dropped.traces", count, tags=("reason:%s" % reason,))
+
+    def _upload_payload(self, payload, count, client):
+        # type: (bytes, int, WriterClientBase) -> None
+        """Send a payload from one of the upload threads."""
+        try:
+            self._send_payload_with_backoff(payload, count, client)
+        except Exception:
+            self._record_send_error(payload, count, client)
+
     def periodic(self):
+        self._flush_requested = False
+        if self._adaptive_interval:
+            fill_ratio = max(self._buffer_fill_ratio(client) for client in self._clients)
+            if self._deferred_encoding:
+                fill_ratio = max(fill_ratio, len(self._pending_traces) / float(self.MAX_PENDING_TRACES))
+            self._adapt_interval(fill_ratio)
         self.flush_queue(raise_exc=False)
 
+    def _adapt_interval(self, fill_ratio):
+        # type: (float) -> None
+        """Shorten the processing interval when the buffers fill up quickly and
+        lengthen it back when the writer is idle.
+        """
+        if fill_ratio >= self.HIGH_FILL_RATIO:
+            interval = max(self.interval / 2.0, self._processing_interval * self.MIN_INTERVAL_FACTOR)
+        elif fill_ratio <= self.LOW_FILL_RATIO:
+            interval = min(self.interval * 1.5, self._processing_interval * self.MAX_INTERVAL_FACTOR)
+        else:
+            return
+        if interval != self.interval:
+            log.debug("adjusting writer processing interval to %.3fs (buffer fill ratio: %.2f)", interval, fill_ratio)
+            self.interval = interval
+
+    def _start_service(self, *args, **kwargs):
+        # type: (Any, Any) -> None
+        super(HTTPWriter, self)._start_service(*args, **kwargs)
+        if self._uploader is not None:
+            self._uploader.start()
+
     def _stop_service(
         self,
         timeout=None,  # type: Optional[float]
     ):
         # type: (...) -> None
+        # The payloads still queued for upload are sent when the writer thread
+        # shuts down, which must not outlast the stop timeout.
+        self._shutdown_deadline = None if timeout is None else compat.monotonic() + timeout
         # FIXME: don't join() on stop(), let the caller handle this
         super(HTTPWriter, self)._stop_service()
         self.join(timeout=timeout)
@@ -450,7 +740,14 @@ class HTTPWriter(periodic.PeriodicService, TraceWriter):
         try:
             self.periodic()
         finally:
-            self._reset_connection()
+            try:
+                if self._uploader is not None:
+                    # Send the payloads that are still queued before exiting,
+                    # dropping those left when the stop timeout expires.
+                    deadline = self._shutdown_deadline
+                    self._uploader.stop(None if deadline is None else max(0.0, deadline - compat.monotonic()))
+            finally:
+                self._reset_connection()
 
 
 class AgentResponse(object):
@@ -476,8 +773,6 @@ class AgentWriter(HTTPWriter):
         agent_url,  # type: str
         priority_sampling=False,  # type: bool
         processing_interval=None,  # type: Optional[float]
-        # Match the payload size since there is no functionality
-        # to flush dynamically.
         buffer_size=None,  # type: Optional[int]
         max_payload_size=None,  # type: Optional[int]
         timeout=None,  # type: Optional[float]
@@ -488,6 +783,11 @@ class AgentWriter(HTTPWriter):
         reuse_connections=None,  # type: Optional[bool]
         headers=None,  # type: Optional[Dict[str, str]]
         response_callback=None,  # type: Optional[Callable[[AgentResponse], None]]
+        deferred_encoding=None,  # type: Optional[bool]
+        early_flush=None,  # type: Optional[bool]
+        adaptive_interval=None,  # type: Optional[bool]
+        upload_workers=None,  # type: Optional[int]
+        upload_queue_size=None,  # type: Optional[int]
     ):
         # type: (...) -> None
         if processing_interval is None:
@@ -514,8 +814,9 @@ class AgentWriter(HTTPWriter):
 
         buffer_size = buffer_size or config._trace_writer_buffer_size
         max_payload_size = max_payload_size or config._trace_writer_payload_size
+        compressor = get_compressor(config._trace_writer_compression, config._trace_writer_compression_level)
         try:
-            client = WRITER_CLIENTS[self._api_version](buffer_size, max_payload_size)
+            client = WRITER_CLIENTS[self._api_version](buffer_size, max_payload_size, compressor)
         except KeyError:
             raise ValueError(
                 "Unsupported api version: '%s'. The supported versions are: %r"
@@ -555,19 +856,29 @@ class AgentWriter(HTTPWriter):
             sync_mode=sync_mode,
             reuse_connections=reuse_connections,
             headers=_headers,
+            deferred_encoding=deferred_encoding,
+            early_flush=early_flush,
+            adaptive_interval=adaptive_interval,
+            upload_workers=upload_workers,
+            upload_queue_size=upload_queue_size,
         )
 
     def recreate(self):
         # type: () -> HTTPWriter
         return self.__class__(
             agent_url=self.agent_url,
-            processing_interval=self._interval,
+            processing_interval=self._processing_interval,
             buffer_size=self._buffer_size,
             max_payload_size=self._max_payload_size,
             timeout=self._timeout,
             dogstatsd=self.dogstatsd,
             sync_mode=self._sync_mode,
             api_version=self._api_version,
+            deferred_encoding=self._deferred_encoding,
+            early_flush=self._early_flush,
+            adaptive_interval=self._adaptive_interval,
+            upload_workers=self._uploader.workers if self._uploader is not None else 0,
+            upload_queue_size=self._uploader.max_size if self._uploader is not None else None,
         )
 
     @property
@@ -580,7 +891,7 @@ class AgentWriter(HTTPWriter):
 
     def _downgrade(self, payload, response, client):
         if client.ENDPOINT == "v0.5/traces":
-            self._clients = [AgentWriterClientV4(self._buffer_size, self._max_payload_size)]
+            self._replace_clients([AgentWriterClientV4(self._buffer_size, self._max_payload_size, client.compressor)])
             # Since we have to change the encoding in this case, the payload
             # would need to be converted to the downgraded encoding before
             # sending it, but we chuck it away instead.
@@ -591,7 +902,7 @@ class AgentWriter(HTTPWriter):
             )
             return None
         if client.ENDPOINT == "v0.4/traces":
-            self._clients = [AgentWriterClientV3(self._buffer_size, self._max_payload_size)]
+            self._replace_clients([AgentWriterClientV3(self._buffer_size, self._max_payload_size, client.compressor)])
             # These endpoints share the same encoding, so we can try sending the
             # same payload over the downgraded endpoint.
             return payload
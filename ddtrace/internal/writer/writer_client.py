@@ -1,4 +1,7 @@
+from typing import Optional
+
 from .._encoding import BufferedEncoder
+from ..compression import PayloadCompressor
 from ..encoding import MSGPACK_ENCODERS
 
 
@@ -10,31 +13,35 @@ class WriterClientBase(object):
     def __init__(
         self,
         encoder,  # type: BufferedEncoder
+        compressor=None,  # type: Optional[PayloadCompressor]
     ):
         self.encoder = encoder
+        self.compressor = compressor
 
 
 class AgentWriterClientV5(WriterClientBase):
     ENDPOINT = "v0.5/traces"
 
-    def __init__(self, buffer_size, max_payload_size):
+    def __init__(self, buffer_size, max_payload_size, compressor=None):
         super(AgentWriterClientV5, self).__init__(
             MSGPACK_ENCODERS["v0.5"](
                 max_size=buffer_size,
                 max_item_size=max_payload_size,
-            )
+            ),
+            compressor,
         )
 
 
 class AgentWriterClientV4(WriterClientBase):
     ENDPOINT = "v0.4/traces"
 
-    def __init__(self, buffer_size, max_payload_size):
+    def __init__(self, buffer_size, max_payload_size, compressor=None):
         super(AgentWriterClientV4, self).__init__(
             MSGPACK_ENCODERS["v0.4"](
                 max_size=buffer_size,
                 max_item_size=max_payload_size,
-            )
+            ),
+            compressor,
         )
 
 
@@ -10,6 +10,7 @@ from six.moves import _thread
 import wrapt
 
 from ddtrace.internal import compat
+from ddtrace.internal import forksafe
 from ddtrace.profiling import _threading
 from ddtrace.profiling import collector
 from ddtrace.profiling import event
@@ -24,6 +25,8 @@ class LockEventBase(event.StackBasedEvent):
 
     lock_name = attr.ib(default="<unknown lock name>", type=str)
     sampling_pct = attr.ib(default=0, type=int)
+    # The number of sampled lock operations this event accounts for
+    count = attr.ib(default=1, type=int)
 
 
 @event.event_class
@@ -40,12 +43,6 @@ class LockReleaseEvent(LockEventBase):
     locked_for_ns = attr.ib(default=0, type=int)
 
 
-def _current_thread():
-    # type: (...) -> typing.Tuple[int, str]
-    thread_id = _thread.get_ident()
-    return thread_id, _threading.get_thread_name(thread_id)
-
-
 # We need to know if wrapt is compiled in C or not. If it's not using the C module, then the wrappers function will
 # appear in the stack trace and we need to hide it.
 if os.environ.get("WRAPT_DISABLE_EXTENSIONS"):
@@ -60,18 +57,80 @@ else:
         del _w
 
 
+class _LockEventAggregator(object):
+    """Aggregate the lock events of each call site until the next flush.
+
+    Events are keyed by lock, thread, task, span and stack: the first event of a call site is stored and the next
+    ones only add their count and duration to it.
+    """
+
+    def __init__(self):
+        # type: (...) -> None
+        self._events = {}  # type: typing.Dict[typing.Tuple[typing.Any, ...], LockEventBase]
+        # Do not use threading.Lock: it might be profiled
+        self._lock = forksafe.ResetObject(_thread.allocate_lock)
+
+    def add(
+        self,
+        key,  # type: typing.Tuple[typing.Any, ...]
+        duration_field,  # type: str
+        duration_ns,  # type: int
+    ):
+        # type: (...) -> bool
+        """Account for a lock operation of a call site.
+
+        :return: False if the call site has no event yet, in which case the caller must insert one.
+        """
+        with self._lock:
+            event = self._events.get(key)
+            if event is None:
+                return False
+            event.count += 1
+            setattr(event, duration_field, getattr(event, duration_field) + duration_ns)
+            return True
+
+    def insert(
+        self,
+        key,  # type: typing.Tuple[typing.Any, ...]
+        event,  # type: LockEventBase
+        duration_field,  # type: str
+    ):
+        # type: (...) -> None
+        with self._lock:
+            aggregated = self._events.setdefault(key, event)
+            if aggregated is not event:
+                # Another thread inserted an event for the same call site in the meantime
+                aggregated.count += event.count
+                duration_ns = getattr(aggregated, duration_field) + getattr(event, duration_field)
+                setattr(aggregated, duration_field, duration_ns)
+
+    def flush(self):
+        # type: (...) -> typing.List[typing.List[LockEventBase]]
+        """Return the aggregated events grouped by event class and reset the aggregator."""
+        with self._lock:
+            events, self._events = self._events, {}
+
+        events_by_class = {}  # type: typing.Dict[typing.Type[LockEventBase], typing.List[LockEventBase]]
+        for lock_event in events.values():
+            events_by_class.setdefault(type(lock_event), []).append(lock_event)
+        return list(events_by_class.values())
+
+
 class _ProfiledLock(wrapt.ObjectProxy):
 
     ACQUIRE_EVENT_CLASS = LockAcquireEvent
     RELEASE_EVENT_CLASS = LockReleaseEvent
 
-    def __init__(self, wrapped, recorder, tracer, max_nframes, capture_sampler, endpoint_collection_enabled):
+    def __init__(
+        self, wrapped, recorder, tracer, max_nframes, capture_sampler, endpoint_collection_enabled, aggregator=None
+    ):
         wrapt.ObjectProxy.__init__(self, wrapped)
         self._self_recorder = recorder
         self._self_tracer = tracer
         self._self_max_nframes = max_nframes
         self._self_capture_sampler = capture_sampler
         self._self_endpoint_collection_enabled = endpoint_collection_enabled
+        self._self_aggregator = aggregator
         frame = sys._getframe(2 if WRAPT_C_EXT else 3)
         code = frame.f_code
         self._self_name = "%s:%d" % (os.path.basename(code.co_filename), frame.f_lineno)
@@ -82,6 +141,45 @@ class _ProfiledLock(wrapt.ObjectProxy):
     def __aexit__(self, *args, **kwargs):
         return self.__wrapped__.__aexit__(*args, **kwargs)
 
+    def _self_record(self, event_class, frame, duration_field, duration_ns):
+        thread_id = _thread.get_ident()
+        task_id, task_name, task_frame = _task.get_task(thread_id)
+
+        if task_frame is not None:
+            frame = task_frame
+
+        frames, nframes = _traceback.pyframe_to_frames(frame, self._self_max_nframes)
+
+        span = self._self_tracer.current_span() if self._self_tracer is not None else None
+
+        aggregator = self._self_aggregator
+        if aggregator is not None:
+            span_id = None if span is None else span.span_id
+            key = (event_class, self._self_name, thread_id, task_id, span_id, tuple(frames))
+            # The call site has already been seen since the last flush: no need to create an event
+            if aggregator.add(key, duration_field, duration_ns):
+                return
+
+        event = event_class(
+            lock_name=self._self_name,
+            frames=frames,
+            nframes=nframes,
+            thread_id=thread_id,
+            thread_name=_threading.get_thread_name(thread_id),
+            task_id=task_id,
+            task_name=task_name,
+            sampling_pct=self._self_capture_sampler.capture_pct,
+            **{duration_field: duration_ns},
+        )
+
+        if self._self_tracer is not None:
+            event.set_trace_info(span, self._self_endpoint_collection_enabled)
+
+        if aggregator is None:
+            self._self_recorder.push_event(event)
+        else:
+            aggregator.insert(key, event, duration_field)
+
     def acquire(self, *args, **kwargs):
         if not self._self_capture_sampler.capture():
             return self.__wrapped__.acquire(*args, **kwargs)
@@ -92,32 +190,7 @@ class _ProfiledLock(wrapt.ObjectProxy):
         finally:
             try:
                 end = self._self_acquired_at = compat.monotonic_ns()
-                thread_id, thread_name = _current_thread()
-                task_id, task_name, task_frame = _task.get_task(thread_id)
-
-                if task_frame is None:
-                    frame = sys._getframe(1)
-                else:
-                    frame = task_frame
-
-                frames, nframes = _traceback.pyframe_to_frames(frame, self._self_max_nframes)
-
-                event = self.ACQUIRE_EVENT_CLASS(
-                    lock_name=self._self_name,
-                    frames=frames,
-                    nframes=nframes,
-                    thread_id=thread_id,
-                    thread_name=thread_name,
-                    task_id=task_id,
-                    task_name=task_name,
-                    wait_time_ns=end - start,
-                    sampling_pct=self._self_capture_sampler.capture_pct,
-                )
-
-                if self._self_tracer is not None:
-                    event.set_trace_info(self._self_tracer.current_span(), self._self_endpoint_collection_enabled)
-
-                self._self_recorder.push_event(event)
+                self._self_record(self.ACQUIRE_EVENT_CLASS, sys._getframe(1), "wait_time_ns", end - start)
             except Exception:
                 pass  # nosec
 
@@ -130,34 +203,12 @@ class _ProfiledLock(wrapt.ObjectProxy):
                 if hasattr(self, "_self_acquired_at"):
                     try:
                         end = compat.monotonic_ns()
-                        thread_id, thread_name = _current_thread()
-                        task_id, task_name, task_frame = _task.get_task(thread_id)
-
-                        if task_frame is None:
-                            frame = sys._getframe(1)
-                        else:
-                            frame = task_frame
-
-                        frames, nframes = _traceback.pyframe_to_frames(frame, self._self_max_nframes)
-
-                        event = self.RELEASE_EVENT_CLASS(
-                            lock_name=self._self_name,
-                            frames=frames,
-                            nframes=nframes,
-                            thread_id=thread_id,
-                            thread_name=thread_name,
-                            task_id=task_id,
-                            task_name=task_name,
-                            locked_for_ns=end - self._self_acquired_at,
-                            sampling_pct=self._self_capture_sampler.capture_pct,
+                        self._self_record(
+                            self.RELEASE_EVENT_CLASS,
+                            sys._getframe(1),
+                            "locked_for_ns",
+                            end - self._self_acquired_at,
                         )
-
-                        if self._self_tracer is not None:
-                            event.set_trace_info(
-                                self._self_tracer.current_span(), self._self_endpoint_collection_enabled
-                            )
-
-                        self._self_recorder.push_event(event)
                     finally:
                         del self._self_acquired_at
             except Exception:
@@ -180,10 +231,12 @@ class LockCollector(collector.CaptureSamplerCollector):
 
     nframes = attr.ib(type=int, default=config.max_frames)
     endpoint_collection_enabled = attr.ib(type=bool, default=config.endpoint_collection)
+    aggregate_events = attr.ib(type=bool, default=config.lock.aggregate_events)
 
     tracer = attr.ib(default=None)
 
     _original = attr.ib(init=False, repr=False, type=typing.Any, cmp=False)
+    _aggregator = attr.ib(init=False, default=None, repr=False, type=typing.Optional[_LockEventAggregator], cmp=False)
 
     @abc.abstractmethod
     def _get_original(self):
@@ -209,17 +262,31 @@ class LockCollector(collector.CaptureSamplerCollector):
         super(LockCollector, self)._stop_service()
         self.unpatch()
 
+    def snapshot(self):
+        # type: (...) -> typing.List[typing.List[LockEventBase]]
+        """Return the lock events aggregated since the last snapshot."""
+        if self._aggregator is None:
+            return []
+        return self._aggregator.flush()
+
     def patch(self):
         # type: (...) -> None
         """Patch the module for tracking lock allocation."""
         # We only patch the lock from the `threading` module.
         # Nobody should use locks from `_thread`; if they do so, then it's deliberate and we don't profile.
         self.original = self._get_original()
+        self._aggregator = _LockEventAggregator() if self.aggregate_events else None
 
         def _allocate_lock(wrapped, instance, args, kwargs):
             lock = wrapped(*args, **kwargs)
             return self.PROFILED_LOCK_CLASS(
-                lock, self.recorder, self.tracer, self.nframes, self._capture_sampler, self.endpoint_collection_enabled
+                lock,
+                self.recorder,
+                self.tracer,
+                self.nframes,
+                self._capture_sampler,
+                self.endpoint_collection_enabled,
+                self._aggregator,
             )
 
         self._set_original(FunctionWrapper(self.original, _allocate_lock))
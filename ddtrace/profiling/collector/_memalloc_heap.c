@@ -1,11 +1,149 @@
 #include <math.h>
 #include <stdlib.h>
+#include <string.h>
 
 #define PY_SSIZE_T_CLEAN
 #include "_memalloc_heap.h"
 #include "_memalloc_reentrant.h"
 #include "_memalloc_tb.h"
 
+/* Open-addressing hash table mapping the pointers of the tracked allocations
+   to the index of their traceback in heap_tracker_t.allocs. Collisions are
+   resolved with linear probing. */
+typedef struct
+{
+    /* Pointer of the tracked allocation, NULL if the slot is empty */
+    void* ptr;
+    /* Index of the traceback in heap_tracker_t.allocs */
+    TRACEBACK_ARRAY_COUNT_TYPE index;
+} ptr_index_slot_t;
+
+typedef struct
+{
+    ptr_index_slot_t* slots;
+    /* Number of slots, always a power of 2 */
+    size_t size;
+    /* Number of non-empty slots */
+    size_t count;
+} ptr_index_t;
+
+#define PTR_INDEX_MIN_SIZE 64
+
+static inline size_t
+ptr_index_hash(const ptr_index_t* index, void* ptr)
+{
+    /* Allocations are aligned so the low bits are always the same: mix all the
+       bits of the pointer (finalizer of MurmurHash3) */
+    uint64_t h = (uint64_t)(uintptr_t)ptr;
+    h ^= h >> 33;
+    h *= 0xff51afd7ed558ccdULL;
+    h ^= h >> 33;
+    return (size_t)h & (index->size - 1);
+}
+
+static void
+ptr_index_init(ptr_index_t* index)
+{
+    index->slots = NULL;
+    index->size = 0;
+    index->count = 0;
+}
+
+static void
+ptr_index_wipe(ptr_index_t* index)
+{
+    PyMem_RawFree(index->slots);
+    ptr_index_init(index);
+}
+
+/* Return the slot of ptr, or the empty slot where it should be inserted */
+static inline ptr_index_slot_t*
+ptr_index_lookup(const ptr_index_t* index, void* ptr)
+{
+    size_t i = ptr_index_hash(index, ptr);
+
+    while (index->slots[i].ptr != NULL && index->slots[i].ptr != ptr)
+        i = (i + 1) & (index->size - 1);
+
+    return &index->slots[i];
+}
+
+/* Make room for count entries. The load factor is kept under 1/2 so that
+   probe sequences stay short.
+
+   Returns false if the memory could not be allocated. */
+static bool
+ptr_index_reserve(ptr_index_t* index, size_t count)
+{
+    if (count * 2 <= index->size)
+        return true;
+
+    size_t size = index->size ? index->size : PTR_INDEX_MIN_SIZE;
+    while (count * 2 > size)
+        size *= 2;
+
+    ptr_index_slot_t* slots = PyMem_RawCalloc(size, sizeof(ptr_index_slot_t));
+    if (slots == NULL)
+        return false;
+
+    ptr_index_t resized = { slots, size, index->count };
+    for (size_t i = 0; i < index->size; i++)
+        if (index->slots[i].ptr != NULL)
+            *ptr_index_lookup(&resized, index->slots[i].ptr) = index->slots[i];
+
+    PyMem_RawFree(index->slots);
+    *index = resized;
+    return true;
+}
+
+/* Map ptr to the given index, replacing any previous mapping. There must be
+   room for the entry, see ptr_index_reserve. */
+static inline void
+ptr_index_set(ptr_index_t* index, void* ptr, TRACEBACK_ARRAY_COUNT_TYPE i)
+{
+    ptr_index_slot_t* slot = ptr_index_lookup(index, ptr);
+    if (slot->ptr == NULL) {
+        slot->ptr = ptr;
+        index->count++;
+    }
+    slot->index = i;
+}
+
+static inline ptr_index_slot_t*
+ptr_index_get(const ptr_index_t* index, void* ptr)
+{
+    if (index->count == 0)
+        return NULL;
+
+    ptr_index_slot_t* slot = ptr_index_lookup(index, ptr);
+    return slot->ptr == NULL ? NULL : slot;
+}
+
+static void
+ptr_index_delete(ptr_index_t* index, ptr_index_slot_t* slot)
+{
+    /* Shift back the entries that follow the deleted one in the probe sequence
+       so that lookups do not need tombstones */
+    size_t mask = index->size - 1;
+    size_t hole = slot - index->slots;
+    size_t i = hole;
+
+    for (;;) {
+        i = (i + 1) & mask;
+        if (index->slots[i].ptr == NULL)
+            break;
+        size_t home = ptr_index_hash(index, index->slots[i].ptr);
+        /* Move the entry to the hole unless its home slot is cyclically in ]hole, i] */
+        if (((i - home) & mask) >= ((i - hole) & mask)) {
+            index->slots[hole] = index->slots[i];
+            hole = i;
+        }
+    }
+
+    index->slots[hole].ptr = NULL;
+    index->count--;
+}
+
 typedef struct
 {
     /* Granularity of the heap profiler in bytes */
@@ -14,6 +152,8 @@ typedef struct
     uint32_t current_sample_size;
     /* Tracked allocations */
     traceback_array_t allocs;
+    /* Index of the tracked allocations by pointer */
+    ptr_index_t allocs_index;
     /* Allocated memory counter in bytes */
     uint32_t allocated_memory;
     /* True if the heap tracker is frozen */
@@ -42,6 +182,7 @@ static void
 heap_tracker_init(heap_tracker_t* heap_tracker)
 {
     traceback_array_init(&heap_tracker->allocs);
+    ptr_index_init(&heap_tracker->allocs_index);
     traceback_array_init(&heap_tracker->freezer.allocs);
     ptr_array_init(&heap_tracker->freezer.frees);
     heap_tracker->allocated_memory = 0;
@@ -54,6 +195,7 @@ static void
 heap_tracker_wipe(heap_tracker_t* heap_tracker)
 {
     traceback_array_wipe(&heap_tracker->allocs);
+    ptr_index_wipe(&heap_tracker->allocs_index);
     traceback_array_wipe(&heap_tracker->freezer.allocs);
     ptr_array_wipe(&heap_tracker->freezer.frees);
 }
@@ -64,48 +206,84 @@ heap_tracker_freeze(heap_tracker_t* heap_tracker)
     heap_tracker->frozen = true;
 }
 
-static void
-heap_tracker_untrack_thawed(heap_tracker_t* heap_tracker, void* ptr)
+/* Add a traceback to the tracked allocations.
+
+   Returns false, and frees the traceback, if it could not be indexed. */
+static bool
+heap_tracker_track_thawed(heap_tracker_t* heap_tracker, traceback_t* tb)
 {
-    /* This search is O(n) where `n` is the number of tracked traceback,
-       which is linearly linked to the heap size. This search could probably be
-       optimized in a couple of ways:
+    if (!ptr_index_reserve(&heap_tracker->allocs_index, heap_tracker->allocs_index.count + 1)) {
+        traceback_free(tb);
+        return false;
+    }
 
-       - sort the traceback in allocs by ptr so we can find the ptr in O(log2 n)
-       - use a Bloom filter?
+    ptr_index_slot_t* slot = ptr_index_get(&heap_tracker->allocs_index, tb->ptr);
+    if (slot) {
+        /* The previous allocation at this address has been freed while the
+           tracker was frozen: replace it */
+        traceback_t* previous = heap_tracker->allocs.tab[slot->index];
+        heap_tracker->allocs.tab[slot->index] = tb;
+        traceback_free(previous);
+        return true;
+    }
 
-       That being said, we start iterating at the end of the array because most
-       of the time this is where the untracked ptr is (the most recent object
-       get de-allocated first usually). This might be a good enough
-       trade-off. */
-    for (TRACEBACK_ARRAY_COUNT_TYPE i = heap_tracker->allocs.count; i > 0; i--) {
-        traceback_t** tb = &heap_tracker->allocs.tab[i - 1];
+    traceback_array_append(&heap_tracker->allocs, tb);
+    ptr_index_set(&heap_tracker->allocs_index, tb->ptr, heap_tracker->allocs.count - 1);
+    return true;
+}
 
-        if (ptr == (*tb)->ptr) {
-            /* Free the traceback */
-            traceback_free(*tb);
-            traceback_array_remove(&heap_tracker->allocs, tb);
-            break;
-        }
+static void
+heap_tracker_untrack_thawed(heap_tracker_t* heap_tracker, void* ptr)
+{
+    ptr_index_slot_t* slot = ptr_index_get(&heap_tracker->allocs_index, ptr);
+
+    if (slot == NULL)
+        return;
+
+    TRACEBACK_ARRAY_COUNT_TYPE i = slot->index;
+    traceback_t* tb = heap_tracker->allocs.tab[i];
+    ptr_index_delete(&heap_tracker->allocs_index, slot);
+
+    /* Move the last traceback in place of the removed one rather than shifting
+       the whole array */
+    heap_tracker->allocs.count--;
+    if (i != heap_tracker->allocs.count) {
+        traceback_t* last = heap_tracker->allocs.tab[heap_tracker->allocs.count];
+        heap_tracker->allocs.tab[i] = last;
+        ptr_index_get(&heap_tracker->allocs_index, last->ptr)->index = i;
     }
+
+    /* Free the traceback last: releasing its frames can free objects and
+       untrack them */
+    traceback_free(tb);
 }
 
 static void
 heap_tracker_thaw(heap_tracker_t* heap_tracker)
 {
+    /* Handle the frees of the allocations tracked before the freeze first: an
+       address freed while frozen can be reused by an allocation in the
+       freezer. The frees of those allocations are not found and handled
+       below. */
+    for (MEMALLOC_HEAP_PTR_ARRAY_COUNT_TYPE i = 0; i < heap_tracker->freezer.frees.count; i++) {
+        void* ptr = heap_tracker->freezer.frees.tab[i];
+        if (ptr_index_get(&heap_tracker->allocs_index, ptr)) {
+            heap_tracker_untrack_thawed(heap_tracker, ptr);
+            heap_tracker->freezer.frees.tab[i] = NULL;
+        }
+    }
+
     /* Add the frozen allocs at the end */
-    traceback_array_splice(&heap_tracker->allocs,
-                           heap_tracker->allocs.count,
-                           0,
-                           heap_tracker->freezer.allocs.tab,
-                           heap_tracker->freezer.allocs.count);
-
-    /* Handle the frees: we need to handle the frees after we merge the allocs
-       array together to be sure that there's no free in the freezer matching
-       an alloc that is also in the freezer; heap_tracker_untrack_thawed does
-       not care about the freezer, by definition. */
+    for (TRACEBACK_ARRAY_COUNT_TYPE i = 0; i < heap_tracker->freezer.allocs.count; i++)
+        heap_tracker_track_thawed(heap_tracker, heap_tracker->freezer.allocs.tab[i]);
+
+    /* Handle the frees of the frozen allocs. If an address has been allocated,
+       freed and allocated again while frozen, only the last allocation is
+       kept and it might be untracked here: there is no way to tell in which
+       order the allocations and the frees happened. */
     for (MEMALLOC_HEAP_PTR_ARRAY_COUNT_TYPE i = 0; i < heap_tracker->freezer.frees.count; i++)
-        heap_tracker_untrack_thawed(heap_tracker, heap_tracker->freezer.frees.tab[i]);
+        if (heap_tracker->freezer.frees.tab[i])
+            heap_tracker_untrack_thawed(heap_tracker, heap_tracker->freezer.frees.tab[i]);
 
     /* Reset the count to zero so we can reused the array and overwrite previous values */
     heap_tracker->freezer.allocs.count = 0;
@@ -180,8 +358,8 @@ memalloc_heap_track(uint16_t max_nframe, void* ptr, size_t size, PyMemAllocatorD
     if (tb) {
         if (global_heap_tracker.frozen)
             traceback_array_append(&global_heap_tracker.freezer.allocs, tb);
-        else
-            traceback_array_append(&global_heap_tracker.allocs, tb);
+        else if (!heap_tracker_track_thawed(&global_heap_tracker, tb))
+            return false;
 
         /* Reset the counter to 0 */
         global_heap_tracker.allocated_memory = 0;
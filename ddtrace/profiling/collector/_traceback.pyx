@@ -8,26 +8,69 @@ from ddtrace.profiling.event import DDFrame
 log = get_logger(__name__)
 
 
+# The caches below hold strong references to code objects. They are cleared once they reach this size so that the
+# code objects of e.g. dynamically created functions do not stay alive.
+_MAX_CACHED_CODES = 4096
+_MAX_CACHED_FRAMES = 16384
+
+# The name of the first variable of a code object if it may hold the instance or class of the frame, None otherwise.
+cdef dict _class_argnames = {}
+# Interned frame records keyed by (code, lineno, class_name).
+cdef dict _frames = {}
+
+
+cdef _class_argname(code):
+    try:
+        return _class_argnames[code]
+    except KeyError:
+        pass
+
+    argname = None
+    if code.co_varnames and code.co_varnames[0] in ("self", "cls"):
+        argname = code.co_varnames[0]
+
+    if len(_class_argnames) >= _MAX_CACHED_CODES:
+        _class_argnames.clear()
+    _class_argnames[code] = argname
+    return argname
+
+
 cpdef _extract_class_name(frame):
     # type: (...) -> str
     """Extract class name from a frame, if possible.
 
     :param frame: The frame object.
     """
-    if frame.f_code.co_varnames:
-        argname = frame.f_code.co_varnames[0]
-        try:
-            value = frame.f_locals[argname]
-        except KeyError:
-            return ""
-        try:
-            if argname == "self":
-                return object.__getattribute__(type(value), "__name__")  # use type() and object.__getattribute__ to avoid side-effects
-            if argname == "cls":
-                return object.__getattribute__(value, "__name__")
-        except AttributeError:
-            return ""
-    return ""
+    # Only look at the locals when the first variable can be the instance or the class: accessing f_locals
+    # materializes the locals of the frame.
+    argname = _class_argname(frame.f_code)
+    if argname is None:
+        return ""
+    try:
+        value = frame.f_locals[argname]
+    except KeyError:
+        return ""
+    try:
+        if argname == "self":
+            return object.__getattribute__(type(value), "__name__")  # use type() and object.__getattribute__ to avoid side-effects
+        return object.__getattribute__(value, "__name__")
+    except AttributeError:
+        return ""
+
+
+cdef _to_ddframe(frame, code):
+    lineno = 0 if frame.f_lineno is None else frame.f_lineno
+    class_name = _extract_class_name(frame)
+    key = (code, lineno, class_name)
+    try:
+        return _frames[key]
+    except KeyError:
+        pass
+
+    if len(_frames) >= _MAX_CACHED_FRAMES:
+        _frames.clear()
+    ddframe = _frames[key] = DDFrame(code.co_filename, lineno, code.co_name, class_name)
+    return ddframe
 
 
 cpdef traceback_to_frames(traceback, max_nframes):
@@ -43,9 +86,7 @@ cpdef traceback_to_frames(traceback, max_nframes):
     while tb is not None:
         if nframes < max_nframes:
             frame = tb.tb_frame
-            code = frame.f_code
-            lineno = 0 if frame.f_lineno is None else frame.f_lineno
-            frames.insert(0, DDFrame(code.co_filename, lineno, code.co_name, _extract_class_name(frame)))
+            frames.insert(0, _to_ddframe(frame, frame.f_code))
         nframes += 1
         tb = tb.tb_next
     return frames, nframes
@@ -88,8 +129,7 @@ cpdef pyframe_to_frames(frame, max_nframes):
                     )
                     return [], 0
 
-            lineno = 0 if frame.f_lineno is None else frame.f_lineno
-            frames.append(DDFrame(code.co_filename, lineno, code.co_name, _extract_class_name(frame)))
+            frames.append(_to_ddframe(frame, code))
         nframes += 1
         frame = frame.f_back
     return frames, nframes
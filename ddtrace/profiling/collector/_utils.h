@@ -29,6 +29,9 @@ random_range(uint64_t max)
                 *(allocnb) = (goalnb);                                                                                 \
             } else {                                                                                                   \
                 *(allocnb) = p_alloc_nr(*(allocnb));                                                                   \
+                /* The new size can overflow the size type of small arrays */                                          \
+                if (*(allocnb) < (goalnb))                                                                             \
+                    *(allocnb) = (goalnb);                                                                             \
             }                                                                                                          \
             p_realloc(p, *(allocnb));                                                                                  \
         }                                                                                                              \
@@ -2,6 +2,7 @@
 from __future__ import absolute_import
 
 import sys
+import time
 import typing
 
 import attr
@@ -306,7 +307,7 @@ cdef collect_threads(thread_id_ignore_list, thread_time, thread_span_links) with
 
 
 
-cdef stack_collect(ignore_profiler, thread_time, max_nframes, interval, wall_time, thread_span_links, collect_endpoint):
+cdef stack_collect(ignore_profiler, thread_time, max_nframes, wall_time, thread_span_links, collect_endpoint):
     # Do not use `threading.enumerate` to not mess with locking (gevent!)
     thread_id_ignore_list = {
         thread_id
@@ -362,7 +363,7 @@ cdef stack_collect(ignore_profiler, thread_time, max_nframes, interval, wall_tim
                         task_name=task_name,
                         nframes=nframes, frames=frames,
                         wall_time_ns=wall_time,
-                        sampling_period=int(interval * 1e9),
+                        sampling_period=wall_time,
                     )
                 )
 
@@ -390,7 +391,7 @@ cdef stack_collect(ignore_profiler, thread_time, max_nframes, interval, wall_tim
                 frames=frames,
                 wall_time_ns=wall_time,
                 cpu_time_ns=cpu_time,
-                sampling_period=int(interval * 1e9),
+                sampling_period=wall_time,
             )
             event.set_trace_info(span, collect_endpoint)
             stack_events.append(event)
@@ -419,7 +420,7 @@ cdef stack_collect(ignore_profiler, thread_time, max_nframes, interval, wall_tim
                     task_name=None,
                     nframes=nframes,
                     frames=frames,
-                    sampling_period=int(interval * 1e9),
+                    sampling_period=wall_time,
                     exc_type=exc_type,
                 )
                 exc_event.set_trace_info(span, collect_endpoint)
@@ -466,6 +467,10 @@ class _ThreadSpanLinks(_thread_span_links_base):
         return None
 
 
+# The CPU time of the collector thread, or the wall time if the platform cannot measure it
+_thread_cpu_time_ns = getattr(time, "thread_time_ns", compat.monotonic_ns)
+
+
 def _default_min_interval_time():
     if six.PY2:
         return 0.01
@@ -490,6 +495,10 @@ class StackCollector(collector.PeriodicCollector):
     _thread_time = attr.ib(init=False, repr=False, eq=False)
     _last_wall_time = attr.ib(init=False, repr=False, eq=False, type=int)
     _thread_span_links = attr.ib(default=None, init=False, repr=False, eq=False)
+    _sample_cost_ns = attr.ib(default=None, init=False, repr=False, eq=False, type=typing.Optional[float])
+
+    # How fast the estimated cost of collecting a sample decreases when samples get cheaper
+    SAMPLE_COST_DECAY = 0.2
 
     @max_time_usage_pct.validator
     def _check_max_time_usage(self, attribute, value):
@@ -522,23 +531,37 @@ class StackCollector(collector.PeriodicCollector):
         interval = (used_wall_time_ns / (self.max_time_usage_pct / 100.0)) - used_wall_time_ns
         return max(interval / 1e9, self.min_interval_time)
 
+    def _update_sample_cost(self, cost_ns):
+        # type: (int) -> float
+        """Update the estimated cost of collecting a sample with the cost of the last one.
+
+        The estimate follows cost increases right away to stay within the time usage budget during load spikes, and
+        decreases slowly so that a single cheap sample does not make the next ones too frequent.
+        """
+        if self._sample_cost_ns is None or cost_ns > self._sample_cost_ns:
+            self._sample_cost_ns = cost_ns
+        else:
+            self._sample_cost_ns += self.SAMPLE_COST_DECAY * (cost_ns - self._sample_cost_ns)
+        return self._sample_cost_ns
+
     def collect(self):
         # Compute wall time
         now = compat.monotonic_ns()
         wall_time = now - self._last_wall_time
         self._last_wall_time = now
+        start_cpu_time = _thread_cpu_time_ns()
 
+        # The wall time since the last sample is the effective sampling period of this one
         all_events = stack_collect(
             self.ignore_profiler,
             self._thread_time,
             self.nframes,
-            self.interval,
             wall_time,
             self._thread_span_links,
             self.endpoint_collection_enabled,
         )
 
-        used_wall_time_ns = compat.monotonic_ns() - now
-        self.interval = self._compute_new_interval(used_wall_time_ns)
+        # The profiled threads are only slowed down while the collector holds the GIL, i.e. while it uses the CPU
+        self.interval = self._compute_new_interval(self._update_sample_cost(_thread_cpu_time_ns() - start_cpu_time))
 
         return all_events
@@ -4,6 +4,7 @@ import attr
 
 
 if typing.TYPE_CHECKING:  # pragma: no cover
+    from .. import event
     from .. import recorder
 
 
@@ -15,6 +16,17 @@ class ExportError(Exception):
 class Exporter(object):
     """Exporter base class."""
 
+    def aggregate(
+        self, events  # type: typing.Sequence[event.Event]
+    ):
+        # type: (...) -> bool
+        """Aggregate events as they are recorded.
+
+        :param events: List of events of the same class.
+        :return: False if the events are not aggregated and must be passed to `export` instead.
+        """
+        return False
+
     def export(
         self,
         events,  # type: recorder.EventsType
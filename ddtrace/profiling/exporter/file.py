@@ -1,9 +1,9 @@
-import gzip
 import os
 import typing
 
 import attr
 
+from ddtrace.internal.compression import GzipCompressor
 from ddtrace.profiling.exporter import pprof
 
 from .. import recorder
@@ -15,6 +15,8 @@ class PprofFileExporter(pprof.PprofExporter):
 
     prefix = attr.ib(default="profile", type=str)
     _increment = attr.ib(default=1, init=False, repr=False, type=int)
+    # Same compression level as gzip.open
+    _compressor = attr.ib(init=False, factory=lambda: GzipCompressor(9), repr=False, eq=False)
 
     def export(
         self,
@@ -33,7 +35,8 @@ class PprofFileExporter(pprof.PprofExporter):
         :param end_time_ns: The end time of recording.
         """
         profile, libs = super(PprofFileExporter, self).export(events, start_time_ns, end_time_ns)
-        with gzip.open(self.prefix + (".%d.%d" % (os.getpid(), self._increment)), "wb") as f:
-            f.write(profile.SerializeToString())
+        with open(self.prefix + (".%d.%d" % (os.getpid(), self._increment)), "wb") as f:
+            for chunk in self._compressor.compress_chunks(profile.SerializeToString()):
+                f.write(chunk)
         self._increment += 1
         return profile, libs
@@ -1,7 +1,7 @@
 # -*- encoding: utf-8 -*-
 import binascii
+import collections
 import datetime
-import gzip
 import itertools
 import json
 import os
@@ -18,22 +18,32 @@ import ddtrace
 from ddtrace.ext.git import COMMIT_SHA
 from ddtrace.ext.git import REPOSITORY_URL
 from ddtrace.internal import agent
+from ddtrace.internal import forksafe
 from ddtrace.internal import gitmetadata
+from ddtrace.internal import periodic
 from ddtrace.internal import runtime
+from ddtrace.internal.compression import GzipCompressor
+from ddtrace.internal.logger import get_logger
 from ddtrace.internal.processor.endpoint_call_counter import EndpointCallCounterProcessor
 from ddtrace.internal.runtime import container
 from ddtrace.internal.utils.formats import parse_tags_str
 from ddtrace.internal.utils.retry import fibonacci_backoff_with_jitter
+from ddtrace.profiling import _traceback
 from ddtrace.profiling import exporter
 from ddtrace.profiling import recorder
 from ddtrace.profiling.exporter import pprof
 from ddtrace.settings.profiling import config
 
 
+LOG = get_logger(__name__)
+
 HOSTNAME = platform.node()
 PYTHON_IMPLEMENTATION = platform.python_implementation()
 PYTHON_VERSION = platform.python_version()
 
+# Same compression level as the gzip module
+GZIP_COMPRESSION_LEVEL = 9
+
 
 @attr.s
 class PprofHTTPExporter(pprof.PprofExporter):
@@ -58,6 +68,9 @@ class PprofHTTPExporter(pprof.PprofExporter):
     endpoint_path = attr.ib(default="/profiling/v1/input")
 
     endpoint_call_counter_span_processor = attr.ib(default=None, type=EndpointCallCounterProcessor)
+    # When set, profiles are compressed and uploaded by this uploader instead of during the export
+    uploader = attr.ib(default=None, repr=False, eq=False, type=typing.Optional["ProfileUploader"])
+    _compressor = attr.ib(init=False, factory=lambda: GzipCompressor(GZIP_COMPRESSION_LEVEL), repr=False, eq=False)
 
     def _update_git_metadata_tags(self, tags):
         """
@@ -115,22 +128,26 @@ class PprofHTTPExporter(pprof.PprofExporter):
         boundary = binascii.hexlify(os.urandom(16))
 
         # The body that is generated is very sensitive and must perfectly match what the server expects.
-        body = (
-            (b"--%s\r\n" % boundary)
-            + b'Content-Disposition: form-data; name="event"; filename="event.json"\r\n'
-            + b"Content-Type: application/json\r\n\r\n"
-            + event
-            + b"\r\n"
-            + b"".join(
-                (b"--%s\r\n" % boundary)
-                + (b'Content-Disposition: form-data; name="%s"; filename="%s"\r\n' % (item["name"], item["filename"]))
-                + (b"Content-Type: %s\r\n\r\n" % (item["content-type"]))
-                + item["data"]
-                + b"\r\n"
-                for item in data
+        # The parts are joined once to avoid copying the attachments for each concatenation.
+        parts = [
+            b"--%s\r\n" % boundary,
+            b'Content-Disposition: form-data; name="event"; filename="event.json"\r\n',
+            b"Content-Type: application/json\r\n\r\n",
+            event,
+            b"\r\n",
+        ]
+        for item in data:
+            parts.extend(
+                (
+                    b"--%s\r\n" % boundary,
+                    b'Content-Disposition: form-data; name="%s"; filename="%s"\r\n' % (item["name"], item["filename"]),
+                    b"Content-Type: %s\r\n\r\n" % (item["content-type"]),
+                    item["data"],
+                    b"\r\n",
+                )
             )
-            + b"--%s--\r\n" % boundary
-        )
+        parts.append(b"--%s--\r\n" % boundary)
+        body = b"".join(parts)
 
         content_type = b"multipart/form-data; boundary=%s" % boundary
 
@@ -162,6 +179,27 @@ class PprofHTTPExporter(pprof.PprofExporter):
         :param start_time_ns: The start time of recording.
         :param end_time_ns: The end time of recording.
         """
+        profile, libs = super(PprofHTTPExporter, self).export(events, start_time_ns, end_time_ns)
+
+        upload = self._prepare_upload(profile, libs, start_time_ns, end_time_ns)
+        if self.uploader is not None:
+            self.uploader.put(upload)
+        else:
+            headers, body = self._encode_upload(upload)
+            client = agent.get_connection(self.endpoint, self.timeout)
+            self._upload(client, self.endpoint_path, body, headers)
+
+        return profile, libs
+
+    def _prepare_upload(
+        self,
+        profile,  # type: pprof.pprof_ProfileType
+        libs,  # type: typing.List[pprof.Package]
+        start_time_ns,  # type: int
+        end_time_ns,  # type: int
+    ):
+        # type: (...) -> _Upload
+        """Gather what needs to be known at export time to upload a profile."""
         if self.api_key:
             headers = {
                 "DD-API-KEY": self.api_key.encode(),
@@ -172,85 +210,198 @@ class PprofHTTPExporter(pprof.PprofExporter):
         if self._container_info and self._container_info.container_id:
             headers["Datadog-Container-Id"] = self._container_info.container_id
 
-        profile, libs = super(PprofHTTPExporter, self).export(events, start_time_ns, end_time_ns)
-        pprof = six.BytesIO()
-        with gzip.GzipFile(fileobj=pprof, mode="wb") as gz:
-            gz.write(profile.SerializeToString())
+        attachments = ["auto.pprof"]
+        if self.enable_code_provenance:
+            attachments.append("code-provenance.json")
+
+        service = self.service or os.path.basename(profile.string_table[profile.mapping[0].filename])
+        event = {
+            "version": "4",
+            "family": "python",
+            "attachments": attachments,
+            "tags_profiler": self._get_tags(service),
+            "start": (datetime.datetime.utcfromtimestamp(start_time_ns / 1e9).replace(microsecond=0).isoformat() + "Z"),
+            "end": (datetime.datetime.utcfromtimestamp(end_time_ns / 1e9).replace(microsecond=0).isoformat() + "Z"),
+        }  # type: Dict[str, Any]
+
+        if self.endpoint_call_counter_span_processor is not None:
+            event["endpoint_counts"] = self.endpoint_call_counter_span_processor.reset()
+
+        return _Upload(headers, event, profile, libs if self.enable_code_provenance else None)
 
+    def _encode_upload(
+        self, upload  # type: _Upload
+    ):
+        # type: (...) -> typing.Tuple[typing.Dict[str, typing.Any], bytes]
+        """Compress the attachments of a profile and encode the request headers and body to upload it."""
         data = [
             {
                 "name": b"auto",
                 "filename": b"auto.pprof",
                 "content-type": b"application/octet-stream",
-                "data": pprof.getvalue(),
+                "data": self._compressor.compress(upload.profile.SerializeToString()),
             }
         ]
 
-        if self.enable_code_provenance:
-            code_provenance = six.BytesIO()
-            with gzip.GzipFile(fileobj=code_provenance, mode="wb") as gz:
-                gz.write(
-                    json.dumps(
-                        {
-                            "v1": libs,
-                        }
-                    ).encode("utf-8")
-                )
+        if upload.libs is not None:
             data.append(
                 {
                     "name": b"code-provenance",
                     "filename": b"code-provenance.json",
                     "content-type": b"application/json",
-                    "data": code_provenance.getvalue(),
+                    "data": self._compressor.compress(
+                        json.dumps(
+                            {
+                                "v1": upload.libs,
+                            }
+                        ).encode("utf-8")
+                    ),
                 }
             )
 
-        service = self.service or os.path.basename(profile.string_table[profile.mapping[0].filename])
-        event = {
-            "version": "4",
-            "family": "python",
-            "attachments": [item["filename"].decode("utf-8") for item in data],
-            "tags_profiler": self._get_tags(service),
-            "start": (datetime.datetime.utcfromtimestamp(start_time_ns / 1e9).replace(microsecond=0).isoformat() + "Z"),
-            "end": (datetime.datetime.utcfromtimestamp(end_time_ns / 1e9).replace(microsecond=0).isoformat() + "Z"),
-        }  # type: Dict[str, Any]
-
-        if self.endpoint_call_counter_span_processor is not None:
-            event["endpoint_counts"] = self.endpoint_call_counter_span_processor.reset()
-
         content_type, body = self._encode_multipart_formdata(
-            event=json.dumps(event).encode("utf-8"),
+            event=json.dumps(upload.event).encode("utf-8"),
             data=data,
         )
+        headers = dict(upload.headers)
         headers["Content-Type"] = content_type
+        return headers, body
 
-        client = agent.get_connection(self.endpoint, self.timeout)
-        self._upload(client, self.endpoint_path, body, headers)
-
-        return profile, libs
+    @staticmethod
+    def _post(client, path, body, headers):
+        # type: (http_client.HTTPConnection, str, bytes, typing.Dict[str, typing.Any]) -> int
+        client.request("POST", path, body=body, headers=headers)
+        response = client.getresponse()
+        response.read()  # reading is mandatory
+        return response.status
 
     def _upload(self, client, path, body, headers):
         try:
-            client.request("POST", path, body=body, headers=headers)
-            response = client.getresponse()
-            response.read()  # reading is mandatory
+            status = self._post(client, path, body, headers)
         except (http_client.HTTPException, EnvironmentError) as e:
             raise exporter.ExportError("HTTP upload request failed: %s" % e)
         finally:
             client.close()
 
-        if 200 <= response.status < 300:
+        self._check_status(status)
+
+    def _check_status(self, status):
+        # type: (int) -> None
+        if 200 <= status < 300:
             return
 
-        if 500 <= response.status < 600:
-            raise RuntimeError("Server returned %d" % response.status)
+        if 500 <= status < 600:
+            raise RuntimeError("Server returned %d" % status)
 
-        if response.status == 400:
+        if status == 400:
             raise exporter.ExportError("Server returned 400, check your API key")
-        elif response.status == 404 and not self.api_key:
+        elif status == 404 and not self.api_key:
             raise exporter.ExportError(
                 "Datadog Agent is not accepting profiles. "
                 "Agent-based profiling deployments require Datadog Agent >= 7.20"
             )
 
-        raise exporter.ExportError("HTTP Error %d" % response.status)
+        raise exporter.ExportError("HTTP Error %d" % status)
+
+
+@attr.s(slots=True)
+class _Upload(object):
+    """A profile waiting to be uploaded."""
+
+    headers = attr.ib(type=typing.Dict[str, typing.Any])
+    event = attr.ib(type=typing.Dict[str, typing.Any])
+    profile = attr.ib(type=pprof.pprof_ProfileType)
+    libs = attr.ib(type=typing.Optional[typing.List[pprof.Package]])
+
+
+@attr.s(eq=False)
+class ProfileUploader(periodic.PeriodicService):
+    """Compress and upload the profiles of an exporter in the background.
+
+    The profiles are uploaded in order over a single connection kept open between uploads. When an upload fails
+    because the endpoint is unreachable or returns a server error, the profile stays queued and the upload is retried
+    at the next interval. Once ``max_queued`` profiles are waiting, the oldest ones are dropped.
+    """
+
+    __thread_class__ = periodic.NotifiablePeriodicThread
+
+    exporter = attr.ib(type=PprofHTTPExporter)
+    _interval = attr.ib(type=float, default=config.api_timeout)
+    max_queued = attr.ib(type=int, default=4)
+    _queue = attr.ib(init=False, factory=collections.deque, repr=False)
+    _queue_lock = attr.ib(init=False, factory=forksafe.Lock, repr=False)
+    _conn = attr.ib(init=False, default=None, repr=False)
+
+    def put(
+        self, upload  # type: _Upload
+    ):
+        # type: (...) -> None
+        """Queue a profile to be uploaded as soon as possible."""
+        with self._queue_lock:
+            self._queue.append(upload)
+            dropped = len(self._queue) - self.max_queued
+            for _ in range(dropped):
+                self._queue.popleft()
+
+        if dropped > 0:
+            LOG.warning("Upload queue full, dropping %d profile(s)", dropped)
+
+        if self._worker is not None:
+            self._worker.notify()
+
+    def __len__(self):
+        # type: (...) -> int
+        return len(self._queue)
+
+    def _reset_connection(self):
+        # type: (...) -> None
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _send(
+        self, upload  # type: _Upload
+    ):
+        # type: (...) -> None
+        exp = self.exporter
+        headers, body = exp._encode_upload(upload)
+        if self._conn is None:
+            self._conn = agent.get_connection(exp.endpoint, exp.timeout)
+        try:
+            status = exp._post(self._conn, exp.endpoint_path, body, headers)
+        except Exception:
+            self._reset_connection()
+            raise
+        exp._check_status(status)
+
+    def periodic(self):
+        # type: (...) -> None
+        while True:
+            with self._queue_lock:
+                if not self._queue:
+                    return
+                upload = self._queue[0]
+
+            try:
+                self._send(upload)
+            except (http_client.HTTPException, EnvironmentError, RuntimeError) as e:
+                LOG.warning("Unable to upload profile: %s. Retrying later.", _traceback.format_exception(e))
+                return
+            except exporter.ExportError as e:
+                LOG.warning("Unable to export profile: %s. Ignoring.", _traceback.format_exception(e))
+            except Exception:
+                LOG.exception(
+                    "Unexpected error while uploading profile. "
+                    "Please report this bug to https://github.com/DataDog/dd-trace-py/issues"
+                )
+
+            with self._queue_lock:
+                # The profile might have been dropped in the meantime if the queue was full
+                if self._queue and self._queue[0] is upload:
+                    self._queue.popleft()
+
+    def on_shutdown(self):
+        # type: (...) -> None
+        # Give a last chance to the queued profiles
+        self.periodic()
+        self._reset_connection()
@@ -9,6 +9,7 @@ import attr
 import six
 
 from ddtrace import ext
+from ddtrace.internal import forksafe
 from ddtrace.internal import packages
 from ddtrace.internal._encoding import ListStringTable as _StringTable
 from ddtrace.internal.compat import ensure_str
@@ -189,6 +190,10 @@ class _PprofConverter(object):
         type=typing.DefaultDict[_Location_Key_T, typing.DefaultDict[str, int]],
     )
 
+    # Sampling period of the stack events, used to compute the period of the profile
+    _sum_period = attr.ib(init=False, default=0, type=int)
+    _nb_event = attr.ib(init=False, default=0, type=int)
+
     def _to_Function(
         self,
         filename,  # type: str
@@ -272,6 +277,41 @@ class _PprofConverter(object):
         frames,  # type: HashableStackTraceType
         nframes,  # type: int
         samples,  # type: typing.List[stack_event.StackSampleEvent]
+    ):
+        # type: (...) -> None
+        self.convert_stack_samples(
+            thread_id,
+            thread_native_id,
+            thread_name,
+            task_id,
+            task_name,
+            local_root_span_id,
+            span_id,
+            trace_resource,
+            trace_type,
+            frames,
+            nframes,
+            len(samples),
+            sum(s.cpu_time_ns for s in samples),
+            sum(s.wall_time_ns for s in samples),
+        )
+
+    def convert_stack_samples(
+        self,
+        thread_id,  # type: str
+        thread_native_id,  # type: str
+        thread_name,  # type: str
+        task_id,  # type: str
+        task_name,  # type: str
+        local_root_span_id,  # type: str
+        span_id,  # type: str
+        trace_resource,  # type: str
+        trace_type,  # type: str
+        frames,  # type: HashableStackTraceType
+        nframes,  # type: int
+        nb_samples,  # type: int
+        cpu_time_ns,  # type: int
+        wall_time_ns,  # type: int
     ):
         # type: (...) -> None
         location_key = (
@@ -290,9 +330,9 @@ class _PprofConverter(object):
             ),
         )
 
-        self._location_values[location_key]["cpu-samples"] = len(samples)
-        self._location_values[location_key]["cpu-time"] = sum(s.cpu_time_ns for s in samples)
-        self._location_values[location_key]["wall-time"] = sum(s.wall_time_ns for s in samples)
+        self._location_values[location_key]["cpu-samples"] += nb_samples
+        self._location_values[location_key]["cpu-time"] += cpu_time_ns
+        self._location_values[location_key]["wall-time"] += wall_time_ns
 
     def convert_memalloc_event(
         self,
@@ -313,10 +353,10 @@ class _PprofConverter(object):
             ),
         )
 
-        self._location_values[location_key]["alloc-samples"] = round(
+        self._location_values[location_key]["alloc-samples"] += round(
             sum(event.nevents * (event.capture_pct / 100.0) for event in events)
         )
-        self._location_values[location_key]["alloc-space"] = round(
+        self._location_values[location_key]["alloc-space"] += round(
             sum(event.size / event.capture_pct * 100.0 for event in events)
         )
 
@@ -365,8 +405,8 @@ class _PprofConverter(object):
             ),
         )
 
-        self._location_values[location_key]["lock-acquire"] = len(events)
-        self._location_values[location_key]["lock-acquire-wait"] = int(
+        self._location_values[location_key]["lock-acquire"] += sum(e.count for e in events)
+        self._location_values[location_key]["lock-acquire-wait"] += int(
             sum(e.wait_time_ns for e in events) / sampling_ratio
         )
 
@@ -403,8 +443,8 @@ class _PprofConverter(object):
             ),
         )
 
-        self._location_values[location_key]["lock-release"] = len(events)
-        self._location_values[location_key]["lock-release-hold"] = int(
+        self._location_values[location_key]["lock-release"] += sum(e.count for e in events)
+        self._location_values[location_key]["lock-release-hold"] += int(
             sum(e.locked_for_ns for e in events) / sampling_ratio
         )
 
@@ -437,7 +477,7 @@ class _PprofConverter(object):
             ),
         )
 
-        self._location_values[location_key]["exception-samples"] = len(events)
+        self._location_values[location_key]["exception-samples"] += len(events)
 
     def _build_libraries(self) -> typing.List[Package]:
         return [
@@ -559,12 +599,29 @@ StackExceptionEventGroupKey = typing.NamedTuple(
 )
 
 
+# The event classes in the order they are added to the profile on export
+_EXPORTED_EVENT_CLASSES = (
+    stack_event.StackSampleEvent,
+    _lock.LockAcquireEvent,
+    _lock.LockReleaseEvent,
+    threading.ThreadingLockAcquireEvent,
+    threading.ThreadingLockReleaseEvent,
+    stack_event.StackExceptionSampleEvent,
+    memalloc.MemoryAllocSampleEvent,
+    memalloc.MemoryHeapSampleEvent,
+)
+
+
 @attr.s
 class PprofExporter(exporter.Exporter):
     """Export recorder events to pprof format."""
 
     enable_code_provenance = attr.ib(default=True, type=bool)
 
+    # The profile of the next export, in which events are folded as they are recorded
+    _converter = attr.ib(init=False, factory=_PprofConverter, repr=False, eq=False)
+    _converter_lock = attr.ib(init=False, factory=forksafe.Lock, repr=False, eq=False)
+
     def _stack_event_group_key(self, event: event.StackBasedEvent) -> StackEventGroupKey:
         return StackEventGroupKey(
             _none_to_str(event.thread_id),
@@ -634,35 +691,26 @@ class PprofExporter(exporter.Exporter):
         return groupby(events, self._stack_exception_group_key)
 
     def _get_event_trace_resource(self, event: event.StackBasedEvent) -> str:
+        return self._get_trace_resource(event.trace_resource_container, event.trace_type)
+
+    @staticmethod
+    def _get_trace_resource(
+        trace_resource_container: typing.Optional[typing.List[str]], trace_type: typing.Optional[str]
+    ) -> str:
         trace_resource = ""
         # Do not export trace_resource for non Web spans for privacy concerns.
-        if event.trace_resource_container and event.trace_type == ext.SpanTypes.WEB:
-            (trace_resource,) = event.trace_resource_container
+        if trace_resource_container and trace_type == ext.SpanTypes.WEB:
+            (trace_resource,) = trace_resource_container
         return ensure_str(trace_resource, errors="backslashreplace")
 
-    def export(
-        self, events: recorder.EventsType, start_time_ns: int, end_time_ns: int
-    ) -> typing.Tuple[pprof_ProfileType, typing.List[Package]]:
-        """Convert events to pprof format.
-
-        :param events: The event dictionary from a `ddtrace.profiling.recorder.Recorder`.
-        :param start_time_ns: The start time of recording.
-        :param end_time_ns: The end time of recording.
-        :return: A protobuf Profile object.
-        """
-        program_name = config.get_application_name() or "<unknown program>"
-
-        sum_period = 0
-        nb_event = 0
-
-        converter = _PprofConverter()
-
-        # Handle StackSampleEvent
+    def _add_stack_events(
+        self, converter: _PprofConverter, events: typing.Iterable[stack_event.StackSampleEvent]
+    ) -> None:
         stack_events = []
-        for event in events.get(stack_event.StackSampleEvent, []):  # type: ignore[call-overload]
+        for event in events:
             stack_events.append(event)
-            sum_period += event.sampling_period
-            nb_event += 1
+            converter._sum_period += event.sampling_period
+            converter._nb_event += 1
 
         for (
             (
@@ -695,48 +743,104 @@ class PprofExporter(exporter.Exporter):
                 list(typing.cast(typing.Iterator[stack_event.StackSampleEvent], grouped_stack_events)),
             )
 
-        # Handle Lock events
-        for event_class, convert_fn in (
-            (_lock.LockAcquireEvent, converter.convert_lock_acquire_event),
-            (_lock.LockReleaseEvent, converter.convert_lock_release_event),
-            (threading.ThreadingLockAcquireEvent, converter.convert_lock_acquire_event),
-            (threading.ThreadingLockReleaseEvent, converter.convert_lock_release_event),
-        ):
-            lock_events = events.get(event_class, [])  # type: ignore[call-overload]
-            sampling_sum_pct = sum(event.sampling_pct for event in lock_events)
-
-            if lock_events:
-                sampling_ratio_avg = sampling_sum_pct / (len(lock_events) * 100.0)
-
-                for (
-                    lock_name,
-                    thread_id,
-                    thread_name,
-                    task_id,
-                    task_name,
-                    local_root_span_id,
-                    span_id,
-                    trace_resource,
-                    trace_type,
-                    frames,
-                    nframes,
-                ), l_events in self._group_lock_events(lock_events):
-                    convert_fn(  # type: ignore[operator]
-                        lock_name,
-                        thread_id,
-                        thread_name,
-                        task_id,
-                        task_name,
-                        local_root_span_id,
-                        span_id,
-                        trace_resource,
-                        trace_type,
-                        frames,
-                        nframes,
-                        list(l_events),
-                        sampling_ratio_avg,
-                    )
+    def _add_stack_columns(self, converter: _PprofConverter, columns: recorder.StackSampleColumns) -> None:
+        # Sum the samples by their raw column values first, so that labels are only converted once per group
+        totals = {}  # type: typing.Dict[typing.Tuple[typing.Any, ...], typing.List[typing.Any]]
+        for (
+            _,
+            thread_id,
+            thread_native_id,
+            local_root_span_id,
+            span_id,
+            wall_time_ns,
+            cpu_time_ns,
+            sampling_period,
+            stack_id,
+            labels_id,
+            trace_resource_container,
+        ) in columns.rows():
+            converter._sum_period += sampling_period
+            converter._nb_event += 1
+            key = (
+                thread_id,
+                thread_native_id,
+                local_root_span_id,
+                span_id,
+                stack_id,
+                labels_id,
+                id(trace_resource_container),
+            )
+            try:
+                total = totals[key]
+            except KeyError:
+                total = totals[key] = [trace_resource_container, 0, 0, 0]
+            total[1] += 1
+            total[2] += cpu_time_ns
+            total[3] += wall_time_ns
+
+        for (
+            (thread_id, thread_native_id, local_root_span_id, span_id, stack_id, labels_id, _),
+            (trace_resource_container, nb_samples, cpu_time_ns, wall_time_ns),
+        ) in totals.items():
+            frames, nframes = columns.stacks[stack_id]
+            thread_name, task_id, task_name, trace_type = columns.labels[labels_id]
+            converter.convert_stack_samples(
+                _none_to_str(thread_id or None),
+                _none_to_str(thread_native_id or None),
+                _get_thread_name(thread_id or None, thread_name),
+                _none_to_str(task_id),
+                _none_to_str(task_name),
+                _none_to_str(local_root_span_id or None),
+                _none_to_str(span_id or None),
+                self._get_trace_resource(trace_resource_container, trace_type),
+                _none_to_str(trace_type),
+                frames,
+                nframes,
+                nb_samples,
+                cpu_time_ns,
+                wall_time_ns,
+            )
+
+    def _add_lock_events(
+        self,
+        convert_fn: typing.Callable[..., None],
+        lock_events: typing.Sequence[_lock.LockEventBase],
+    ) -> None:
+        sampling_sum_pct = sum(event.sampling_pct for event in lock_events)
+        sampling_ratio_avg = sampling_sum_pct / (len(lock_events) * 100.0)
 
+        for (
+            lock_name,
+            thread_id,
+            thread_name,
+            task_id,
+            task_name,
+            local_root_span_id,
+            span_id,
+            trace_resource,
+            trace_type,
+            frames,
+            nframes,
+        ), l_events in self._group_lock_events(lock_events):
+            convert_fn(
+                lock_name,
+                thread_id,
+                thread_name,
+                task_id,
+                task_name,
+                local_root_span_id,
+                span_id,
+                trace_resource,
+                trace_type,
+                frames,
+                nframes,
+                list(l_events),
+                sampling_ratio_avg,
+            )
+
+    def _add_stack_exception_events(
+        self, converter: _PprofConverter, events: typing.Iterable[stack_event.StackExceptionSampleEvent]
+    ) -> None:
         for (
             (
                 thread_id,
@@ -751,9 +855,7 @@ class PprofExporter(exporter.Exporter):
                 exc_type_name,
             ),
             se_events,
-        ) in self._group_stack_exception_events(
-            events.get(stack_event.StackExceptionSampleEvent, [])  # type: ignore[call-overload]
-        ):
+        ) in self._group_stack_exception_events(events):
             converter.convert_stack_exception_event(
                 thread_id,
                 thread_native_id,
@@ -768,41 +870,98 @@ class PprofExporter(exporter.Exporter):
                 list(typing.cast(typing.Iterator[stack_event.StackExceptionSampleEvent], se_events)),
             )
 
-        if memalloc._memalloc:
-            for (
-                (
-                    thread_id,
-                    thread_native_id,
-                    thread_name,
-                    task_id,
-                    task_name,
-                    local_root_span_id,
-                    span_id,
-                    trace_resource,
-                    trace_type,
-                    frames,
-                    nframes,
-                ),
-                memalloc_events,
-            ) in self._group_stack_events(
-                events.get(memalloc.MemoryAllocSampleEvent, [])  # type: ignore[call-overload]
-            ):
-                converter.convert_memalloc_event(
-                    thread_id,
-                    thread_native_id,
-                    thread_name,
-                    frames,
-                    nframes,
-                    list(typing.cast(typing.Iterator[memalloc.MemoryAllocSampleEvent], memalloc_events)),
-                )
-
-            for event in events.get(memalloc.MemoryHeapSampleEvent, []):  # type: ignore[call-overload]
-                converter.convert_memalloc_heap_event(event)
+    def _add_memalloc_events(
+        self, converter: _PprofConverter, events: typing.Iterable[memalloc.MemoryAllocSampleEvent]
+    ) -> None:
+        for (
+            (
+                thread_id,
+                thread_native_id,
+                thread_name,
+                task_id,
+                task_name,
+                local_root_span_id,
+                span_id,
+                trace_resource,
+                trace_type,
+                frames,
+                nframes,
+            ),
+            memalloc_events,
+        ) in self._group_stack_events(events):
+            converter.convert_memalloc_event(
+                thread_id,
+                thread_native_id,
+                thread_name,
+                frames,
+                nframes,
+                list(typing.cast(typing.Iterator[memalloc.MemoryAllocSampleEvent], memalloc_events)),
+            )
+
+    def _add_events(
+        self, converter: _PprofConverter, event_class: typing.Type[event.Event], events: typing.Sequence[event.Event]
+    ) -> bool:
+        """Fold events of the same class into the converter.
+
+        :return: False if events of this class are not exported.
+        """
+        if isinstance(events, recorder.StackSampleColumns):
+            self._add_stack_columns(converter, events)
+        elif event_class is stack_event.StackSampleEvent:
+            self._add_stack_events(converter, events)  # type: ignore[arg-type]
+        elif event_class is _lock.LockAcquireEvent or event_class is threading.ThreadingLockAcquireEvent:
+            self._add_lock_events(converter.convert_lock_acquire_event, events)  # type: ignore[arg-type]
+        elif event_class is _lock.LockReleaseEvent or event_class is threading.ThreadingLockReleaseEvent:
+            self._add_lock_events(converter.convert_lock_release_event, events)  # type: ignore[arg-type]
+        elif event_class is stack_event.StackExceptionSampleEvent:
+            self._add_stack_exception_events(converter, events)  # type: ignore[arg-type]
+        elif event_class is memalloc.MemoryAllocSampleEvent and memalloc._memalloc:
+            self._add_memalloc_events(converter, events)  # type: ignore[arg-type]
+        elif event_class is memalloc.MemoryHeapSampleEvent and memalloc._memalloc:
+            for event in events:
+                converter.convert_memalloc_heap_event(event)  # type: ignore[arg-type]
+        else:
+            return False
+        return True
+
+    def aggregate(self, events: typing.Sequence[event.Event]) -> bool:
+        """Fold events into the profile of the next export.
+
+        The events are added to the location, function and sample tables right away so that they do not need to be
+        kept until the export.
+
+        :param events: A list of events of the same class.
+        :return: False if events of this class are not exported.
+        """
+        with self._converter_lock:
+            return self._add_events(self._converter, events[0].__class__, events)
+
+    def export(
+        self, events: recorder.EventsType, start_time_ns: int, end_time_ns: int
+    ) -> typing.Tuple[pprof_ProfileType, typing.List[Package]]:
+        """Convert events to pprof format.
+
+        The events folded with `aggregate` since the last export are part of the profile too.
+
+        :param events: The event dictionary from a `ddtrace.profiling.recorder.Recorder`.
+        :param start_time_ns: The start time of recording.
+        :param end_time_ns: The end time of recording.
+        :return: A protobuf Profile object.
+        """
+        program_name = config.get_application_name() or "<unknown program>"
+
+        with self._converter_lock:
+            converter, self._converter = self._converter, _PprofConverter()
+
+        for event_class in _EXPORTED_EVENT_CLASSES:
+            class_events = events.get(event_class)  # type: ignore[call-overload]
+            if class_events:
+                self._add_events(converter, event_class, class_events)
 
         # Compute some metadata
         period = None  # type: typing.Optional[int]
-        if nb_event:
-            period = int(sum_period / nb_event)
+        if converter._nb_event:
+            period = int(converter._sum_period / converter._nb_event)
 
         duration_ns = end_time_ns - start_time_ns
 
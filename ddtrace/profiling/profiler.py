@@ -124,6 +124,7 @@ class _ProfilerInstance(service.Service):
     _recorder = attr.ib(init=False, default=None)
     _collectors = attr.ib(init=False, default=None)
     _scheduler = attr.ib(init=False, default=None, type=Union[scheduler.Scheduler, scheduler.ServerlessScheduler])
+    _uploader = attr.ib(init=False, default=None, eq=False)
     _lambda_function_name = attr.ib(
         init=False, factory=lambda: os.environ.get("AWS_LAMBDA_FUNCTION_NAME"), type=Optional[str]
     )
@@ -265,6 +266,15 @@ class _ProfilerInstance(service.Service):
 
         exporters = self._build_default_exporters()
 
+        if config.export.aggregate_events and len(exporters) == 1:
+            r.aggregator = exporters[0]
+
+        if config.export.background_upload and len(exporters) == 1:
+            from ddtrace.profiling.exporter import http
+
+            if isinstance(exporters[0], http.PprofHTTPExporter):
+                self._uploader = exporters[0].uploader = http.ProfileUploader(exporters[0])
+
         if exporters or self._export_libdd_enabled:
             scheduler_class = (
                 scheduler.ServerlessScheduler if self._lambda_function_name else scheduler.Scheduler
@@ -312,6 +322,9 @@ class _ProfilerInstance(service.Service):
                 collectors.append(col)
         self._collectors = collectors
 
+        if self._uploader is not None:
+            self._uploader.start()
+
         if self._scheduler is not None:
             self._scheduler.start()
 
@@ -342,5 +355,11 @@ class _ProfilerInstance(service.Service):
             for col in reversed(self._collectors):
                 col.join()
 
+        if self._uploader is not None:
+            # Stopping the uploader makes it upload the profiles that are still queued
+            self._uploader.stop()
+            if join:
+                self._uploader.join()
+
     def visible_events(self):
         return self._export_py_enabled
@@ -1,5 +1,7 @@
 # -*- encoding: utf-8 -*-
+import array
 import collections
+import itertools
 import threading
 import typing
 
@@ -9,6 +11,11 @@ from ddtrace.internal import forksafe
 from ddtrace.settings.profiling import config
 
 from . import event
+from .collector import stack_event
+
+
+if typing.TYPE_CHECKING:  # pragma: no cover
+    from . import exporter
 
 
 class _defaultdictkey(dict):
@@ -24,6 +31,168 @@ class _defaultdictkey(dict):
         raise KeyError(key)
 
 
+class StackSampleColumns(typing.Sequence[stack_event.StackSampleEvent]):
+    """A bounded sequence of stack samples stored in columns.
+
+    Instead of keeping every `StackSampleEvent` object alive, the numeric fields of the samples are stored in arrays,
+    and their stacks and thread/task labels are interned. Like a bounded deque, the oldest samples are dropped once
+    `maxlen` is reached.
+
+    Exporters can read the columns with `rows`; the samples are only turned back into events when they are accessed
+    as a sequence.
+    """
+
+    # The array columns, in the order of the row values returned by `rows`.
+    # Identifiers and the sampling period are None when 0.
+    COLUMNS = (
+        ("timestamp", "q"),
+        ("thread_id", "Q"),
+        ("thread_native_id", "Q"),
+        ("local_root_span_id", "Q"),
+        ("span_id", "Q"),
+        ("wall_time_ns", "q"),
+        ("cpu_time_ns", "q"),
+        ("sampling_period", "q"),
+        ("stack_id", "L"),
+        ("labels_id", "L"),
+    )
+
+    def __init__(self, maxlen=None):
+        # type: (typing.Optional[int]) -> None
+        self.maxlen = maxlen
+        self.clear()
+
+    def clear(self):
+        # type: (...) -> None
+        self._columns = tuple(array.array(typecode) for _, typecode in self.COLUMNS)
+        # The trace resource containers are mutable lists shared by the spans of a trace, so only refer to them
+        self._trace_resource_containers = []  # type: typing.List[typing.Optional[typing.List[str]]]
+        # Index of the oldest sample once maxlen is reached
+        self._head = 0
+        self.stacks = []  # type: typing.List[typing.Tuple[typing.Optional[typing.Tuple[event.DDFrame, ...]], int]]
+        self._stack_ids = (
+            {}
+        )  # type: typing.Dict[typing.Tuple[typing.Optional[typing.Tuple[event.DDFrame, ...]], int], int]
+        self.labels = []  # type: typing.List[typing.Tuple[typing.Any, ...]]
+        self._labels_ids = {}  # type: typing.Dict[typing.Tuple[typing.Any, ...], int]
+
+    @staticmethod
+    def _intern(table, ids, value):
+        try:
+            return ids[value]
+        except KeyError:
+            ids[value] = index = len(table)
+            table.append(value)
+            return index
+
+    def append(self, sample):
+        # type: (stack_event.StackSampleEvent) -> None
+        values = (
+            sample.timestamp,
+            sample.thread_id or 0,
+            sample.thread_native_id or 0,
+            sample.local_root_span_id or 0,
+            sample.span_id or 0,
+            sample.wall_time_ns,
+            sample.cpu_time_ns,
+            sample.sampling_period or 0,
+            self._intern(
+                self.stacks,
+                self._stack_ids,
+                (None if sample.frames is None else tuple(sample.frames), sample.nframes),
+            ),
+            self._intern(
+                self.labels, self._labels_ids, (sample.thread_name, sample.task_id, sample.task_name, sample.trace_type)
+            ),
+        )
+
+        size = len(self._trace_resource_containers)
+        if self.maxlen is None or size < self.maxlen:
+            for column, value in zip(self._columns, values):
+                column.append(value)
+            self._trace_resource_containers.append(sample.trace_resource_container)
+        elif self.maxlen:
+            index = self._head
+            for column, value in zip(self._columns, values):
+                column[index] = value
+            self._trace_resource_containers[index] = sample.trace_resource_container
+            self._head = (index + 1) % size
+
+    def extend(self, samples):
+        # type: (typing.Iterable[stack_event.StackSampleEvent]) -> None
+        for sample in samples:
+            self.append(sample)
+
+    def rows(self):
+        # type: (...) -> typing.Iterator[typing.Tuple[typing.Any, ...]]
+        """Iterate over the samples, oldest first.
+
+        :return: An iterator of tuples of the `COLUMNS` values followed by the trace resource container.
+        """
+        if not self._head:
+            return zip(*self._columns, self._trace_resource_containers)
+        return itertools.chain(
+            itertools.islice(zip(*self._columns, self._trace_resource_containers), self._head, None),
+            zip(*(column[: self._head] for column in self._columns), self._trace_resource_containers[: self._head]),
+        )
+
+    def _to_event(self, row):
+        # type: (typing.Tuple[typing.Any, ...]) -> stack_event.StackSampleEvent
+        (
+            timestamp,
+            thread_id,
+            thread_native_id,
+            local_root_span_id,
+            span_id,
+            wall_time_ns,
+            cpu_time_ns,
+            sampling_period,
+            stack_id,
+            labels_id,
+            trace_resource_container,
+        ) = row
+        frames, nframes = self.stacks[stack_id]
+        thread_name, task_id, task_name, trace_type = self.labels[labels_id]
+        return stack_event.StackSampleEvent(
+            timestamp=timestamp,
+            sampling_period=sampling_period or None,
+            thread_id=thread_id or None,
+            thread_name=thread_name,
+            thread_native_id=thread_native_id or None,
+            task_id=task_id,
+            task_name=task_name,
+            frames=None if frames is None else list(frames),
+            nframes=nframes,
+            local_root_span_id=local_root_span_id or None,
+            span_id=span_id or None,
+            trace_type=trace_type,
+            trace_resource_container=trace_resource_container,
+            wall_time_ns=wall_time_ns,
+            cpu_time_ns=cpu_time_ns,
+        )
+
+    def __len__(self):
+        # type: (...) -> int
+        return len(self._trace_resource_containers)
+
+    def __iter__(self):
+        # type: (...) -> typing.Iterator[stack_event.StackSampleEvent]
+        return map(self._to_event, self.rows())
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self)[index]
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("index out of range")
+        index = (self._head + index) % size
+        return self._to_event(
+            tuple(column[index] for column in self._columns) + (self._trace_resource_containers[index],)
+        )
+
+
 EventsType = typing.Dict[event.Event, typing.Sequence[event.Event]]
 
 
@@ -37,6 +206,12 @@ class Recorder(object):
     max_events = attr.ib(factory=dict, type=typing.Dict[typing.Type[event.Event], typing.Optional[int]])
     """A dict of {event_type_class: max events} to limit the number of events to record."""
 
+    aggregator = attr.ib(default=None, repr=False, eq=False, type=typing.Optional["exporter.Exporter"])
+    """An exporter aggregating the events it supports as they are pushed, instead of recording them."""
+
+    columnar = attr.ib(default=config.columnar_events, repr=False, eq=False, type=bool)
+    """Whether to store the stack samples in a `StackSampleColumns` instead of a deque of events."""
+
     events = attr.ib(init=False, repr=False, eq=False, type=EventsType)
     _events_lock = attr.ib(init=False, repr=False, factory=threading.RLock, eq=False)
 
@@ -70,13 +245,18 @@ class Recorder(object):
         :param events: The event list to push.
         """
         if events:
+            if self.aggregator is not None and self.aggregator.aggregate(events):
+                return
             event_type = events[0].__class__
             with self._events_lock:
                 q = self.events[event_type]
                 q.extend(events)
 
     def _get_deque_for_event_type(self, event_type):
-        return collections.deque(maxlen=self.max_events.get(event_type, self.default_max_events))
+        maxlen = self.max_events.get(event_type, self.default_max_events)
+        if self.columnar and event_type is stack_event.StackSampleEvent:
+            return StackSampleColumns(maxlen=maxlen)
+        return collections.deque(maxlen=maxlen)
 
     def _reset_events(self):
         self.events = _defaultdictkey(self._get_deque_for_event_type)
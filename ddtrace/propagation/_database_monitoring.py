@@ -1,19 +1,26 @@
 from typing import TYPE_CHECKING
 from typing import Union  # noqa
+import weakref
 
 from ddtrace.internal.logger import get_logger
-from ddtrace.settings.peer_service import PeerServiceConfig
+from ddtrace.settings.peer_service import _ps_config
 from ddtrace.vendor.sqlcommenter import generate_sql_comment as _generate_sql_comment
+from ddtrace.vendor.sqlcommenter import url_quote as _url_quote
 
+from ..context import Context
 from ..internal import compat
 from ..internal.utils import get_argument_value
 from ..internal.utils import set_argument_value
+from ..internal.utils.cache import cached
 from ..settings import _config as dd_config
 from ..settings._database_monitoring import dbm_config
 
 
 if TYPE_CHECKING:
+    from typing import Any
+    from typing import Iterator
     from typing import Optional
+    from typing import Tuple
 
     from ddtrace import Span
 
@@ -44,11 +51,27 @@ def default_sql_injector(dbm_comment, sql_statement):
     return sql_statement
 
 
+@cached()
+def _get_dbm_comment_prefix(dbm_tags):
+    # type: (Tuple[Tuple[str, Optional[str]], ...]) -> str
+    """Return the DBM comment for the given tags without its closing ``*/``.
+
+    The tags are the same for all the queries of a service on a database, so
+    the comment is only generated once for them.
+    """
+    return _generate_sql_comment(**dict(dbm_tags)).strip()[:-2]
+
+
 class _DBM_Propagator(object):
-    def __init__(self, sql_pos, sql_kw, sql_injector=default_sql_injector):
+    def __init__(self, sql_pos, sql_kw, sql_injector=default_sql_injector, session_statement=None):
         self.sql_pos = sql_pos
         self.sql_kw = sql_kw
         self.sql_injector = sql_injector
+        # Statement setting the traceparent in the database session in the "session" mode, with the traceparent
+        # as its only parameter. The mode falls back to "service" when the integration does not provide one.
+        self.session_statement = session_statement  # type: Optional[str]
+        # The traceparent last set in the session of each connection
+        self._session_traceparents = weakref.WeakKeyDictionary()  # type: weakref.WeakKeyDictionary[Any, str]
 
     def inject(self, dbspan, args, kwargs):
         dbm_comment = self._get_dbm_comment(dbspan)
@@ -68,30 +91,111 @@ class _DBM_Propagator(object):
         """Generate DBM trace injection comment and updates span tags
         This method will set the ``_dd.dbm_trace_injected: "true"`` tag
         on ``db_span`` if the configured injection mode is ``"full"``.
+        In the ``"session"`` mode the comment only has the service tags, so
+        that the statement text does not change from one query to the next.
         """
         if dbm_config.propagation_mode == "disabled":
             return None
 
-        # set the following tags if DBM injection mode is full or service
-        peer_service_enabled = PeerServiceConfig().set_defaults_enabled
+        # set the following tags if DBM injection mode is full, session or service
         service_name_key = db_span.service
-        if peer_service_enabled:
+        if _ps_config.set_defaults_enabled:
             db_name = db_span.get_tags().get("db.name")
             service_name_key = compat.ensure_str(db_name) if db_name else db_span.service
 
-        dbm_tags = {
-            DBM_PARENT_SERVICE_NAME_KEY: dd_config.service,
-            DBM_ENVIRONMENT_KEY: dd_config.env,
-            DBM_VERSION_KEY: dd_config.version,
-            DBM_DATABASE_SERVICE_NAME_KEY: service_name_key,
-        }
+        prefix = _get_dbm_comment_prefix(
+            (
+                (DBM_PARENT_SERVICE_NAME_KEY, dd_config.service),
+                (DBM_ENVIRONMENT_KEY, dd_config.env),
+                (DBM_VERSION_KEY, dd_config.version),
+                (DBM_DATABASE_SERVICE_NAME_KEY, service_name_key),
+            )
+        )
 
         if dbm_config.propagation_mode == "full":
             db_span.set_tag_str(DBM_TRACE_INJECTED_TAG, "true")
-            dbm_tags[DBM_TRACE_PARENT_KEY] = db_span.context._traceparent
+            # The traceparent key sorts after the other tags so it goes last in the comment
+            traceparent = "{}={!r}".format(DBM_TRACE_PARENT_KEY, _url_quote(db_span.context._traceparent))
+            return prefix + ("," if prefix != "/*" else "") + traceparent + "*/ "
+
+        return prefix + "*/ "
+
+    def _get_session_traceparent(self, db_span, connection):
+        # type: (Span, Any) -> Optional[str]
+        """Return the traceparent to set in the session of the connection, if it has to be set.
 
-        sql_comment = _generate_sql_comment(**dbm_tags)
-        if sql_comment:
-            # replace leading whitespace with trailing whitespace
-            return sql_comment.strip() + " "
-        return ""
+        The traceparent is the one of the parent of ``db_span``, so that it is
+        only set once for all the queries made on behalf of the same span.
+        """
+        if dbm_config.propagation_mode != "session" or self.session_statement is None or connection is None:
+            return None
+
+        context = db_span.context
+        traceparent = Context(
+            trace_id=context.trace_id,
+            span_id=db_span.parent_id or db_span.span_id,
+            meta=context._meta,
+            metrics=context._metrics,
+        )._traceparent
+        try:
+            if self._session_traceparents.get(connection) == traceparent:
+                # The traceparent is already set in the session
+                db_span.set_tag_str(DBM_TRACE_INJECTED_TAG, "true")
+                return None
+        except TypeError:
+            # The connection cannot be weakly referenced, the traceparent is set for every query
+            pass
+        return traceparent
+
+    def _set_session_traceparent(self, db_span, connection, traceparent):
+        # type: (Span, Any, str) -> None
+        db_span.set_tag_str(DBM_TRACE_INJECTED_TAG, "true")
+        try:
+            self._session_traceparents[connection] = traceparent
+        except TypeError:
+            pass
+
+    def reset_session(self, connection):
+        # type: (Any) -> None
+        """Forget the traceparent set in the session of the connection.
+
+        Rolling back a transaction also rolls back the settings made in it.
+        """
+        try:
+            self._session_traceparents.pop(connection, None)
+        except TypeError:
+            pass
+
+    def _session_calls(self, db_span, cursor):
+        # type: (Span, Any) -> Iterator[Any]
+        """Set the traceparent in the database session of the cursor connection.
+
+        The results of the calls made on the session cursor are yielded, so
+        that the asynchronous integrations can await them and send back their
+        exceptions, while the synchronous ones only exhaust the generator.
+        """
+        connection = getattr(cursor, "connection", None)
+        traceparent = self._get_session_traceparent(db_span, connection)
+        if traceparent is None:
+            return
+
+        try:
+            session_cursor = connection.cursor()
+            try:
+                yield session_cursor.execute(self.session_statement, (traceparent,))
+            finally:
+                yield session_cursor.close()
+        except Exception:
+            log.debug("failed to set the traceparent in the database session", exc_info=True)
+            return
+        self._set_session_traceparent(db_span, connection, traceparent)
+
+    def inject_session(self, db_span, cursor):
+        # type: (Span, Any) -> None
+        """Set the traceparent in the database session of the cursor connection.
+
+        The trace is linked to the queries without changing their text, which
+        keeps the database prepared statement and plan caches effective.
+        """
+        for _ in self._session_calls(db_span, cursor):
+            pass
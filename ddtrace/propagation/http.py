@@ -1,10 +1,13 @@
 import re
+from typing import Any
 from typing import Dict
 from typing import FrozenSet
+from typing import Iterable
 from typing import List
 from typing import Optional
 from typing import Text
 from typing import Tuple
+from typing import Union
 from typing import cast
 
 from ddtrace import config
@@ -792,6 +795,81 @@ _PROP_STYLES = {
     _PROPAGATION_STYLE_NONE: _NOP_Propagator,
 }
 
+# The headers read by each propagation style on extraction
+_PROP_STYLES_HEADERS = {
+    PROPAGATION_STYLE_DATADOG: (
+        HTTP_HEADER_TRACE_ID,
+        HTTP_HEADER_PARENT_ID,
+        HTTP_HEADER_SAMPLING_PRIORITY,
+        HTTP_HEADER_ORIGIN,
+        _HTTP_HEADER_TAGS,
+    ),
+    PROPAGATION_STYLE_B3_MULTI: (
+        _HTTP_HEADER_B3_TRACE_ID,
+        _HTTP_HEADER_B3_SPAN_ID,
+        _HTTP_HEADER_B3_SAMPLED,
+        _HTTP_HEADER_B3_FLAGS,
+    ),
+    PROPAGATION_STYLE_B3_SINGLE: (_HTTP_HEADER_B3_SINGLE,),
+    _PROPAGATION_STYLE_W3C_TRACECONTEXT: (_HTTP_HEADER_TRACEPARENT, _HTTP_HEADER_TRACESTATE),
+    _PROPAGATION_STYLE_NONE: (),
+}
+
+
+class _HeadersExtractor(object):
+    """Extract a context from the headers of a list of propagation styles.
+
+    The headers are read in a single pass, which only picks the headers used by the styles. They can be given as a
+    mapping, e.g. a WSGI environ, or as a list of name and value pairs, e.g. ASGI headers.
+    """
+
+    def __init__(self, styles):
+        # type: (Tuple[str, ...]) -> None
+        self._propagators = [_PROP_STYLES[style] for style in styles]
+        # The lowercase names the headers can be found under, mapped to the name the propagators look for
+        self._names = {}  # type: Dict[Union[str, bytes], str]
+        for style in styles:
+            for header in _PROP_STYLES_HEADERS[style]:
+                for name in (header, get_wsgi_header(header).lower()):
+                    self._names[name] = header
+                    self._names[name.encode("ascii")] = header
+        # Only the names with one of these lengths need to be lowercased to be looked up
+        self._lengths = frozenset(len(name) for name in self._names)
+
+    def extract(self, headers):
+        # type: (Union[Dict[str, str], Iterable[Tuple[Any, Any]]]) -> Optional[Context]
+        get_header = self._names.get
+        lengths = self._lengths
+        extracted = {}  # type: Dict[str, str]
+        items = getattr(headers, "items", None)
+        for name, value in headers if items is None else items():
+            if len(name) in lengths:
+                header = get_header(name.lower())
+                if header is not None:
+                    extracted[header] = value.decode("latin-1") if isinstance(value, bytes) else value
+
+        if not extracted:
+            return None
+
+        for propagator in self._propagators:
+            context = propagator._extract(extracted)  # type: ignore
+            if context is not None:
+                return context
+        return None
+
+
+_HEADERS_EXTRACTORS = {}  # type: Dict[Tuple[str, ...], _HeadersExtractor]
+
+
+def _get_headers_extractor(styles):
+    # type: (List[str]) -> _HeadersExtractor
+    key = tuple(styles)
+    try:
+        return _HEADERS_EXTRACTORS[key]
+    except KeyError:
+        extractor = _HEADERS_EXTRACTORS[key] = _HeadersExtractor(key)
+        return extractor
+
 
 class HTTPPropagator(object):
     """A HTTP Propagator using HTTP headers as carrier."""
@@ -822,18 +900,44 @@ class HTTPPropagator(object):
             log.debug("tried to inject invalid context %r", span_context)
             return
 
+        # The headers injected last are reused as long as the context state they were built from is unchanged
+        state = HTTPPropagator._inject_state(span_context)
+        cached = span_context._propagation_headers
+        if cached is not None and cached[0] == state:
+            headers.update(cached[1])
+            return
+
+        injected = {}  # type: Dict[str, str]
         if PROPAGATION_STYLE_DATADOG in config._propagation_style_inject:
-            _DatadogMultiHeader._inject(span_context, headers)
+            _DatadogMultiHeader._inject(span_context, injected)
         if PROPAGATION_STYLE_B3_MULTI in config._propagation_style_inject:
-            _B3MultiHeader._inject(span_context, headers)
+            _B3MultiHeader._inject(span_context, injected)
         if PROPAGATION_STYLE_B3_SINGLE in config._propagation_style_inject:
-            _B3SingleHeader._inject(span_context, headers)
+            _B3SingleHeader._inject(span_context, injected)
         if _PROPAGATION_STYLE_W3C_TRACECONTEXT in config._propagation_style_inject:
-            _TraceContext._inject(span_context, headers)
+            _TraceContext._inject(span_context, injected)
+        headers.update(injected)
+
+        # Injecting can record propagation errors in the context, so take the state again
+        span_context._propagation_headers = (HTTPPropagator._inject_state(span_context), injected)
+
+    @staticmethod
+    def _inject_state(span_context):
+        # type: (Context) -> Tuple[Any, ...]
+        """Return the state of the context and of the configuration the injected headers are built from."""
+        return (
+            span_context.trace_id,
+            span_context.span_id,
+            span_context.sampling_priority,
+            tuple(span_context._meta.items()),
+            tuple(config._propagation_style_inject),
+            config._x_datadog_tags_enabled,
+            config._x_datadog_tags_max_length,
+        )
 
     @staticmethod
     def extract(headers):
-        # type: (Dict[str,str]) -> Context
+        # type: (Union[Dict[str, str], Iterable[Tuple[Any, Any]]]) -> Context
         """Extract a Context from HTTP headers into a new Context.
 
         Here is an example from a web endpoint::
@@ -848,21 +952,18 @@ class HTTPPropagator(object):
                 with tracer.trace('my_controller') as span:
                     span.set_tag('http.url', url)
 
-        :param dict headers: HTTP headers to extract tracing attributes.
+        :param dict headers: HTTP headers to extract tracing attributes. A list of ``(name, value)`` pairs, e.g.
+            ASGI headers, is accepted too.
         :return: New `Context` with propagated attributes.
         """
         if not headers:
             return Context()
 
         try:
-            normalized_headers = {name.lower(): v for name, v in headers.items()}
-
-            # loop through the extract propagation styles specified in order
-            for prop_style in config._propagation_style_extract:
-                propagator = _PROP_STYLES[prop_style]
-                context = propagator._extract(normalized_headers)  # type: ignore
-                if context is not None:
-                    return context
+            # The extractor tries the extract propagation styles specified in order
+            context = _get_headers_extractor(config._propagation_style_extract).extract(headers)
+            if context is not None:
+                return context
 
         except Exception:
             log.debug("error while extracting context propagation headers", exc_info=True)
@@ -20,8 +20,8 @@ from .internal.constants import MAX_UINT_64BITS as _MAX_UINT_64BITS
 from .internal.constants import _PRIORITY_CATEGORY
 from .internal.logger import get_logger
 from .internal.rate_limiter import RateLimiter
+from .internal.sampling import SamplingRuleIndex
 from .internal.sampling import _apply_rate_limit
-from .internal.sampling import _get_highest_precedence_rule_matching
 from .internal.sampling import _set_sampling_tags
 from .sampling_rule import SamplingRule
 from .settings import _config as ddconfig
@@ -209,7 +209,7 @@ class DatadogSampler(RateByServiceSampler):
     per second.
     """
 
-    __slots__ = ("limiter", "rules")
+    __slots__ = ("limiter", "_rule_index")
 
     NO_RATE_LIMIT = -1
     # deprecate and remove the DEFAULT_RATE_LIMIT field from DatadogSampler
@@ -249,18 +249,18 @@ class DatadogSampler(RateByServiceSampler):
                 rules = self._parse_rules_from_env_variable(env_sampling_rules)
             else:
                 rules = []
-            self.rules = rules
         else:
-            self.rules = []
             # Validate that rules is a list of SampleRules
             for rule in rules:
                 if not isinstance(rule, SamplingRule):
                     raise TypeError("Rule {!r} must be a sub-class of type ddtrace.sampler.SamplingRules".format(rule))
-                self.rules.append(rule)
+            rules = list(rules)
 
         # DEV: Default sampling rule must come last
         if default_sample_rate is not None:
-            self.rules.append(SamplingRule(sample_rate=default_sample_rate))
+            rules.append(SamplingRule(sample_rate=default_sample_rate))
+
+        self.rules = rules
 
         # Configure rate limiter
         self.limiter = RateLimiter(rate_limit)
@@ -275,6 +275,18 @@ class DatadogSampler(RateByServiceSampler):
 
     __repr__ = __str__
 
+    @property
+    def rules(self):
+        # type: () -> List[SamplingRule]
+        return self._rule_index.rules
+
+    @rules.setter
+    def rules(self, rules):
+        # type: (List[SamplingRule]) -> None
+        # The rules are copied into a list that reindexes them when it is
+        # changed in place.
+        self._rule_index = SamplingRuleIndex(rules)
+
     def _parse_rules_from_env_variable(self, rules):
         # type: (str) -> List[SamplingRule]
         sampling_rules = []
@@ -304,7 +316,7 @@ class DatadogSampler(RateByServiceSampler):
         """
         If allow_false is False, this function will return True regardless of the sampling decision
         """
-        matched_rule = _get_highest_precedence_rule_matching(span, self.rules)
+        matched_rule = self._rule_index.match(span)
 
         if matched_rule:
             sampled = matched_rule.sample(span)
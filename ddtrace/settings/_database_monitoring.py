@@ -9,8 +9,8 @@ class DatabaseMonitoringConfig(En):
         str,
         "propagation_mode",
         default="disabled",
-        help="Valid Injection Modes: disabled, service, and full",
-        validator=validators.choice(["disabled", "full", "service"]),
+        help="Valid Injection Modes: disabled, service, full, and session",
+        validator=validators.choice(["disabled", "full", "service", "session"]),
     )
 
 
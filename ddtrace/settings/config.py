@@ -3,6 +3,8 @@ import multiprocessing
 import os
 import re
 import sys
+from typing import Any
+from typing import Dict
 from typing import List
 from typing import Optional
 from typing import Tuple
@@ -25,6 +27,7 @@ from ..internal.constants import DEFAULT_PROCESSING_INTERVAL
 from ..internal.constants import DEFAULT_REUSE_CONNECTIONS
 from ..internal.constants import DEFAULT_SAMPLING_RATE_LIMIT
 from ..internal.constants import DEFAULT_TIMEOUT
+from ..internal.constants import DEFAULT_UPLOAD_QUEUE_SIZE
 from ..internal.constants import PROPAGATION_STYLE_ALL
 from ..internal.constants import PROPAGATION_STYLE_B3_SINGLE
 from ..internal.constants import _PROPAGATION_STYLE_DEFAULT
@@ -251,6 +254,7 @@ class Config(object):
 
         header_tags = parse_tags_str(os.getenv("DD_TRACE_HEADER_TAGS", ""))
         self.http = HttpConfig(header_tags=header_tags)
+        self._header_plan = None  # type: Optional[Tuple[Any, Dict[str, Optional[str]], Dict[str, Optional[str]]]]
         self._tracing_enabled = asbool(os.getenv("DD_TRACE_ENABLED", default=True))
         self._remote_config_enabled = asbool(os.getenv("DD_REMOTE_CONFIGURATION_ENABLED", default=True))
         self._remote_config_poll_interval = float(
@@ -272,6 +276,16 @@ class Config(object):
             os.getenv("DD_TRACE_WRITER_REUSE_CONNECTIONS", DEFAULT_REUSE_CONNECTIONS)
         )
         self._trace_writer_log_err_payload = asbool(os.environ.get("_DD_TRACE_WRITER_LOG_ERROR_PAYLOADS", False))
+        self._trace_writer_deferred_encoding = asbool(os.getenv("DD_TRACE_WRITER_DEFERRED_ENCODING", default=False))
+        self._trace_writer_early_flush = asbool(os.getenv("DD_TRACE_WRITER_EARLY_FLUSH", default=False))
+        self._trace_writer_adaptive_interval = asbool(os.getenv("DD_TRACE_WRITER_ADAPTIVE_INTERVAL", default=False))
+        self._trace_writer_upload_workers = int(os.getenv("DD_TRACE_WRITER_UPLOAD_WORKERS", default=0))
+        self._trace_writer_upload_queue_size = int(
+            os.getenv("DD_TRACE_WRITER_UPLOAD_QUEUE_SIZE_BYTES", default=DEFAULT_UPLOAD_QUEUE_SIZE)
+        )
+        self._trace_writer_compression = os.getenv("DD_TRACE_WRITER_COMPRESSION")
+        _compression_level = os.getenv("DD_TRACE_WRITER_COMPRESSION_LEVEL")
+        self._trace_writer_compression_level = int(_compression_level) if _compression_level else None
 
         self._trace_agent_hostname = os.environ.get("DD_AGENT_HOST", os.environ.get("DD_TRACE_AGENT_HOSTNAME"))
         self._trace_agent_port = os.environ.get("DD_AGENT_PORT", os.environ.get("DD_TRACE_AGENT_PORT"))
@@ -414,6 +428,7 @@ class Config(object):
             os.environ["OTEL_PYTHON_CONTEXT"] = "ddcontextvars_context"
         self._ddtrace_bootstrapped = False
         self._span_aggregator_rlock = asbool(os.getenv("DD_TRACE_SPAN_AGGREGATOR_RLOCK", True))
+        self._span_aggregator_shards = int(os.getenv("DD_TRACE_SPAN_AGGREGATOR_SHARDS", 16))
 
         self._iast_redaction_enabled = asbool(os.getenv("DD_IAST_REDACTION_ENABLED", default=True))
         self._iast_redaction_name_pattern = os.getenv(
@@ -523,6 +538,18 @@ class Config(object):
         # type: (str) -> Optional[str]
         return self.http._header_tag_name(header_name)
 
+    def _header_tag_names(self, request_or_response):
+        # type: (str) -> Dict[str, Optional[str]]
+        """Return the tags of the request or response headers that are traced, by header name.
+
+        See ``IntegrationConfig._header_tag_names``.
+        """
+        key = (self.http, self.http._header_tags_version)
+        plan = self._header_plan
+        if plan is None or plan[0] != key or len(plan[1]) + len(plan[2]) > IntegrationConfig._HEADER_PLAN_MAX_SIZE:
+            plan = self._header_plan = (key, {}, {})
+        return plan[1] if request_or_response == "request" else plan[2]
+
     def _get_service(self, default=None):
         """
         Returns the globally configured service or the default if none is configured.
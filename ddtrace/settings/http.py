@@ -1,3 +1,4 @@
+from typing import Dict
 from typing import List
 from typing import Mapping
 from typing import Optional
@@ -21,9 +22,22 @@ class HttpConfig(object):
 
     def __init__(self, header_tags=None):
         # type: (Optional[Mapping[str, str]]) -> None
+        # Incremented whenever the traced headers change
+        self._header_tags_version = 0
         self._header_tags = {normalize_header_name(k): v for k, v in header_tags.items()} if header_tags else {}
         self.trace_query_string = None
 
+    @property
+    def _header_tags(self):
+        # type: () -> Dict[str, str]
+        return self.__header_tags
+
+    @_header_tags.setter
+    def _header_tags(self, value):
+        # type: (Dict[str, str]) -> None
+        self.__header_tags = value
+        self._header_tags_version += 1
+
     def _reset(self):
         self._header_tags = {}
         self._header_tag_name.invalidate()
@@ -65,6 +79,7 @@ class HttpConfig(object):
             # Empty tag is replaced by the default tag for this header:
             #  Host on the request defaults to http.request.headers.host
             self._header_tags.setdefault(normalized_header_name, "")
+        self._header_tags_version += 1
 
         # Mypy can't catch cached method's invalidate()
         self._header_tag_name.invalidate()  # type: ignore[attr-defined]
@@ -1,4 +1,5 @@
 import os
+from typing import Dict
 from typing import Optional
 from typing import Tuple
 
@@ -24,6 +25,9 @@ class IntegrationConfig(AttrDict):
         config.flask.service_name = 'my-service-name'
     """
 
+    # Maximum number of header names remembered by the header plan
+    _HEADER_PLAN_MAX_SIZE = 1024
+
     def __init__(self, global_config, name, *args, **kwargs):
         """
         :param global_config:
@@ -39,6 +43,7 @@ class IntegrationConfig(AttrDict):
         object.__setattr__(self, "integration_name", name)
         object.__setattr__(self, "hooks", Hooks())
         object.__setattr__(self, "http", HttpConfig())
+        object.__setattr__(self, "_header_plan", None)
 
         analytics_enabled, analytics_sample_rate = self._get_analytics_settings()
         self.setdefault("analytics_enabled", analytics_enabled)
@@ -122,6 +127,22 @@ class IntegrationConfig(AttrDict):
             return self.global_config._header_tag_name(header_name)
         return tag_name
 
+    def _header_tag_names(self, request_or_response):
+        # type: (str) -> Dict[str, Optional[str]]
+        """Return the tags of the request or response headers that are traced, by header name.
+
+        The mapping is filled as header names are seen and is reset when the
+        traced headers of the integration or the global ones change. A header
+        mapped to ``None`` is not traced.
+        """
+        global_http = self.global_config.http
+        key = (self.http, self.http._header_tags_version, global_http, global_http._header_tags_version)
+        plan = self._header_plan
+        if plan is None or plan[0] != key or len(plan[1]) + len(plan[2]) > self._HEADER_PLAN_MAX_SIZE:
+            plan = (key, {}, {})
+            object.__setattr__(self, "_header_plan", plan)
+        return plan[1] if request_or_response == "request" else plan[2]
+
     def _is_analytics_enabled(self, use_global_config):
         # DEV: analytics flag can be None which should not be taken as
         # enabled when global flag is disabled
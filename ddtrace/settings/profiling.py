@@ -94,6 +94,15 @@ class ProfilingConfig(En):
         help="",
     )
 
+    columnar_events = En.v(
+        bool,
+        "columnar_events",
+        default=False,
+        help_type="Boolean",
+        help="Stores the stack samples in arrays of integers with interned stacks until the next export, instead of "
+        "keeping an object for each of them. This reduces the memory used by the profiler",
+    )
+
     upload_interval = En.v(
         float,
         "upload_interval",
@@ -176,6 +185,15 @@ class ProfilingConfig(En):
             help="Whether to enable the lock profiler",
         )
 
+        aggregate_events = En.v(
+            bool,
+            "aggregate_events",
+            default=False,
+            help_type="Boolean",
+            help="Aggregates the lock events of each call site, stack and span until the next export instead of "
+            "recording an event for every sampled lock operation",
+        )
+
     class Memory(En):
         __item__ = __prefix__ = "memory"
 
@@ -237,5 +255,25 @@ class ProfilingConfig(En):
             help="Enables collection and export using the classic Python exporter",
         )
 
+        aggregate_events = En.v(
+            bool,
+            "aggregate_events",
+            default=False,
+            help_type="Boolean",
+            help="Aggregates the events into the profile as they are collected instead of storing them until the next "
+            "export. This bounds the memory used by the profiler and spreads the cost of building the profile. "
+            "Events are then no longer limited by ``DD_PROFILING_MAX_EVENTS``",
+        )
+
+        background_upload = En.v(
+            bool,
+            "background_upload",
+            default=False,
+            help_type="Boolean",
+            help="Compresses and uploads the profiles from a background thread, reusing its connection to the "
+            "endpoint, so that a slow endpoint does not delay the next profile. Failed uploads are retried later, "
+            "and the oldest profiles are dropped when too many are waiting",
+        )
+
 
 config = ProfilingConfig()
@@ -7,6 +7,7 @@ from typing import Callable
 from typing import Dict
 from typing import List
 from typing import Optional
+from typing import TYPE_CHECKING
 from typing import Text
 from typing import Union
 
@@ -48,6 +49,10 @@ from .internal.sampling import SamplingMechanism
 from .internal.sampling import set_sampling_decision_maker
 
 
+if TYPE_CHECKING:  # pragma: no cover
+    from .tracer import Tracer
+
+
 _NUMERIC_TAGS = (ANALYTICS_SAMPLE_RATE_KEY,)
 _TagNameType = Union[Text, bytes]
 _MetaDictType = Dict[_TagNameType, Text]
@@ -94,6 +99,7 @@ class Span(object):
         "_parent",
         "_ignored_exceptions",
         "_on_finish_callbacks",
+        "_tracer",
         "__weakref__",
     ]
 
@@ -167,6 +173,8 @@ class Span(object):
         self.span_id = span_id or _rand64bits()  # type: int
         self.parent_id = parent_id  # type: Optional[int]
         self._on_finish_callbacks = [] if on_finish is None else on_finish
+        # The tracer that started the span, which finishes batches of its spans at once
+        self._tracer = None  # type: Optional[Tracer]
 
         # sampling
         self.sampled = True  # type: bool
@@ -271,15 +279,23 @@ class Span(object):
 
     def _finish_ns(self, finish_time_ns):
         # type: (int) -> None
-        if self.duration_ns is not None:
+        if not self._set_finish_time_ns(finish_time_ns):
             return
 
-        # be defensive so we don't die if start isn't set
-        self.duration_ns = finish_time_ns - (self.start_ns or finish_time_ns)
-
         for cb in self._on_finish_callbacks:
             cb(self)
 
+    def _set_finish_time_ns(self, finish_time_ns):
+        # type: (int) -> bool
+        """Set the duration of the span from its end time, without calling the
+        finish callbacks. Return ``False`` if the span was already finished."""
+        if self.duration_ns is not None:
+            return False
+
+        # be defensive so we don't die if start isn't set
+        self.duration_ns = finish_time_ns - (self.start_ns or finish_time_ns)
+        return True
+
     def _override_sampling_decision(self, decision):
         self.context.sampling_priority = decision
         set_sampling_decision_maker(self.context, SamplingMechanism.MANUAL)
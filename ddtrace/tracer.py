@@ -1,3 +1,4 @@
+from collections import defaultdict
 import functools
 from itertools import chain
 import json
@@ -30,6 +31,7 @@ from .internal import debug
 from .internal import forksafe
 from .internal import hostname
 from .internal.atexit import register_on_exit_signal
+from .internal.compat import time_ns
 from .internal.constants import SAMPLING_DECISION_TRACE_TAG_KEY
 from .internal.constants import SPAN_API_DATADOG
 from .internal.dogstatsd import get_dogstatsd_client
@@ -66,7 +68,9 @@ from .span import Span
 
 if TYPE_CHECKING:  # pragma: no cover
     from typing import Any
+    from typing import DefaultDict
     from typing import Dict
+    from typing import Iterable
     from typing import List
     from typing import Optional
     from typing import Set
@@ -630,6 +634,111 @@ class Tracer(object):
         Note: be sure to finish all spans to avoid memory leaks and incorrect
         parenting of spans.
         """
+        span = self._new_span(name, child_of, service, resource, span_type, activate, span_api)
+
+        # Only call span processors if the tracer is enabled
+        if self.enabled:
+            for p in chain(self._span_processors, SpanProcessor.__processors__, self._deferred_processors):
+                p.on_span_start(span)
+        self._hooks.emit(self.__class__.start_span, span)
+
+        return span
+
+    start_span = _start_span
+
+    def start_spans(
+        self,
+        name,  # type: str
+        count,  # type: int
+        child_of=None,  # type: Optional[Union[Span, Context]]
+        service=None,  # type: Optional[str]
+        resource=None,  # type: Optional[str]
+        span_type=None,  # type: Optional[str]
+        span_api=SPAN_API_DATADOG,  # type: str
+    ):
+        # type: (...) -> List[Span]
+        """Return ``count`` spans that represent operations called ``name``.
+
+        This is meant for traces with a high fan-out, like a batch job tracing
+        each of the items it processes: the span processors are called once
+        for the whole batch instead of once for each span. The spans are not
+        activated. They can be finished one by one with :meth:`Span.finish`,
+        or all at once with :meth:`finish_spans`::
+
+            with tracer.trace("etl.load") as parent:
+                spans = tracer.start_spans("etl.row", len(rows), child_of=parent)
+                for span, row in zip(spans, rows):
+                    span.resource = row.table
+                    load(row)
+                tracer.finish_spans(spans)
+
+        :param str name: the name of the operations being traced.
+        :param int count: the number of spans to start.
+        :param object child_of: a ``Span`` or a ``Context`` instance representing the parent of the spans.
+        :param str service: the name of the service being traced.
+        :param str resource: an optional name of the resource being tracked.
+        :param str span_type: an optional operation type.
+        """
+        spans = [self._new_span(name, child_of, service, resource, span_type, False, span_api) for _ in range(count)]
+
+        # Only call span processors if the tracer is enabled
+        if self.enabled and spans:
+            for p in chain(self._span_processors, SpanProcessor.__processors__, self._deferred_processors):
+                p.on_spans_start(spans)
+        for span in spans:
+            self._hooks.emit(self.__class__.start_span, span)
+
+        return spans
+
+    def finish_spans(self, spans, finish_time=None):
+        # type: (Iterable[Span], Optional[float]) -> None
+        """Finish a batch of spans and submit them to the span processors in one go.
+
+        The spans that are already finished are left untouched.
+
+        :param spans: the spans to finish, usually from :meth:`start_spans`.
+        :param finish_time: The end time of the spans, in seconds. Defaults to ``now``.
+        """
+        finish_time_ns = time_ns() if finish_time is None else int(finish_time * 1e9)
+        # The spans are grouped by the tracer that started them, whose finish
+        # callback is replaced by a single call for the whole group. The
+        # callbacks registered after it are called once the group is finished.
+        finished = defaultdict(list)  # type: DefaultDict[Tracer, List[Span]]
+        callbacks = []  # type: List[Tuple[Callable[[Span], None], Span]]
+        for span in spans:
+            if not span._set_finish_time_ns(finish_time_ns):
+                continue
+
+            tracer = span._tracer
+            on_span_finish = tracer._on_span_finish if tracer is not None else None
+            tracer_finished = False
+            for cb in span._on_finish_callbacks:
+                if not tracer_finished and cb == on_span_finish:
+                    finished[tracer].append(span)
+                    tracer_finished = True
+                elif tracer_finished:
+                    callbacks.append((cb, span))
+                else:
+                    cb(span)
+
+        for tracer, tracer_spans in finished.items():
+            tracer._on_spans_finish(tracer_spans)
+
+        for cb, span in callbacks:
+            cb(span)
+
+    def _new_span(
+        self,
+        name,  # type: str
+        child_of,  # type: Optional[Union[Span, Context]]
+        service,  # type: Optional[str]
+        resource,  # type: Optional[str]
+        span_type,  # type: Optional[str]
+        activate,  # type: bool
+        span_api,  # type: str
+    ):
+        # type: (...) -> Span
+        """Create a span without notifying the span processors and hooks about it."""
         if self._new_process:
             self._new_process = False
 
@@ -719,6 +828,8 @@ class Tracer(object):
             if config.report_hostname:
                 span.set_tag_str(HOSTNAME_KEY, hostname.get_hostname())
 
+        span._tracer = self
+
         if not span._parent:
             span.set_tag_str("runtime-id", get_runtime_id())
             span._metrics[PID] = self._pid
@@ -752,16 +863,8 @@ class Tracer(object):
         if not trace_id:
             span.sampled = self._sampler.sample(span, allow_false=isinstance(self._sampler, RateSampler))
 
-        # Only call span processors if the tracer is enabled
-        if self.enabled:
-            for p in chain(self._span_processors, SpanProcessor.__processors__, self._deferred_processors):
-                p.on_span_start(span)
-        self._hooks.emit(self.__class__.start_span, span)
-
         return span
 
-    start_span = _start_span
-
     def _on_span_finish(self, span):
         # type: (Span) -> None
         active = self.current_span()
@@ -778,6 +881,30 @@ class Tracer(object):
         if log.isEnabledFor(logging.DEBUG):
             log.debug("finishing span %s (enabled:%s)", span._pprint(), self.enabled)
 
+    def _on_spans_finish(self, spans):
+        # type: (List[Span]) -> None
+        # Like in _on_span_finish, getting the active span replaces it with
+        # its first unfinished ancestor if it has just been finished.
+        active = self.current_span()
+        if log.isEnabledFor(logging.DEBUG):
+            # Debug check: the parent of a finishing span is either finished
+            # with it or the next active span, unless tracing asynchronously.
+            finishing = set(id(span) for span in spans)
+            for span in spans:
+                parent = span._parent
+                if parent is not None and parent is not active and id(parent) not in finishing:
+                    log.debug(
+                        "span %r closing after its parent %r, this is an error when not using async", span, parent
+                    )
+
+        # Only call span processors if the tracer is enabled
+        if self.enabled:
+            for p in chain(self._span_processors, SpanProcessor.__processors__, self._deferred_processors):
+                p.on_spans_finish(spans)
+
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("finishing %d spans (enabled:%s)", len(spans), self.enabled)
+
     def _log_compat(self, level, msg):
         """Logs a message for the given level.
 
@@ -598,6 +598,11 @@ setup(
                 sources=["ddtrace/internal/_tagset.pyx"],
                 language="c",
             ),
+            Cython.Distutils.Extension(
+                "ddtrace.internal.datastreams._fnv",
+                sources=["ddtrace/internal/datastreams/_fnv.pyx"],
+                language="c",
+            ),
             Extension(
                 "ddtrace.internal._encoding",
                 ["ddtrace/internal/_encoding.pyx"],
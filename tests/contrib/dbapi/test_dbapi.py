@@ -69,6 +69,56 @@ class TestTracedCursor(TracerTestCase):
         # DBM comment should not be added procedure names
         cursor.callproc.assert_called_once_with("procedure_named_moon")
 
+    @TracerTestCase.run_in_subprocess(
+        env_overrides=dict(
+            DD_DBM_PROPAGATION_MODE="session",
+            DD_SERVICE="orders-app",
+            DD_ENV="staging",
+            DD_VERSION="v7343437-d7ac743",
+        )
+    )
+    def test_cursor_execute_with_dbm_session_injection(self):
+        cursor = self.cursor
+        session_cursor = cursor.connection.cursor.return_value
+        statement = "SELECT set_config('datadog.traceparent', %s, false)"
+        dbm_propagator = _DBM_Propagator(0, "query", session_statement=statement)
+        cfg = IntegrationConfig(Config(), "dbapi", service="orders-db", _dbm_propagator=dbm_propagator)
+        traced_cursor = TracedCursor(cursor, Pin(service="orders-db", tracer=self.tracer), cfg)
+
+        with self.tracer.trace("parent") as parent:
+            traced_cursor.execute("SELECT * FROM db;")
+            traced_cursor.execute("SELECT * FROM db;")
+            traceparent = "00-{:032x}-{:016x}-01".format(parent.trace_id, parent.span_id)
+
+        # The statement text is the same for every query and the traceparent is only set once for the parent span
+        dbm_comment = "/*dddbs='orders-db',dde='staging',ddps='orders-app',ddpv='v7343437-d7ac743'*/ "
+        assert cursor.execute.call_args_list == [mock.call(dbm_comment + "SELECT * FROM db;")] * 2
+        session_cursor.execute.assert_called_once_with(statement, (traceparent,))
+        session_cursor.close.assert_called_once_with()
+
+        spans = self.tracer.pop()
+        assert len(spans) == 3
+        assert spans[1].get_tag("_dd.dbm_trace_injected") == "true"
+        assert spans[2].get_tag("_dd.dbm_trace_injected") == "true"
+
+        # A failed query can roll back the traceparent so it is set again for the next query
+        cursor.execute.side_effect = ValueError()
+        with self.tracer.trace("parent"):
+            with pytest.raises(ValueError):
+                traced_cursor.execute("SELECT * FROM db;")
+            cursor.execute.side_effect = None
+            traced_cursor.execute("SELECT * FROM db;")
+        assert session_cursor.execute.call_count == 3
+        self.tracer.pop()
+
+        # The trace is not marked as injected when the traceparent cannot be set
+        session_cursor.execute.side_effect = ValueError()
+        with self.tracer.trace("parent"):
+            traced_cursor.execute("SELECT * FROM db;")
+        assert session_cursor.close.call_count == 4
+        spans = self.tracer.pop()
+        assert spans[1].get_tag("_dd.dbm_trace_injected") is None
+
     def test_executemany_wrapped_is_called_and_returned(self):
         cursor = self.cursor
         cursor.rowcount = 0
@@ -73,6 +73,45 @@ class TestTracedAsyncCursor(AsyncioTestCase):
         # DBM comment should not be added procedure names
         cursor.callproc.assert_called_once_with("procedure_named_moon")
 
+    @AsyncioTestCase.run_in_subprocess(
+        env_overrides=dict(
+            DD_DBM_PROPAGATION_MODE="session",
+            DD_SERVICE="orders-app",
+            DD_ENV="staging",
+            DD_VERSION="v7343437-d7ac743",
+        )
+    )
+    @mark_asyncio
+    async def test_cursor_execute_with_dbm_session_injection(self):
+        cursor = self.cursor
+        session_cursor = mock.AsyncMock()
+        cursor.connection.cursor = mock.Mock(return_value=session_cursor)
+        statement = "SELECT set_config('datadog.traceparent', %s, false)"
+        dbm_propagator = _DBM_Propagator(0, "query", session_statement=statement)
+        cfg = IntegrationConfig(Config(), "dbapi", service="orders-db", _dbm_propagator=dbm_propagator)
+        traced_cursor = TracedAsyncCursor(cursor, Pin(service="orders-db", tracer=self.tracer), cfg)
+
+        with self.tracer.trace("parent") as parent:
+            await traced_cursor.execute("SELECT * FROM db;")
+            await traced_cursor.execute("SELECT * FROM db;")
+            traceparent = "00-{:032x}-{:016x}-01".format(parent.trace_id, parent.span_id)
+
+        # The traceparent is only set once for the parent span
+        session_cursor.execute.assert_awaited_once_with(statement, (traceparent,))
+        session_cursor.close.assert_awaited_once_with()
+        spans = self.tracer.pop()
+        assert len(spans) == 3
+        assert spans[1].get_tag("_dd.dbm_trace_injected") == "true"
+        assert spans[2].get_tag("_dd.dbm_trace_injected") == "true"
+
+        # The trace is not marked as injected when the traceparent cannot be set
+        session_cursor.execute.side_effect = ValueError()
+        with self.tracer.trace("parent"):
+            await traced_cursor.execute("SELECT * FROM db;")
+        assert session_cursor.close.await_count == 2
+        spans = self.tracer.pop()
+        assert spans[1].get_tag("_dd.dbm_trace_injected") is None
+
     @mark_asyncio
     async def test_executemany_wrapped_is_called_and_returned(self):
         cursor = self.cursor
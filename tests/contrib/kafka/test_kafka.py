@@ -551,6 +551,30 @@ def test_data_streams_kafka_offset_monitoring_offsets(dsm_processor, non_auto_co
     assert list(buckets.values())[0].latest_commit_offsets[ConsumerPartitionKey("test_group", kafka_topic, 0)] == 1
 
 
+def test_data_streams_kafka_consume_batch(dsm_processor, consumer, producer, kafka_topic):
+    PAYLOAD = bytes("data streams", encoding="utf-8") if six.PY3 else bytes("data streams")
+    try:
+        del dsm_processor._current_context.value
+    except AttributeError:
+        pass
+    producer.produce(kafka_topic, PAYLOAD, key="test_key_1")
+    producer.produce(kafka_topic, PAYLOAD, key="test_key_2")
+    producer.flush()
+    messages = []
+    while len(messages) < 2:
+        messages += consumer.consume(num_messages=2, timeout=1.0)
+    buckets = dsm_processor._buckets
+    assert len(buckets) == 1
+    first = list(buckets.values())[0].pathway_stats
+    consume_stats = [
+        stats
+        for (edge_tags, _, _), stats in first.items()
+        if edge_tags == "direction:in,group:test_group,topic:{},type:kafka".format(kafka_topic)
+    ]
+    assert sum(stats.full_pathway_latency._count for stats in consume_stats) == 2
+    assert list(buckets.values())[0].latest_commit_offsets[ConsumerPartitionKey("test_group", kafka_topic, 0)] == 1
+
+
 def test_data_streams_kafka_offset_monitoring_auto_commit(dsm_processor, consumer, producer, kafka_topic):
     def _read_single_message(consumer):
         message = None
@@ -13,18 +13,21 @@ class TestKafkaPatch(PatchTestCase.Base):
     def assert_module_patched(self, confluent_kafka):
         self.assert_wrapped(confluent_kafka.Producer({}).produce)
         self.assert_wrapped(confluent_kafka.Consumer({"group.id": "group_id"}).poll)
+        self.assert_wrapped(confluent_kafka.Consumer({"group.id": "group_id"}).consume)
         self.assert_wrapped(confluent_kafka.SerializingProducer({}).produce)
         self.assert_wrapped(confluent_kafka.DeserializingConsumer({"group.id": "group_id"}).poll)
 
     def assert_not_module_patched(self, confluent_kafka):
         self.assert_not_wrapped(confluent_kafka.Producer({}).produce)
         self.assert_not_wrapped(confluent_kafka.Consumer({"group.id": "group_id"}).poll)
+        self.assert_not_wrapped(confluent_kafka.Consumer({"group.id": "group_id"}).consume)
         self.assert_not_wrapped(confluent_kafka.SerializingProducer({}).produce)
         self.assert_not_wrapped(confluent_kafka.DeserializingConsumer({"group.id": "group_id"}).poll)
 
     def assert_not_module_double_patched(self, confluent_kafka):
         self.assert_not_double_wrapped(confluent_kafka.Producer({}).produce)
         self.assert_not_double_wrapped(confluent_kafka.Consumer({"group.id": "group_id"}).poll)
+        self.assert_not_double_wrapped(confluent_kafka.Consumer({"group.id": "group_id"}).consume)
         self.assert_not_double_wrapped(confluent_kafka.SerializingProducer({}).produce)
         self.assert_not_double_wrapped(confluent_kafka.DeserializingConsumer({"group.id": "group_id"}).poll)
 
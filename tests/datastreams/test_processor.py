@@ -1,9 +1,17 @@
 import os
+import struct
 import time
 
+import pytest
+
+from ddtrace.internal.datastreams.fnv import FNV1_64_INIT
+from ddtrace.internal.datastreams.fnv import FNV_64_PRIME
+from ddtrace.internal.datastreams.fnv import fnv
+from ddtrace.internal.datastreams.fnv import fnv1_64
 from ddtrace.internal.datastreams.processor import ConsumerPartitionKey
 from ddtrace.internal.datastreams.processor import DataStreamsProcessor
 from ddtrace.internal.datastreams.processor import PartitionKey
+from ddtrace.internal.datastreams.processor import _compute_pathway_hash
 
 
 def test_data_streams_processor():
@@ -41,6 +49,71 @@ def test_data_streams_loop_protection():
     assert child_hash == expected_child_hash
 
 
+def test_data_streams_set_checkpoints():
+    processor = DataStreamsProcessor("http://localhost:8126")
+    now = time.time()
+    producer_ctx = processor.new_pathway(now - 2)
+    producer_ctx.set_checkpoint(["direction:out", "topic:topicA", "type:kafka"], now_sec=now - 1)
+    encoded_pathways = [producer_ctx.encode(), None, producer_ctx.encode()]
+    tags = ["type:kafka", "topic:topicA", "direction:in", "group:group1"]
+
+    expected = DataStreamsProcessor("http://localhost:8126")
+    for data in encoded_pathways:
+        expected_ctx = expected.decode_pathway(data)
+        expected_ctx.set_checkpoint(tags, now_sec=now)
+
+    ctx = processor.set_checkpoints(encoded_pathways, tags, now_sec=now)
+    assert processor._current_context.value is ctx
+    assert ctx.hash == expected_ctx.hash
+    assert ctx.current_edge_start_sec == now
+
+    now_ns = int(now * 1e9)
+    bucket_time_ns = int(now_ns - (now_ns % 1e10))
+    stats = processor._buckets[bucket_time_ns].pathway_stats
+    expected_stats = expected._buckets[bucket_time_ns].pathway_stats
+    consume_keys = [key for key in expected_stats if key[0].startswith("direction:in")]
+    assert len(consume_keys) == 2
+    for key in consume_keys:
+        assert stats[key].full_pathway_latency.count == expected_stats[key].full_pathway_latency.count
+        assert stats[key].edge_latency.count == expected_stats[key].edge_latency.count
+
+    assert processor.set_checkpoints([], tags) is None
+
+
+def test_kafka_offset_monitoring_batch():
+    processor = DataStreamsProcessor("http://localhost:8126")
+    now = time.time()
+    processor.track_kafka_commits("group1", [("topic1", 1, 10), ("topic1", 1, 14), ("topic1", 2, 3)], now)
+    now_ns = int(now * 1e9)
+    bucket_time_ns = int(now_ns - (now_ns % 1e10))
+    latest_commit_offsets = processor._buckets[bucket_time_ns].latest_commit_offsets
+    assert latest_commit_offsets[ConsumerPartitionKey("group1", "topic1", 1)] == 14
+    assert latest_commit_offsets[ConsumerPartitionKey("group1", "topic1", 2)] == 3
+
+
+@pytest.mark.parametrize("data", [b"", b"a", b"foobar", bytes(bytearray(range(256)))])
+def test_fnv1_64(data):
+    assert fnv1_64(data) == fnv(data, FNV1_64_INIT, FNV_64_PRIME, 2 ** 64)
+
+
+def test_compute_hash():
+    processor = DataStreamsProcessor("http://localhost:8126")
+    ctx = processor.new_pathway()
+    ctx.service = "service"
+    ctx.env = "env"
+    tags = ["direction:out", "topic:topicA", "type:kafka"]
+
+    node_hash = fnv1_64(b"serviceenvdirection:outtopic:topicAtype:kafka")
+    expected = fnv1_64(struct.pack("<Q", node_hash) + struct.pack("<Q", 42))
+    assert ctx._compute_hash(tags, 42) == expected
+
+    # The hashes of the checkpoints seen before are memoized
+    hits = _compute_pathway_hash.cache.stats.hits
+    assert ctx._compute_hash(tags, 42) == expected
+    assert _compute_pathway_hash.cache.stats.hits == hits + 1
+    assert ctx._compute_hash(tags, 43) != expected
+
+
 def test_kafka_offset_monitoring():
     processor = DataStreamsProcessor("http://localhost:8126")
     now = time.time()
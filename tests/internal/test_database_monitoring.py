@@ -22,13 +22,18 @@ def test_propagation_mode_configuration():
         config = _database_monitoring.DatabaseMonitoringConfig()
         assert config.propagation_mode == "full"
 
+    # Ensure session is a valid injection mode
+    with override_env(dict(DD_DBM_PROPAGATION_MODE="session")):
+        config = _database_monitoring.DatabaseMonitoringConfig()
+        assert config.propagation_mode == "session"
+
     # Ensure an invalid injection mode raises a ValueError
     with override_env(dict(DD_DBM_PROPAGATION_MODE="notaninjectionmode")):
         with pytest.raises(ValueError) as excinfo:
             _database_monitoring.DatabaseMonitoringConfig()
     assert (
         excinfo.value.args[0] == "Invalid value for environment variable DD_DBM_PROPAGATION_MODE: "
-        "value must be one of ['disabled', 'full', 'service']"
+        "value must be one of ['disabled', 'full', 'service', 'session']"
     )
 
 
@@ -158,6 +163,41 @@ def test_dbm_dddbs_peer_service_enabled():
     ), sqlcomment
 
 
+@pytest.mark.subprocess(
+    env=dict(
+        DD_DBM_PROPAGATION_MODE="full",
+        DD_SERVICE="orders-app",
+        DD_ENV="staging",
+        DD_VERSION="v7343437-d7ac743",
+    )
+)
+def test_dbm_comment_cached():
+    from ddtrace import tracer
+    from ddtrace.propagation import _database_monitoring
+
+    dbm_popagator = _database_monitoring._DBM_Propagator(0, "procedure")
+    cache = _database_monitoring._get_dbm_comment_prefix.cache
+
+    for _ in range(3):
+        dbspan = tracer.trace("dbname", service="orders-db")
+        sqlcomment = dbm_popagator._get_dbm_comment(dbspan)
+        assert (
+            sqlcomment
+            == "/*dddbs='orders-db',dde='staging',ddps='orders-app',ddpv='v7343437-d7ac743',traceparent='%s'*/ "
+            % (dbspan.context._traceparent,)
+        )
+
+    # the comment is generated once for the same tags, only the traceparent changes
+    assert len(cache) == 1
+    assert cache.stats.misses == 1
+
+    dbspan = tracer.trace("dbname", service="users-db")
+    sqlcomment = dbm_popagator._get_dbm_comment(dbspan)
+    assert sqlcomment.startswith("/*dddbs='users-db',dde='staging',ddps='orders-app',ddpv='v7343437-d7ac743',")
+
+    assert len(cache) == 2
+
+
 def test_default_sql_injector(caplog):
     # test sql injection with unicode str
     dbm_comment = "/*dddbs='orders-db'*/ "
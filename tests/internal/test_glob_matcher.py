@@ -28,6 +28,9 @@ from ddtrace.internal.glob_matching import GlobMatcher
         ("test/na{2}/string", "test/na{2}/string", True),
         ("*a*a*a*a*a*a", "aaaaaaaaaaaaaaaaaaaaaaaaaax", False),
         ("*a*a*a*a*a*a", "aaaaaaaarrrrrrraaaraaarararaarararaarararaaa", True),
+        ("foo*", "foo\nbar", True),  # Wildcards match new lines
+        ("a?c", "a\nc", True),
+        ("a?c", "a\nc\n", False),
     ],
 )
 def test_matching(pattern, string, result):
@@ -325,6 +325,44 @@ def test_heap_stress():
     _memalloc.stop()
 
 
+def _allocate_objects(n):
+    return [object() for _ in range(n)]
+
+
+def _count_heap_objects():
+    # Only count the object() allocations, not the ones of the list holding them
+    return sum(
+        1
+        for (stack, _nframe, _thread_id), size in _memalloc.heap()
+        if stack[0].lineno == _OBJECTS_LINE_NUMBER and size == _OBJECT_SIZE
+    )
+
+
+_OBJECTS_LINE_NUMBER = _allocate_objects.__code__.co_firstlineno + 1
+_OBJECT_SIZE = sys.getsizeof(object())
+
+
+def test_heap_untrack_out_of_order():
+    _memalloc.start(32, 64, 16)
+    try:
+        x = _allocate_objects(20000)
+        tracked = _count_heap_objects()
+        assert tracked > 0
+
+        # Free the objects in a different order than they were allocated
+        del x[::2]
+        gc.collect()
+        remaining = _count_heap_objects()
+        assert 0 < remaining < tracked
+
+        del x[::-1]
+        del x
+        gc.collect()
+        assert _count_heap_objects() == 0
+    finally:
+        _memalloc.stop()
+
+
 @pytest.mark.parametrize("heap_sample_size", (0, 512 * 1024, 1024 * 1024, 2048 * 1024, 4096 * 1024))
 def test_memalloc_speed(benchmark, heap_sample_size):
     if heap_sample_size:
@@ -339,6 +339,30 @@ def test_new_interval():
     assert new_interval == c.min_interval_time
 
 
+def test_sample_cost():
+    c = stack.StackCollector(recorder.Recorder(), max_time_usage_pct=2)
+    assert c._update_sample_cost(1000000) == 1000000
+    # Cost increases are followed right away
+    assert c._update_sample_cost(2000000) == 2000000
+    # Cost decreases are smoothed
+    assert c._update_sample_cost(1000000) == 1800000
+    assert c._update_sample_cost(1000000) == 1640000
+    assert c._compute_new_interval(c._update_sample_cost(1000000)) == pytest.approx(0.074088)
+
+
+def test_sampling_period():
+    r = recorder.Recorder()
+    s = stack.StackCollector(r)
+    s._init()
+    time.sleep(0.1)
+    events = s.collect()
+    assert events[0]
+    # The sampling period is the time elapsed since the previous sample
+    for e in events[0]:
+        assert e.sampling_period >= 0.1e9
+        assert e.sampling_period == e.wall_time_ns
+
+
 # Function to use for stress-test of polling
 MAX_FN_NUM = 30
 FN_TEMPLATE = """def _f{num}():
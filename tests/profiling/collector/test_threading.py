@@ -20,7 +20,7 @@ def test_repr():
         collector_threading.ThreadingLockCollector,
         "ThreadingLockCollector(status=<ServiceStatus.STOPPED: 'stopped'>, "
         "recorder=Recorder(default_max_events=16384, max_events={}), capture_pct=1.0, nframes=64, "
-        "endpoint_collection_enabled=True, tracer=None)",
+        "endpoint_collection_enabled=True, aggregate_events=False, tracer=None)",
     )
 
 
@@ -350,3 +350,42 @@ def test_user_threads_have_native_id():
         raise AssertionError("Thread.native_id not set")
 
     t.join()
+
+
+def test_lock_events_aggregate():
+    r = recorder.Recorder()
+    with collector_threading.ThreadingLockCollector(r, capture_pct=100, aggregate_events=True) as collector:
+        lock = threading.Lock()
+        for _ in range(10):
+            lock.acquire()
+            lock.release()
+        lock.acquire()
+        lock.release()
+
+        # Events are only emitted when the collector is snapshot
+        assert not r.events[collector_threading.ThreadingLockAcquireEvent]
+        assert not r.events[collector_threading.ThreadingLockReleaseEvent]
+        events = collector.snapshot()
+
+    assert collector.snapshot() == []
+    assert len(events) == 2
+    events_by_class = {type(e[0]): e for e in events}
+    acquire_events = [
+        e
+        for e in events_by_class[collector_threading.ThreadingLockAcquireEvent]
+        if e.lock_name == "test_threading.py:358"
+    ]
+    release_events = [
+        e
+        for e in events_by_class[collector_threading.ThreadingLockReleaseEvent]
+        if e.lock_name == "test_threading.py:358"
+    ]
+    # One event per call site
+    assert [(e.frames[0].lineno, e.count) for e in acquire_events] == [(360, 10), (362, 1)]
+    assert [(e.frames[0].lineno, e.count) for e in release_events] == [(361, 10), (363, 1)]
+    for event in acquire_events:
+        assert event.thread_id == _thread.get_ident()
+        assert event.wait_time_ns >= 0
+        assert event.sampling_pct == 100
+    for event in release_events:
+        assert event.locked_for_ns >= 0
@@ -20,3 +20,34 @@ def test_check_traceback_to_frames():
         (this_file, 7, "_x", ""),
         (this_file, 15, "test_check_traceback_to_frames", ""),
     ]
+
+
+class _Base(object):
+    def frames(self):
+        return _traceback.pyframe_to_frames(sys._getframe(), 2)[0]
+
+    @classmethod
+    def class_frames(cls):
+        return _traceback.pyframe_to_frames(sys._getframe(), 2)[0]
+
+
+class _Derived(_Base):
+    pass
+
+
+def test_pyframe_to_frames_cache():
+    frames = [_Base().frames()[0] for _ in range(2)]
+    assert frames[0] is frames[1]
+    assert frames[0][2:] == ("frames", "_Base")
+
+    # The class name is the one of the instance, not of the class defining the method
+    assert _Derived().frames()[0][2:] == ("frames", "_Derived")
+    assert _Derived.class_frames()[0][2:] == ("class_frames", "_Derived")
+    assert _Base.class_frames()[0][2:] == ("class_frames", "_Base")
+
+    # Frames without an instance or class argument
+    frame = sys._getframe()
+    frames, nframes = _traceback.pyframe_to_frames(frame, 1)
+    lineno = frame.f_lineno - 1
+    assert nframes > 1
+    assert frames == [(__file__.replace(".pyc", ".py"), lineno, "test_pyframe_to_frames_cache", "")]
@@ -7,6 +7,7 @@ import sys
 import threading
 import time
 
+import mock
 import pytest
 import six
 from six.moves import BaseHTTPServer
@@ -284,6 +285,43 @@ def test_export_tracer_base_path_agent_less(endpoint_test_server):
     exp.export(test_pprof.TEST_EVENTS, 0, compat.time_ns())
 
 
+def test_export_background_upload(endpoint_test_server):
+    exp = http.PprofHTTPExporter(
+        endpoint=_ENDPOINT, api_key=_API_KEY, endpoint_call_counter_span_processor=_get_span_processor()
+    )
+    uploader = exp.uploader = http.ProfileUploader(exp)
+    with mock.patch.object(exp, "_check_status", wraps=exp._check_status) as check_status:
+        exp.export(test_pprof.TEST_EVENTS, 0, compat.time_ns())
+        assert len(uploader) == 1
+        uploader.periodic()
+        assert len(uploader) == 0
+        check_status.assert_called_once_with(200)
+
+        # Profiles queued before stopping are uploaded
+        uploader.start()
+        exp.export(test_pprof.TEST_EVENTS, 0, compat.time_ns())
+        uploader.stop()
+        uploader.join()
+        assert len(uploader) == 0
+        assert check_status.call_count == 2
+
+
+def test_export_background_upload_retry():
+    exp = http.PprofHTTPExporter(
+        endpoint="http://localhost:2",
+        api_key=_API_KEY,
+        endpoint_call_counter_span_processor=_get_span_processor(),
+    )
+    uploader = exp.uploader = http.ProfileUploader(exp, max_queued=2)
+    for end in range(1, 4):
+        exp.export(test_pprof.TEST_EVENTS, 0, end * 1000000000)
+    # The oldest profile has been dropped
+    assert [u.event["end"] for u in uploader._queue] == ["1970-01-01T00:00:02Z", "1970-01-01T00:00:03Z"]
+    uploader.periodic()
+    # The profiles are kept to be retried later
+    assert len(uploader) == 2
+
+
 def test_get_tags():
     tags = parse_tags_str(http.PprofHTTPExporter(env="foobar", endpoint="")._get_tags("foobar"))
     assert len(tags) == 8
@@ -5,6 +5,8 @@ import mock
 import six
 
 from ddtrace import ext
+from ddtrace.profiling import event
+from ddtrace.profiling import recorder
 from ddtrace.profiling.collector import _lock
 from ddtrace.profiling.collector import memalloc
 from ddtrace.profiling.collector import stack_event
@@ -796,3 +798,84 @@ def test_pprof_exporter_empty():
     export, libs = exp.export({}, 0, 1)
     assert len(libs) > 0
     assert len(export.sample) == 0
+
+
+def _profile_samples(profile):
+    strings = profile.string_table
+    functions = {f.id: strings[f.name] for f in profile.function}
+    locations = {
+        loc.id: tuple((functions[line.function_id], line.line) for line in loc.line) for loc in profile.location
+    }
+    return sorted(
+        (
+            tuple(locations[loc_id] for loc_id in sample.location_id),
+            tuple((strings[label.key], strings[label.str]) for label in sample.label),
+            tuple(sample.value),
+        )
+        for sample in profile.sample
+    )
+
+
+def test_pprof_exporter_aggregate():
+    exp = pprof.PprofExporter()
+    for events in TEST_EVENTS.values():
+        assert exp.aggregate(list(events))
+    aggregated, aggregated_libs = exp.export({}, 1, 7)
+
+    exported, exported_libs = pprof.PprofExporter().export(TEST_EVENTS, 1, 7)
+
+    assert _profile_samples(aggregated) == _profile_samples(exported)
+    assert aggregated.period == exported.period == 1000000
+    assert len(aggregated_libs) == len(exported_libs)
+
+    # Aggregated events are only exported once
+    export, _ = exp.export({}, 7, 8)
+    assert len(export.sample) == 0
+    assert export.period == 0
+
+
+def test_pprof_exporter_aggregate_fold():
+    events = TEST_EVENTS[stack_event.StackSampleEvent]
+    exp = pprof.PprofExporter()
+    for e in events:
+        exp.aggregate([e])
+    exp.aggregate(events)
+    export, _ = exp.export({}, 1, 7)
+
+    cpu_samples = [i for i, t in enumerate(export.sample_type) if export.string_table[t.type] == "cpu-samples"][0]
+    assert sum(sample.value[cpu_samples] for sample in export.sample) == 2 * len(events)
+
+
+def test_pprof_exporter_aggregate_unsupported():
+    exp = pprof.PprofExporter()
+    assert not exp.aggregate([event.StackBasedEvent()])
+
+
+def test_pprof_exporter_lock_event_count():
+    frames = [("foobar.py", 23, "func1", "")]
+    events = [
+        _lock.LockAcquireEvent(
+            lock_name="foobar.py:12", frames=frames, nframes=1, wait_time_ns=1000, count=4, sampling_pct=100
+        ),
+        _lock.LockAcquireEvent(lock_name="foobar.py:12", frames=frames, nframes=1, wait_time_ns=500, sampling_pct=100),
+    ]
+    export, _ = pprof.PprofExporter().export({_lock.LockAcquireEvent: events}, 1, 7)
+
+    sample_types = [export.string_table[t.type] for t in export.sample_type]
+    assert len(export.sample) == 1
+    values = export.sample[0].value
+    assert values[sample_types.index("lock-acquire")] == 5
+    assert values[sample_types.index("lock-acquire-wait")] == 1500
+
+
+def test_pprof_exporter_columnar():
+    columns = recorder.StackSampleColumns()
+    columns.extend(TEST_EVENTS[stack_event.StackSampleEvent])
+    events = dict(TEST_EVENTS)
+    events[stack_event.StackSampleEvent] = columns
+    columnar, _ = pprof.PprofExporter().export(events, 1, 7)
+
+    exported, _ = pprof.PprofExporter().export(TEST_EVENTS, 1, 7)
+
+    assert _profile_samples(columnar) == _profile_samples(exported)
+    assert columnar.period == exported.period
@@ -44,6 +44,26 @@ def test_push_events_empty():
     assert len(r.events[event.Event]) == 0
 
 
+def test_aggregator():
+    class Aggregator(object):
+        def __init__(self):
+            self.events = []
+
+        def aggregate(self, events):
+            if isinstance(events[0], stack_event.StackSampleEvent):
+                self.events.extend(events)
+                return True
+            return False
+
+    r = recorder.Recorder(aggregator=Aggregator())
+    r.push_events([stack_event.StackSampleEvent(), stack_event.StackSampleEvent()])
+    r.push_event(event.Event())
+    assert len(r.aggregator.events) == 2
+    events = r.reset()
+    assert len(events[stack_event.StackSampleEvent]) == 0
+    assert len(events[event.Event]) == 1
+
+
 def test_limit():
     r = recorder.Recorder(
         default_max_events=12,
@@ -55,6 +75,48 @@ def test_limit():
     assert r.events[stack_event.StackSampleEvent].maxlen == 24
 
 
+def test_columnar():
+    r = recorder.Recorder(columnar=True, max_events={stack_event.StackSampleEvent: 3})
+    frames = [event.DDFrame("foo.py", 12, "foo", ""), event.DDFrame("bar.py", 34, "bar", "Bar")]
+    resource = ["myresource"]
+    samples = [
+        stack_event.StackSampleEvent(
+            timestamp=i,
+            thread_id=1234,
+            thread_name="MainThread",
+            frames=frames,
+            nframes=4,
+            span_id=i or None,
+            local_root_span_id=i or None,
+            trace_type="web",
+            trace_resource_container=resource,
+            wall_time_ns=10 * i,
+            cpu_time_ns=i,
+            sampling_period=100,
+        )
+        for i in range(5)
+    ]
+    r.push_events(samples[:2])
+    r.push_event(event.Event())
+    columns = r.events[stack_event.StackSampleEvent]
+    assert isinstance(columns, recorder.StackSampleColumns)
+    assert list(columns) == samples[:2]
+    assert columns[-1].span_id == 1
+    assert columns[0].span_id is None
+    assert columns[0].trace_resource_container is resource
+
+    # Once full, the oldest samples are dropped
+    r.push_events(samples[2:])
+    events = r.reset()
+    columns = events[stack_event.StackSampleEvent]
+    assert len(columns) == 3
+    assert list(columns) == samples[2:]
+    assert [columns[i].timestamp for i in range(3)] == [2, 3, 4]
+    assert len(columns.stacks) == len(columns.labels) == 1
+    assert len(events[event.Event]) == 1
+    assert len(r.events[stack_event.StackSampleEvent]) == 0
+
+
 @pytest.mark.skipif(sys.platform == "win32", reason="fork only available on Unix")
 def test_fork():
     stdout, stderr, exitcode, pid = call_program("python", os.path.join(os.path.dirname(__file__), "recorder_fork.py"))
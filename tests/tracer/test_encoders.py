@@ -22,10 +22,10 @@ from ddtrace.ext import SpanTypes
 from ddtrace.ext.ci import CI_APP_TEST_ORIGIN
 from ddtrace.internal._encoding import BufferFull
 from ddtrace.internal._encoding import BufferItemTooLarge
+from ddtrace.internal._encoding import BufferedPayload
 from ddtrace.internal._encoding import EncodingValidationError
 from ddtrace.internal._encoding import ListStringTable
 from ddtrace.internal._encoding import MsgpackStringTable
-from ddtrace.internal.compat import msgpack_type
 from ddtrace.internal.compat import string_type
 from ddtrace.internal.encoding import JSONEncoder
 from ddtrace.internal.encoding import JSONEncoderV2
@@ -252,9 +252,9 @@ class TestEncoders(TestCase):
         spans = encoder.encode()
         items = encoder._decode(spans)
 
-        # test the encoded output that should be a string
+        # test the encoded output that should be a buffer
         # and the output must be flatten
-        assert isinstance(spans, msgpack_type)
+        assert isinstance(spans, BufferedPayload)
         assert len(items) == 3
         assert len(items[0]) == 2
         assert len(items[1]) == 2
@@ -332,6 +332,28 @@ def test_custom_msgpack_encode(encoding):
     assert decode(refencoder.encode_traces([[s]])) == decode(encoder.encode())
 
 
+@allencodings
+def test_custom_msgpack_encode_payload_owns_buffer(encoding):
+    encoder = MSGPACK_ENCODERS[encoding](1 << 20, 1 << 20)
+    refencoder = REF_MSGPACK_ENCODERS[encoding]()
+
+    trace = gen_trace(nspans=50)
+    encoder.put(trace)
+    payload = encoder.encode()
+    assert isinstance(payload, BufferedPayload)
+    view = memoryview(payload)
+    assert view.readonly
+    assert view.nbytes == len(payload)
+    del payload
+
+    # The encoder must keep encoding into a new buffer while the view on the
+    # previous payload is still alive
+    other_trace = gen_trace(nspans=10)
+    encoder.put(other_trace)
+    assert decode(refencoder.encode_traces([other_trace])) == decode(encoder.encode())
+    assert decode(refencoder.encode_traces([trace])) == decode(view)
+
+
 def span_type_span():
     s = Span("span_name")
     s.span_type = SpanTypes.WEB
@@ -584,6 +606,51 @@ def test_msgpack_string_table():
     assert "foobar" not in t
 
 
+def test_msgpack_string_table_hot_strings():
+    t = MsgpackStringTable(1 << 10)
+
+    t.index("foo")
+    t.index("bar")
+    t.flush()
+    assert len(t) == 2
+
+    # Strings used by two consecutive payloads are kept in the table
+    t.index("foo")
+    t.index("baz")
+    t.flush()
+    assert len(t) == 3
+    assert "foo" in t
+    assert "baz" not in t
+
+    foo = t.index("foo")
+    assert foo == 2
+    assert t.index("qux") == 3
+    encoded = t.flush()
+    assert decode(encoded + b"\xc0", reconstruct=False) == [[b"", _ORIGIN_KEY, b"foo", b"qux"], None]
+    assert "foo" in t
+
+    # Hot strings are dropped from the table as soon as a payload does not use them
+    t.index("bar")
+    t.flush()
+    assert "foo" not in t
+    assert len(t) == 2
+
+
+def test_custom_msgpack_encode_v05_hot_strings():
+    encoder = MSGPACK_ENCODERS["v0.5"](1 << 20, 1 << 20)
+    refencoder = REF_MSGPACK_ENCODERS["v0.5"]()
+
+    for _ in range(3):
+        trace = gen_trace(nspans=50)
+        encoder.put(trace)
+        assert decode(refencoder.encode_traces([trace])) == decode(encoder.encode())
+
+    # The encoder keeps encoding with the hot strings of the previous payloads
+    trace = [Span(name="other", service="other", resource="other")]
+    encoder.put(trace)
+    assert decode(refencoder.encode_traces([trace])) == decode(encoder.encode())
+
+
 def test_list_string_table():
     t = ListStringTable()
 
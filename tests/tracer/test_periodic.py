@@ -130,3 +130,27 @@ def test_awakeable_periodic_service():
     awake_me.stop()
 
     assert queue == list(range(n + 2))
+
+
+def test_notifiable_periodic_service():
+    ran = Event()
+    queue = []
+
+    class NotifyMe(periodic.NotifiablePeriodicService):
+        def periodic(self):
+            queue.append(len(queue))
+            ran.set()
+
+    # Use an interval long enough for the periodic function to only run when notified
+    notify_me = NotifyMe(60)
+    notify_me.start()
+
+    try:
+        notify_me.notify()
+        assert ran.wait(5)
+        assert queue == [0]
+    finally:
+        notify_me.stop()
+        notify_me.join()
+
+    assert queue == [0]
@@ -1,3 +1,4 @@
+import threading
 from typing import Any
 
 import attr
@@ -10,6 +11,7 @@ from ddtrace.constants import AUTO_KEEP
 from ddtrace.constants import AUTO_REJECT
 from ddtrace.constants import MANUAL_KEEP_KEY
 from ddtrace.constants import SAMPLING_PRIORITY_KEY
+from ddtrace.constants import SPAN_MEASURED_KEY
 from ddtrace.constants import USER_KEEP
 from ddtrace.constants import USER_REJECT
 from ddtrace.constants import _SINGLE_SPAN_SAMPLING_MAX_PER_SEC
@@ -19,6 +21,7 @@ from ddtrace.context import Context
 from ddtrace.ext import SpanTypes
 from ddtrace.internal.constants import HIGHER_ORDER_TRACE_ID_BITS
 from ddtrace.internal.processor.endpoint_call_counter import EndpointCallCounterProcessor
+from ddtrace.internal.processor.stats import SpanStatsProcessorV06
 from ddtrace.internal.processor.trace import SpanAggregator
 from ddtrace.internal.processor.trace import SpanProcessor
 from ddtrace.internal.processor.trace import SpanSamplingProcessor
@@ -161,6 +164,145 @@ def test_aggregator_multi_span():
     assert writer.pop() == [parent, child]
 
 
+def test_aggregator_shards():
+    writer = DummyWriter()
+    aggr = SpanAggregator(
+        partial_flush_enabled=False, partial_flush_min_spans=0, trace_processors=[], writer=writer, num_shards=4
+    )
+    assert len(aggr._shards) == 4
+
+    def create_trace(trace_id):
+        parent = Span("parent", trace_id=trace_id, on_finish=[aggr.on_span_finish])
+        aggr.on_span_start(parent)
+        for _ in range(10):
+            child = Span("child", trace_id=trace_id, parent_id=parent.span_id, on_finish=[aggr.on_span_finish])
+            aggr.on_span_start(child)
+            child.finish()
+        parent.finish()
+
+    threads = [threading.Thread(target=create_trace, args=(trace_id,)) for trace_id in range(1, 21)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    traces = writer.pop_traces()
+    assert sorted(trace[0].trace_id for trace in traces) == list(range(1, 21))
+    assert all(len(trace) == 11 for trace in traces)
+    assert not any(shard.traces for shard in aggr._shards)
+
+
+def test_aggregator_batch():
+    writer = DummyWriter()
+    aggr = SpanAggregator(partial_flush_enabled=False, partial_flush_min_spans=0, trace_processors=[], writer=writer)
+
+    parent = Span("parent", on_finish=[aggr.on_span_finish])
+    aggr.on_span_start(parent)
+    children = [Span("child", trace_id=parent.trace_id, parent_id=parent.span_id) for _ in range(10)]
+    other = Span("other")
+    aggr.on_spans_start(children + [other])
+    assert sum(shard.span_metrics_totals["spans_created"] for shard in aggr._shards) == 12
+
+    for span in children + [other]:
+        span.finished = True
+    aggr.on_spans_finish(children + [other])
+    assert sum(shard.span_metrics_totals["spans_finished"] for shard in aggr._shards) == 11
+    # Only the trace without unfinished spans is flushed
+    assert writer.pop_traces() == [[other]]
+
+    parent.finish()
+    assert writer.pop_traces() == [[parent] + children]
+    assert not any(shard.traces for shard in aggr._shards)
+
+
+def test_span_processor_batch_defaults():
+    started = []
+    finished = []
+
+    @attr.s
+    class MyProcessor(SpanProcessor):
+        def on_span_start(self, span):
+            started.append(span)
+
+        def on_span_finish(self, span):
+            finished.append(span)
+
+    spans = [Span("span") for _ in range(3)]
+    processor = MyProcessor()
+    processor.on_spans_start(spans)
+    processor.on_spans_finish(spans)
+    assert started == spans
+    assert finished == spans
+
+
+def test_aggregator_processors_outside_lock():
+    lock_held = []
+
+    class Proc(TraceProcessor):
+        def process_trace(self, trace):
+            # Try to acquire the shard lock from another thread
+            lock = aggr._shard(trace[0].trace_id).lock
+
+            def acquire():
+                acquired = lock.acquire(False)
+                if acquired:
+                    lock.release()
+                lock_held.append(not acquired)
+
+            t = threading.Thread(target=acquire)
+            t.start()
+            t.join()
+            return trace
+
+    writer = DummyWriter()
+    aggr = SpanAggregator(
+        partial_flush_enabled=False, partial_flush_min_spans=0, trace_processors=[Proc()], writer=writer
+    )
+
+    span = Span("span", on_finish=[aggr.on_span_finish])
+    aggr.on_span_start(span)
+    span.finish()
+
+    assert lock_held == [False]
+    assert writer.pop() == [span]
+
+
+def test_aggregator_partial_flushes_ordered():
+    processing = threading.Event()
+    release = threading.Event()
+
+    class Proc(TraceProcessor):
+        def process_trace(self, trace):
+            if trace[0].name == "first":
+                processing.set()
+                assert release.wait(5)
+            return trace
+
+    writer = DummyWriter()
+    aggr = SpanAggregator(
+        partial_flush_enabled=True, partial_flush_min_spans=1, trace_processors=[Proc()], writer=writer
+    )
+
+    root = Span("root", on_finish=[aggr.on_span_finish])
+    first = Span("first", trace_id=root.trace_id, parent_id=root.span_id, on_finish=[aggr.on_span_finish])
+    second = Span("second", trace_id=root.trace_id, parent_id=root.span_id, on_finish=[aggr.on_span_finish])
+    for span in (root, first, second):
+        aggr.on_span_start(span)
+
+    t = threading.Thread(target=first.finish)
+    t.start()
+    assert processing.wait(5)
+    # The second partial flush is queued behind the first one without waiting
+    second.finish()
+    assert writer.pop_traces() == []
+
+    release.set()
+    t.join()
+    root.finish()
+    assert writer.pop_traces() == [[first], [second], [root]]
+    assert not any(shard.flushed for shard in aggr._shards)
+
+
 def test_aggregator_partial_flush_0_spans():
     writer = DummyWriter()
     aggr = SpanAggregator(partial_flush_enabled=True, partial_flush_min_spans=0, trace_processors=[], writer=writer)
@@ -325,9 +467,9 @@ def test_trace_top_level_span_processor_orphan_span():
 @pytest.mark.parametrize(
     "trace_id",
     [
-        2 ** 128 - 1,
+        2**128 - 1,
         2 ** 64 + 1,
-        2 ** 96 - 1,
+        2**96 - 1,
     ],
 )
 def test_trace_128bit_processor(trace_id):
@@ -374,6 +516,55 @@ def test_span_normalizator():
     assert span.span_type == "x" * MAX_TYPE_LENGTH
 
 
+def test_span_stats_processor_thread_buffers():
+    processor = SpanStatsProcessorV06("http://localhost:8126", interval=1000.0)
+    processor.stop()
+    processor.join()
+
+    def finish_spans():
+        for i in range(100):
+            span = Span("web.request", service="web", resource="GET /%d" % (i % 2))
+            span.set_metric(SPAN_MEASURED_KEY, 1)
+            span.error = int(i % 10 == 0)
+            span.start_ns = 0
+            span.duration_ns = 10
+            processor.on_span_finish(span)
+
+    threads = [threading.Thread(target=finish_spans) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(processor._stats_buffers) == 4
+    # The spans are only merged into the buckets at flush time
+    assert not processor._buckets
+    # The durations are added to the distributions of each thread as the spans finish
+    points = [point for b in processor._stats_buffers for bucket in b.points.values() for point in bucket.values()]
+    assert sum(point.ok_distribution.count for point in points) == 360
+    assert sum(point.err_distribution.count for point in points) == 40
+
+    with processor._lock:
+        buckets = processor._serialize_buckets()
+    assert len(buckets) == 1
+    stats = sorted(buckets[0]["Stats"], key=lambda s: s["Resource"])
+    assert [s["Resource"] for s in stats] == ["GET /0", "GET /1"]
+    assert [s["Hits"] for s in stats] == [200, 200]
+    assert [s["Errors"] for s in stats] == [40, 0]
+    assert [s["Duration"] for s in stats] == [2000, 2000]
+
+    # The buffers of the threads that are gone are dropped once empty
+    with processor._lock:
+        assert processor._serialize_buckets() == []
+    assert processor._stats_buffers == []
+
+    # A thread whose buffer was dropped gets a new one
+    finish_spans()
+    assert len(processor._stats_buffers) == 1
+    with processor._lock:
+        buckets = processor._serialize_buckets()
+    assert sum(s["Hits"] for s in buckets[0]["Stats"]) == 100
+
+
 def test_span_creation_metrics():
     """Test that telemetry metrics are queued in batches of 100 and the remainder is sent on shutdown"""
     writer = DummyWriter()
@@ -232,6 +232,40 @@ def test_inject_tags_disabled(tracer):
             assert _HTTP_HEADER_TAGS not in headers
 
 
+def test_inject_cached_headers():
+    ctx = Context(trace_id=1234, span_id=5678, sampling_priority=1, dd_origin="synthetics")
+    with override_global_config(
+        dict(_propagation_style_inject=[PROPAGATION_STYLE_DATADOG, _PROPAGATION_STYLE_W3C_TRACECONTEXT])
+    ):
+        headers = {}
+        HTTPPropagator.inject(ctx, headers)
+        assert headers[HTTP_HEADER_SAMPLING_PRIORITY] == "1"
+        assert ctx._propagation_headers is not None
+        injected = ctx._propagation_headers[1]
+
+        other_headers = {"x-other": "value"}
+        HTTPPropagator.inject(ctx, other_headers)
+        assert other_headers == dict(headers, **{"x-other": "value"})
+        assert ctx._propagation_headers[1] is injected
+
+        # Changing the context discards the cached headers
+        ctx.sampling_priority = 2
+        ctx.dd_origin = "rum"
+        ctx._meta["_dd.p.test"] = "value"
+        headers = {}
+        HTTPPropagator.inject(ctx, headers)
+        assert headers[HTTP_HEADER_SAMPLING_PRIORITY] == "2"
+        assert headers[HTTP_HEADER_ORIGIN] == "rum"
+        assert headers[_HTTP_HEADER_TAGS] == "_dd.p.test=value"
+        assert headers[_HTTP_HEADER_TRACESTATE] == "dd=s:2;o:rum;t.test:value"
+
+    # Changing the propagation styles discards the cached headers
+    with override_global_config(dict(_propagation_style_inject=[PROPAGATION_STYLE_B3_SINGLE])):
+        headers = {}
+        HTTPPropagator.inject(ctx, headers)
+        assert headers == {_HTTP_HEADER_B3_SINGLE: "00000000000004d2-000000000000162e-d"}
+
+
 def test_inject_tags_previous_error(tracer):
     """When we have previously gotten an error, do not try to propagate tags"""
     # This value is valid
@@ -487,6 +521,48 @@ def test_WSGI_extract(tracer):
         }
 
 
+def test_extract_mixed_case(tracer):
+    headers = {
+        "X-Datadog-Trace-Id": "1234",
+        "X-DATADOG-PARENT-ID": "5678",
+        "x-datadog-Sampling-Priority": "1",
+        "Http_X_Datadog_Origin": "synthetics",
+    }
+
+    context = HTTPPropagator.extract(headers)
+
+    assert context.trace_id == 1234
+    assert context.span_id == 5678
+    assert context.sampling_priority == 1
+    assert context.dd_origin == "synthetics"
+
+
+def test_extract_header_pairs(tracer):
+    """Ensure we support the headers given as a list of pairs, e.g. ASGI headers."""
+    headers = [
+        (b"host", b"localhost"),
+        (b"x-datadog-trace-id", b"1234"),
+        (b"x-datadog-parent-id", b"5678"),
+        (b"x-datadog-sampling-priority", b"1"),
+        (b"x-datadog-origin", b"synthetics"),
+        (b"x-datadog-tags", b"_dd.p.test=value,any=tag"),
+    ]
+
+    context = HTTPPropagator.extract(headers)
+
+    assert context.trace_id == 1234
+    assert context.span_id == 5678
+    assert context.sampling_priority == 1
+    assert context.dd_origin == "synthetics"
+    assert context._meta == {
+        "_dd.origin": "synthetics",
+        "_dd.p.test": "value",
+    }
+
+    assert HTTPPropagator.extract([("X-Datadog-Trace-Id", "1234"), ("X-Datadog-Parent-Id", "5678")]).trace_id == 1234
+    assert HTTPPropagator.extract([(b"user-agent", b"test")]).trace_id is None
+
+
 def test_extract_invalid_tags(tracer):
     # Malformed tags do not fail to extract the rest of the context
     headers = {
@@ -20,6 +20,7 @@ from ddtrace.internal.compat import iteritems
 from ddtrace.internal.rate_limiter import RateLimiter
 from ddtrace.internal.sampling import SAMPLING_DECISION_TRACE_TAG_KEY
 from ddtrace.internal.sampling import SamplingMechanism
+from ddtrace.internal.sampling import SamplingRuleIndex
 from ddtrace.internal.sampling import set_sampling_decision_maker
 from ddtrace.sampler import DatadogSampler
 from ddtrace.sampler import RateByServiceSampler
@@ -744,6 +745,66 @@ def test_datadog_sampler_init():
     )
 
 
+def test_sampling_rule_index_first_match():
+    rules = [
+        SamplingRule(sample_rate=0.1, service="svc", name="op", tags={"env": "prod*"}),
+        SamplingRule(sample_rate=0.2, service=re.compile("^sv"), name="op"),
+        NoMatch(0.3),
+        SamplingRule(sample_rate=0.4, service="svc"),
+        SamplingRule(sample_rate=0.5, name=lambda name: name.startswith("o")),
+        SamplingRule(sample_rate=0.6, service="other", name="op"),
+        SamplingRule(sample_rate=0.7),
+    ]
+    index = SamplingRuleIndex(rules)
+    assert index.rules == rules
+
+    def match(service, name, tags=None):
+        span = Span(name=name, service=service)
+        span.set_tags(tags or {})
+        rule = index.match(span)
+        return rule.sample_rate if rule is not None else None
+
+    assert match("svc", "op", {"env": "production"}) == 0.1
+    assert match("svc", "op", {"env": "staging"}) == 0.2
+    assert match("svc", "other") == 0.4
+    assert match("foo", "op") == 0.5
+    assert match("other", "op") == 0.5
+    assert match("other", "bar") == 0.7
+    assert match(None, "bar") == 0.7
+
+    # Rules implementing their own matching are evaluated in order for every span
+    rules.insert(3, MatchSample(0.35))
+    index = SamplingRuleIndex(rules)
+    assert match("svc", "other") == 0.35
+    assert match("foo", "bar") == 0.35
+
+    assert SamplingRuleIndex([]).match(Span(name="op")) is None
+    assert SamplingRuleIndex([SamplingRule(sample_rate=1, service="svc")]).match(Span(name="op")) is None
+
+
+def test_datadog_sampler_set_rules():
+    sampler = DatadogSampler(rules=[SamplingRule(sample_rate=0.5, service="svc")])
+    span = Span(name="op", service="svc")
+    assert sampler._rule_index.match(span).sample_rate == 0.5
+
+    sampler.rules = [SamplingRule(sample_rate=0.25, service="svc")]
+    assert sampler._rule_index.match(span).sample_rate == 0.25
+
+    # Changes made to the rules in place are reindexed
+    sampler.rules.insert(0, SamplingRule(sample_rate=0.1, service="svc"))
+    assert sampler._rule_index.match(span).sample_rate == 0.1
+    sampler.rules[0] = SamplingRule(sample_rate=0.2, name="op")
+    assert sampler._rule_index.match(span).sample_rate == 0.2
+    del sampler.rules[0]
+    assert sampler._rule_index.match(span).sample_rate == 0.25
+    sampler.rules += [SamplingRule(sample_rate=0.3, service="svc")]
+    assert [rule.sample_rate for rule in sampler.rules] == [0.25, 0.3]
+    sampler.rules.clear()
+    assert sampler._rule_index.match(span) is None
+    sampler.rules.append(SamplingRule(sample_rate=0.4, service="svc"))
+    assert sampler._rule_index.match(span).sample_rate == 0.4
+
+
 @mock.patch("ddtrace.sampler.RateSampler.sample")
 def test_datadog_sampler_sample_no_rules(mock_sample, dummy_tracer):
     sampler = DatadogSampler()
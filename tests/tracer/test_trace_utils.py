@@ -80,6 +80,31 @@ class TestHeaders(object):
         assert span.get_tag("http.request.headers.content-type") == "some;value;content-type"
         assert None is span.get_tag("http.request.headers.other")
 
+    def test_header_plan_follows_traced_headers(self, span, config, integration_config):
+        """
+        :type span: Span
+        :type integration_config: IntegrationConfig
+        """
+        headers = {"Content-Type": "some;value;content-type", "Max-Age": "some;value;max_age"}
+        integration_config.http.trace_headers(["Content-Type"])
+        trace_utils._store_request_headers(headers, span, integration_config)
+        assert integration_config._header_tag_names("request") == {
+            "Content-Type": "http.request.headers.content-type",
+            "Max-Age": None,
+        }
+        assert span.get_tag("http.request.headers.max-age") is None
+
+        # Traced headers added later, at the integration or global level, are picked up
+        integration_config.http.trace_headers(["Max-Age"])
+        config.http._header_tags = {"content-type": "content_type_tag"}
+        trace_utils._store_request_headers(headers, span, integration_config)
+        assert span.get_tag("http.request.headers.max-age") == "some;value;max_age"
+
+        integration_config.http._reset()
+        trace_utils._store_response_headers(headers, span, integration_config)
+        assert integration_config._header_tag_names("response") == {"Content-Type": "content_type_tag", "Max-Age": None}
+        assert span.get_tag("content_type_tag") == "some;value;content-type"
+
     def test_store_multiple_request_headers_as_dict(self, span, integration_config):
         """
         :type span: Span
@@ -35,6 +35,7 @@ from ddtrace.contrib.trace_utils import set_user
 from ddtrace.ext import user
 from ddtrace.internal import telemetry
 from ddtrace.internal._encoding import MsgpackEncoderV03
+from ddtrace.internal.processor import SpanProcessor
 from ddtrace.internal.serverless import has_aws_lambda_agent_extension
 from ddtrace.internal.serverless import in_aws_lambda
 from ddtrace.internal.writer import AgentWriter
@@ -43,6 +44,7 @@ from ddtrace.settings import Config
 from ddtrace.span import _is_top_level
 from ddtrace.tracer import Tracer
 from tests.subprocesstest import run_in_subprocess
+from tests.utils import DummyTracer
 from tests.utils import TracerTestCase
 from tests.utils import override_global_config
 
@@ -1641,6 +1643,118 @@ def test_non_active_span(tracer, test_spans):
     assert len(traces[0]) == 2
 
 
+def test_start_finish_spans(tracer, test_spans):
+    with tracer.trace("parent") as parent:
+        spans = tracer.start_spans("child", 10, child_of=parent, resource="item")
+        assert tracer.current_span() is parent
+        assert len(spans) == 10
+        for span in spans:
+            assert span.name == "child"
+            assert span.resource == "item"
+            assert span.trace_id == parent.trace_id
+            assert span.parent_id == parent.span_id
+            assert not span.finished
+
+        spans[0].finish()
+        tracer.finish_spans(spans, finish_time=spans[-1].start + 1)
+        assert all(span.finished for span in spans)
+        assert spans[-1].duration == pytest.approx(1)
+
+    traces = test_spans.pop_traces()
+    assert len(traces) == 1
+    assert traces[0] == [parent] + spans
+
+
+def test_finish_spans_processors(tracer):
+    processor = mock.Mock(spec=SpanProcessor)
+    tracer._span_processors.append(processor)
+    try:
+        with tracer.trace("parent") as parent:
+            spans = tracer.start_spans("child", 3, child_of=parent)
+            processor.on_spans_start.assert_called_once_with(spans)
+            tracer.finish_spans(spans)
+            tracer.finish_spans(spans)
+            processor.on_spans_finish.assert_called_once_with(spans)
+            processor.on_span_finish.assert_not_called()
+    finally:
+        tracer._span_processors.remove(processor)
+
+
+def test_finish_spans_deactivates_spans(tracer):
+    activated = []
+    on_activate = activated.append
+    with tracer.trace("parent") as parent:
+        spans = tracer.start_spans("child", 2, child_of=parent)
+        tracer.context_provider.activate(spans[1])
+        tracer.context_provider._on_activate(on_activate)
+        try:
+            tracer.finish_spans(spans)
+        finally:
+            tracer.context_provider._deregister_on_activate(on_activate)
+
+    # The parent is activated again as soon as the spans are finished
+    assert activated == [parent]
+
+
+def test_finish_spans_groups_by_tracer(tracer):
+    other_tracer = DummyTracer()
+    processor = mock.Mock(spec=SpanProcessor)
+    other_processor = mock.Mock(spec=SpanProcessor)
+    tracer._span_processors.append(processor)
+    other_tracer._span_processors.append(other_processor)
+    try:
+        spans = tracer.start_spans("child", 2)
+        other_spans = other_tracer.start_spans("other", 2)
+        callback = mock.Mock()
+        spans[0]._on_finish_callbacks.append(callback)
+
+        # Each tracer is called once for the spans it started
+        tracer.finish_spans(spans + other_spans)
+        processor.on_spans_finish.assert_called_once_with(spans)
+        other_processor.on_spans_finish.assert_called_once_with(other_spans)
+        processor.on_span_finish.assert_not_called()
+        other_processor.on_span_finish.assert_not_called()
+        callback.assert_called_once_with(spans[0])
+    finally:
+        tracer._span_processors.remove(processor)
+
+
+def test_finish_spans_callbacks_order(tracer):
+    calls = mock.Mock()
+    tracer._span_processors.append(calls.processor)
+    try:
+        spans = tracer.start_spans("child", 2)
+        spans[0]._on_finish_callbacks.insert(0, calls.before)
+        spans[0]._on_finish_callbacks.append(calls.after)
+        calls.reset_mock()
+
+        # The callbacks run before or after the processors like they were registered
+        tracer.finish_spans(spans)
+        assert calls.mock_calls == [
+            mock.call.before(spans[0]),
+            mock.call.processor.on_spans_finish(spans),
+            mock.call.after(spans[0]),
+        ]
+    finally:
+        tracer._span_processors.remove(calls.processor)
+
+
+def test_finish_spans_closing_after_parent(tracer):
+    with tracer.trace("parent") as parent:
+        spans = tracer.start_spans("child", 2, child_of=parent)
+        with tracer.trace("other"):
+            with mock.patch.object(logging.Logger, "isEnabledFor", return_value=True), mock.patch.object(
+                logging.Logger, "debug"
+            ) as mock_logger:
+                tracer.finish_spans(spans)
+
+    calls = [
+        mock.call("span %r closing after its parent %r, this is an error when not using async", span, parent)
+        for span in spans
+    ]
+    mock_logger.assert_has_calls(calls)
+
+
 def test_service_mapping():
     @contextlib.contextmanager
     def override_service_mapping(service_mapping):
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 from functools import partial
 import sys
+import threading
 from time import sleep
 import unittest
 
@@ -12,6 +13,7 @@ from ddtrace.internal.utils import ArgumentError
 from ddtrace.internal.utils import get_argument_value
 from ddtrace.internal.utils import set_argument_value
 from ddtrace.internal.utils import time
+from ddtrace.internal.utils.cache import LFUCache
 from ddtrace.internal.utils.cache import cached
 from ddtrace.internal.utils.cache import cachedmethod
 from ddtrace.internal.utils.cache import callonce
@@ -283,17 +285,20 @@ def cached_test_recipe(expensive, cheap, witness, cache_size):
 
     assert witness.call_count == 1 + cache_size
 
-    MAX_FOO = "Foo%d" % (cache_size - 1)
+    LFU_FOO = "Foo%d" % (cache_size >> 1)
 
-    cheap("last drop")  # Forces least frequent elements out of the cache
+    cheap("last drop")  # Forces the least frequently used element out of the cache
     assert witness.call_count == 2 + cache_size
 
-    cheap(MAX_FOO)  # Check MAX_FOO was dropped
+    cheap(LFU_FOO)  # Check LFU_FOO was dropped
     assert witness.call_count == 3 + cache_size
 
     cheap("last drop")  # Check last drop was retained
     assert witness.call_count == 3 + cache_size
 
+    cheap("Foo0")  # Check frequently used elements were retained
+    assert witness.call_count == 3 + cache_size
+
 
 def test_cached():
     witness = mock.Mock()
@@ -326,6 +331,47 @@ def test_cachedmethod():
     cached_test_recipe(expensive, Foo().cheap, witness, cache_size)
 
 
+def test_lfu_cache_stats():
+    cache = LFUCache(maxsize=4)
+
+    for key in (1, 2, 3, 4, 1, 1, 2):
+        assert cache.get(key, lambda k: k * 10) == key * 10
+    assert cache.stats == (3, 4, 0)
+
+    # 3 and 4 are the least frequently used, 3 being the least recently used
+    cache.get(5, lambda k: k * 10)
+    assert cache.stats == (3, 5, 1)
+    assert 3 not in cache
+    assert set(cache) == {1, 2, 4, 5}
+
+    cache.get(6, lambda k: k * 10)
+    assert set(cache) == {1, 2, 5, 6}
+
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.stats == (3, 6, 2)
+
+
+def test_lfu_cache_hits_do_not_lock():
+    cache = LFUCache(maxsize=4)
+    cache.get("foo", lambda k: k)
+
+    def hits():
+        for _ in range(LFUCache.READ_BUFFER_SIZE * 2):
+            cache.get("foo", lambda k: k)
+
+    with cache.lock:
+        # A hit from another thread must not wait for the lock
+        t = threading.Thread(target=hits)
+        t.start()
+        t.join(5)
+        assert not t.is_alive()
+
+    assert cache.stats.hits == LFUCache.READ_BUFFER_SIZE * 2
+    cache.get("bar", lambda k: k)
+    assert cache._freqs["foo"] == 1 + LFUCache.READ_BUFFER_SIZE * 2
+
+
 i = 0
 
 
@@ -1,4 +1,5 @@
 import contextlib
+import gzip
 import os
 import socket
 import sys
@@ -19,6 +20,8 @@ from ddtrace.internal.ci_visibility.writer import CIVisibilityWriter
 from ddtrace.internal.compat import PY3
 from ddtrace.internal.compat import get_connection_response
 from ddtrace.internal.compat import httplib
+from ddtrace.internal.compression import GzipCompressor
+from ddtrace.internal.compression import get_compressor
 from ddtrace.internal.encoding import MSGPACK_ENCODERS
 from ddtrace.internal.runtime import get_runtime_id
 from ddtrace.internal.uds import UDSHTTPConnection
@@ -613,6 +616,169 @@ def test_flush_connection_uds(endpoint_uds_server, writer_class):
     writer.flush_queue(raise_exc=True)
 
 
+def test_flush_concurrent_uploads(endpoint_assert_path):
+    endpoint_assert_path("/v0.")
+    writer = AgentWriter(
+        "http://%s:%s" % (_HOST, _PORT), processing_interval=60, upload_workers=2, reuse_connections=True
+    )
+    writer.start()
+    try:
+        for i in range(4):
+            writer.write([Span(name="name", trace_id=i, span_id=1)])
+            writer.flush_queue()
+
+        assert writer._uploader.wait(5)
+        # The metrics of the upload threads are merged by the writer thread
+        assert "http.requests" not in writer._metrics
+        writer._merge_upload_metrics()
+        assert writer._metrics["http.requests"][()] == 4
+        assert "http.errors" not in writer._metrics
+        # Payloads are not sent over the connection of the writer
+        assert writer._conn is None
+        assert [t._conn is not None for t in writer._uploader._threads] == [True, True]
+    finally:
+        writer.stop()
+        writer.join()
+
+    assert not any(t.is_alive() for t in writer._uploader._threads)
+
+
+def test_upload_queue_eviction():
+    writer = AgentWriter("http://localhost:9126", upload_workers=1, upload_queue_size=10)
+    client = writer._clients[0]
+
+    writer._uploader.put(b"a" * 4, 1, client)
+    writer._uploader.put(b"b" * 4, 2, client)
+    assert writer._uploader.size == 8
+
+    # The oldest payload is evicted to make room for the new one
+    writer._uploader.put(b"c" * 4, 3, client)
+    assert writer._uploader.size == 8
+    assert [payload for payload, _, _ in writer._uploader._queue] == [b"b" * 4, b"c" * 4]
+    assert writer._metrics["http.dropped.traces"][("reason:evicted",)] == 1
+
+    # Payloads larger than the queue are dropped
+    writer._uploader.put(b"d" * 11, 4, client)
+    assert len(writer._uploader) == 2
+    assert writer._metrics["http.dropped.traces"][("reason:too_big",)] == 4
+
+
+def test_upload_queue_stop_timeout():
+    writer = AgentWriter("http://localhost:9126", upload_workers=1)
+    client = writer._clients[0]
+    sending = threading.Event()
+    release = threading.Event()
+
+    def upload_payload(payload, count, client):
+        sending.set()
+        release.wait()
+
+    with mock.patch.object(writer, "_upload_payload", side_effect=upload_payload):
+        writer._uploader.start()
+        try:
+            writer._uploader.put(b"a" * 4, 1, client)
+            assert sending.wait(5)
+            writer._uploader.put(b"b" * 4, 2, client)
+
+            # The queued payloads are dropped once the timeout expires
+            writer._uploader.stop(timeout=0.1)
+            assert len(writer._uploader) == 0
+            assert writer._uploader.size == 0
+            assert writer._metrics["http.dropped.traces"][("reason:shutdown",)] == 2
+        finally:
+            release.set()
+
+    for thread in writer._uploader._threads:
+        thread.join(5)
+        assert not thread.is_alive()
+
+
+def test_upload_thread_downgrade():
+    writer = AgentWriter("http://localhost:9126", api_version="v0.5", upload_workers=1)
+    client = writer._clients[0]
+    response = Response(status=404)
+
+    def upload_payload(payload, count, client):
+        with mock.patch.object(writer, "_put", return_value=response):
+            writer._send_payload(payload, count, client)
+
+    with mock.patch.object(writer, "_upload_payload", side_effect=upload_payload):
+        writer._uploader.start()
+        try:
+            writer._uploader.put(b"a" * 4, 1, client)
+            assert writer._uploader.wait(5)
+        finally:
+            writer._uploader.stop()
+
+    # The writer thread switches to the downgraded client before flushing
+    assert writer._clients == [client]
+    assert writer._pending_clients[0].ENDPOINT == "v0.4/traces"
+    writer.flush_queue()
+    assert writer._pending_clients is None
+    assert writer._endpoint == "v0.4/traces"
+
+
+def test_writer_stop_timeout_stops_uploader():
+    writer = AgentWriter("http://localhost:9126", processing_interval=60, upload_workers=1)
+    writer.start()
+    with mock.patch.object(writer._uploader, "stop") as stop:
+        writer.stop(timeout=5)
+        writer.join(5)
+    (timeout,), _ = stop.call_args
+    assert 0 <= timeout <= 5
+    writer._uploader.stop()
+
+
+def test_upload_workers_sync_mode():
+    writer = AgentWriter("http://localhost:9126", upload_workers=2, sync_mode=True)
+    assert writer._uploader is None
+
+
+def test_flush_compressed_payload():
+    statsd = mock.Mock()
+    with override_global_config(dict(health_metrics_enabled=True, _trace_writer_compression="gzip")):
+        writer = AgentWriter("http://localhost:9126", dogstatsd=statsd)
+        client = writer._clients[0]
+        assert isinstance(client.compressor, GzipCompressor)
+        assert writer._get_finalized_headers(1, client)["Content-Encoding"] == "gzip"
+
+        for i in range(10):
+            writer._encoder.put([Span(name="name", trace_id=i, span_id=j, parent_id=j - 1 or None) for j in range(5)])
+        raw_size = writer._encoder.size
+
+        with mock.patch.object(writer, "_send_payload_with_backoff") as send:
+            writer.flush_queue()
+
+    payload = send.call_args[0][0]
+    assert len(msgpack.unpackb(gzip.decompress(payload))) == 10
+    assert len(payload) < raw_size
+
+    statsd.distribution.assert_has_calls(
+        [
+            mock.call("datadog.tracer.http.sent.bytes", len(payload)),
+            mock.call("datadog.tracer.http.sent.uncompressed.bytes", AnyInt(), tags=["encoding:gzip"]),
+        ],
+        any_order=True,
+    )
+
+
+def test_compressor_adaptive_level():
+    compressor = get_compressor("gzip")
+    with mock.patch("ddtrace.internal.compat.monotonic", side_effect=[1.0, 2.0]), mock.patch(
+        "time.process_time", side_effect=[1.0, 1.0]
+    ):
+        # Fully busy process
+        compressor._last_wall_time = compressor._last_cpu_time = 0.0
+        assert compressor.next_level() == GzipCompressor.MIN_LEVEL
+        # Idle process
+        assert compressor.next_level() == GzipCompressor.MAX_LEVEL
+
+    assert get_compressor("gzip", 9).next_level() == 9
+    assert get_compressor(None) is None
+    with pytest.raises(ValueError):
+        get_compressor("brotli")
+
+
 @pytest.mark.parametrize("writer_class", (AgentWriter, CIVisibilityWriter))
 def test_flush_queue_raise(writer_class):
     with override_env(dict(DD_API_KEY="foobar.baz")):
@@ -810,6 +976,132 @@ def test_writer_reuse_connections_false(writer_class):
         assert writer._conn is conn
 
 
+@pytest.mark.parametrize("writer_class", (AgentWriter, CIVisibilityWriter))
+def test_writer_deferred_encoding(writer_class):
+    with override_env(dict(DD_API_KEY="foobar.baz")):
+        with override_global_config({"_trace_writer_deferred_encoding": True}):
+            writer = writer_class("http://localhost:9126", processing_interval=60)
+        assert writer._deferred_encoding
+        try:
+            for i in range(10):
+                writer.write([Span(name="name", trace_id=i, span_id=j, parent_id=j - 1 or None) for j in range(5)])
+
+            # Traces are only queued by the calling thread
+            assert len(writer._pending_traces) == 10
+            assert len(writer._encoder) == 0
+
+            writer._encode_pending_traces()
+            assert len(writer._pending_traces) == 0
+            assert len(writer._encoder) == 10
+            assert writer._metrics["buffer.accepted.traces"][()] == 10 * len(writer._clients)
+        finally:
+            writer.stop()
+
+
+def test_writer_deferred_encoding_pending_full():
+    writer = AgentWriter("http://localhost:9126", processing_interval=60, deferred_encoding=True)
+    writer.MAX_PENDING_TRACES = 2
+    try:
+        for i in range(3):
+            writer.write([Span(name="name", trace_id=i, span_id=1)])
+
+        assert len(writer._pending_traces) == 2
+        assert writer._metrics["buffer.dropped.traces"][("reason:full",)] == 1
+    finally:
+        writer.stop()
+
+
+def test_writer_deferred_encoding_flushes_full_buffer():
+    writer = AgentWriter(
+        "http://localhost:9126", processing_interval=60, buffer_size=5125, deferred_encoding=True, upload_workers=0
+    )
+    writer._send_payload_with_backoff = mock.Mock()
+    try:
+        for i in range(11):
+            writer.write([Span(name="name", trace_id=i, span_id=j, parent_id=j - 1 or None) for j in range(5)])
+
+        writer._encode_pending_traces()
+
+        # The full buffer is sent to make room for the last trace
+        assert len(writer._pending_traces) == 0
+        assert writer._send_payload_with_backoff.call_count == 1
+        assert writer._send_payload_with_backoff.call_args[0][1] == 10
+        assert len(writer._encoder) == 1
+        assert "buffer.dropped.traces" not in writer._metrics
+        assert writer._metrics["buffer.accepted.traces"][()] == 11
+    finally:
+        writer.stop()
+
+
+def test_writer_write_time_metrics():
+    writer = AgentWriter("http://localhost:9126", processing_interval=60)
+    try:
+        with mock.patch("ddtrace.internal.compat.monotonic_ns", side_effect=[1000, 6000, 10000, 12000]):
+            writer.write([Span(name="name", trace_id=1, span_id=1)])
+            writer.write([Span(name="name", trace_id=2, span_id=1)])
+
+        assert writer._metrics["writer.write.time_us"][()] == 7
+        assert writer._write_max_time_us == 5
+        assert ("writer.write.max_time_us", [((), 5)]) in writer._metrics_items()
+    finally:
+        writer.stop()
+
+
+def test_writer_early_flush():
+    with override_global_config(dict(_trace_writer_early_flush=True)):
+        writer = AgentWriter("http://localhost:9126", processing_interval=60, buffer_size=4096)
+    try:
+        with mock.patch.object(writer, "notify") as notify:
+            writer.write([Span(name="name", trace_id=1, span_id=1)])
+            notify.assert_not_called()
+
+            while writer._encoder.size < writer._encoder.max_size * writer.EARLY_FLUSH_THRESHOLD:
+                writer.write([Span(name="name", trace_id=1, span_id=1)])
+            notify.assert_called_once_with()
+
+            # The writer thread is notified only once per flush
+            writer.write([Span(name="name", trace_id=1, span_id=1)])
+            notify.assert_called_once_with()
+            assert writer._metrics["writer.early_flush.requests"][()] == 1
+        assert writer.recreate()._early_flush is True
+    finally:
+        writer.stop()
+
+
+def test_writer_early_flush_disabled():
+    # The early flush is disabled by default
+    writer = AgentWriter("http://localhost:9126", processing_interval=60, buffer_size=4096)
+    try:
+        with mock.patch.object(writer, "notify") as notify:
+            while writer._encoder.size < writer._encoder.max_size * writer.EARLY_FLUSH_THRESHOLD:
+                writer.write([Span(name="name", trace_id=1, span_id=1)])
+            notify.assert_not_called()
+        assert writer.recreate()._early_flush is False
+    finally:
+        writer.stop()
+
+
+def test_writer_adaptive_interval():
+    writer = AgentWriter("http://localhost:9126", processing_interval=1.0, adaptive_interval=True)
+    assert writer.interval == 1.0
+
+    # Shorten the interval under load, down to the lower bound
+    for expected in (0.5, 0.25, 0.125, 0.1, 0.1):
+        writer._adapt_interval(0.9)
+        assert writer.interval == pytest.approx(expected)
+
+    # Moderate load does not change the interval
+    writer._adapt_interval(0.2)
+    assert writer.interval == pytest.approx(0.1)
+
+    # Lengthen the interval when idle, up to the upper bound
+    for _ in range(20):
+        writer._adapt_interval(0.0)
+    assert writer.interval == pytest.approx(5.0)
+
+    assert writer.recreate().interval == 1.0
+
+
 @pytest.mark.subprocess(env=dict(DD_TRACE_128_BIT_TRACEID_GENERATION_ENABLED="true"))
 def test_trace_with_128bit_trace_ids():
     """Ensure 128bit trace ids are correctly encoded"""
@@ -138,6 +138,13 @@ def override_global_config(values):
         "_trace_writer_interval_seconds",
         "_trace_writer_connection_reuse",
         "_trace_writer_log_err_payload",
+        "_trace_writer_deferred_encoding",
+        "_trace_writer_early_flush",
+        "_trace_writer_adaptive_interval",
+        "_trace_writer_upload_workers",
+        "_trace_writer_upload_queue_size",
+        "_trace_writer_compression",
+        "_trace_writer_compression_level",
     ]
 
     # Grab the current values of all keys